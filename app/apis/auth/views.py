@@ -2,18 +2,37 @@ import logging
 
 from fastapi import Body, Depends
 from fastapi.responses import ORJSONResponse
-from pymongo.asynchronous.database import AsyncDatabase
 from starlette.exceptions import HTTPException
 
 from app.apis.auth.model import AuthModel
-from app.database.database import get_db
-from app.utils.auth_utils import signJWT, verify_password
+from app.apis.users.views import invalidate_user
+from app.database.database import get_storage
+from app.database.repository import Storage
+from app.utils.auth_utils import (
+    hash_password,
+    needs_rehash,
+    run_bcrypt,
+    signJWT,
+    verify_password,
+)
+from app.utils.time_utils import now_ms
 
 
 logger = logging.getLogger(__name__)
 
 
-async def login(body: AuthModel = Body(), db: AsyncDatabase = Depends(get_db)):
+async def _rehash_password(storage: Storage, user: dict, password: str):
+    """Upgrade a stored hash to the current cost factor; never fails the login."""
+    try:
+        new_hash = await run_bcrypt(hash_password, password)
+        await storage.users.replace_password(user["_id"], user["password"], new_hash, now_ms())
+        invalidate_user(user.get("email"))
+        logger.info("Password rehashed with current cost | email=%s", user.get("email"))
+    except Exception:
+        logger.exception("Password rehash failed | email=%s", user.get("email"))
+
+
+async def login(body: AuthModel = Body(), storage: Storage = Depends(get_storage)):
     try:
         logger.info("Login request received")
 
@@ -25,15 +44,18 @@ async def login(body: AuthModel = Body(), db: AsyncDatabase = Depends(get_db)):
             logger.warning("Login failed: email or password missing")
             raise HTTPException(400, "Email and password are required")
 
-        user = await db.users.find_one({"email": email})
+        user = await storage.users.find_by_email(email, with_password=True)
         if not user:
             logger.warning("Login failed: user not found | email=%s", email)
             raise HTTPException(404, "User not found")
 
-        if not verify_password(password, user["password"]):
+        if not await run_bcrypt(verify_password, password, user["password"]):
             logger.warning("Login failed: incorrect password | email=%s", email)
             raise HTTPException(401, "Incorrect password")
 
+        if needs_rehash(user["password"]):
+            await _rehash_password(storage, user, password)
+
         token = signJWT(str(user.get("email")))
 
         logger.info("Login successful | email=%s", email)
@@ -0,0 +1,27 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from app.apis.todos.model import TodoModel
+from app.apis.users.model import UserResponse
+
+
+class DashboardData(BaseModel):
+    user: UserResponse
+    todos: List[TodoModel] = []
+    next_cursor: Optional[str] = None
+
+
+class DashboardResponse(BaseModel):
+    data: List[DashboardData]
+    status: str = "success"
+    message: str
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "data": [{"user": {"email": "user@example.com"}, "todos": []}],
+                "status": "success",
+                "message": "Dashboard Loaded"
+            }
+        }
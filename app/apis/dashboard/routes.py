@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+
+from app.apis.dashboard import views
+from app.apis.dashboard.model import DashboardResponse
+from app.apis.todos.model import ErrorResponse
+from app.utils.auth_utils import get_token
+
+DashboardRouter = APIRouter(
+    prefix="/dashboard", tags=["Dashboard"], dependencies=[Depends(get_token)]
+)
+
+DashboardRouter.add_api_route(
+    "",
+    views.get_dashboard,
+    methods=["GET"],
+    response_model=DashboardResponse,
+    responses={
+        401: {"model": ErrorResponse, "description": "Unauthorized"},
+        404: {"model": ErrorResponse, "description": "User not found"},
+        500: {"model": ErrorResponse, "description": "Internal Server Error"}
+    },
+)
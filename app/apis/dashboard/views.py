@@ -0,0 +1,77 @@
+import asyncio
+import logging
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse
+
+from app.apis.todos.views import fetch_todo_page
+from app.apis.users.views import get_user_profile
+from app.database.database import get_storage
+from app.database.repository import Storage
+from app.utils.auth_utils import Principal, get_token
+from app.utils.etag import etag_headers, make_etag, not_modified
+from core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+async def get_dashboard(
+    request: Request,
+    principal: Principal = Depends(get_token),
+    include_todos: bool = True,
+    limit: int = Query(settings.TODO_PAGE_SIZE, ge=1, le=settings.TODO_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    storage: Storage = Depends(get_storage),
+):
+    email = principal.user_id
+    try:
+        logger.info("Get dashboard request received | email=%s", email)
+
+        resources = {"users": settings.USER_CACHE_TTL}
+        if include_todos:
+            resources["todos"] = settings.TODO_CACHE_TTL
+        etag = make_etag(email, resources, include_todos, cursor, limit)
+        cached = not_modified(request, etag)
+        if cached is not None:
+            logger.info("Dashboard not modified | email=%s", email)
+            return cached
+
+        # The profile and the todo list are independent, so fetch both at once
+        if include_todos:
+            user, (todos, next_cursor) = await asyncio.gather(
+                get_user_profile(storage, email),
+                fetch_todo_page(storage, email, limit, cursor),
+            )
+        else:
+            user, todos, next_cursor = await get_user_profile(storage, email), [], None
+
+        if not user:
+            logger.warning("Dashboard user not found | email=%s", email)
+            raise HTTPException(status_code=404, detail="User Not Found")
+
+        logger.info("Dashboard loaded | email=%s | todos=%d", email, len(todos))
+
+        return ORJSONResponse(
+            {
+                "data": [{"user": user, "todos": todos, "next_cursor": next_cursor}],
+                "status": "success",
+                "message": "Dashboard Loaded",
+            },
+            200,
+            headers=etag_headers(etag),
+        )
+
+    except HTTPException as e:
+        logger.warning(
+            "Handled error while loading dashboard | email=%s | reason=%s",
+            email,
+            e.detail,
+        )
+        return ORJSONResponse(
+            {"data": [], "message": str(e.detail), "status": "failed"}, e.status_code
+        )
+    except Exception as e:
+        logger.exception("Unhandled error while loading dashboard | email=%s", email)
+        return ORJSONResponse({"data": [], "message": str(e), "status": "failed"}, 500)
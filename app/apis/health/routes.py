@@ -0,0 +1,8 @@
+from fastapi import APIRouter
+
+from app.apis.health import views
+
+HealthRouter = APIRouter(tags=["Health"])
+
+HealthRouter.add_api_route("/healthz", views.healthz, methods=["GET"], include_in_schema=False)
+HealthRouter.add_api_route("/readyz", views.readyz, methods=["GET"], include_in_schema=False)
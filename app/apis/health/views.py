@@ -0,0 +1,30 @@
+import time
+
+from fastapi.responses import ORJSONResponse
+
+from app.utils.health import health
+
+
+async def healthz():
+    # Liveness: answering at all means the event loop is serving; dependencies are
+    # readiness concerns, and failing liveness on them would only restart healthy workers
+    return ORJSONResponse(
+        {
+            "data": [{"uptime_s": round(time.time() - health.started_at, 1)}],
+            "status": "success",
+            "message": "Alive",
+        }
+    )
+
+
+async def readyz():
+    ready, checks = health.readiness()
+    return ORJSONResponse(
+        {
+            "data": [checks],
+            "status": "success" if ready else "failed",
+            "message": "Ready" if ready else "Not Ready",
+        },
+        200 if ready else 503,
+        headers={"Cache-Control": "no-store"},
+    )
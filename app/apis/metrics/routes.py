@@ -0,0 +1,7 @@
+from fastapi import APIRouter
+
+from app.apis.metrics import views
+
+MetricsRouter = APIRouter(tags=["Metrics"])
+
+MetricsRouter.add_api_route("/metrics", views.get_metrics, methods=["GET"], include_in_schema=False)
@@ -0,0 +1,9 @@
+from starlette.responses import PlainTextResponse
+
+from app.utils.metrics import render_prometheus
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+async def get_metrics():
+    return PlainTextResponse(render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,135 @@
+"""Incremental CSV / NDJSON parsing for POST /todos/import.
+
+Rows are produced as the request body arrives, so an upload is never held in memory
+as a whole. Each parser yields ``(row_number, row, error)`` with exactly one of
+``row`` and ``error`` set; row numbers count data rows from 1 (the CSV header is not a row).
+"""
+import codecs
+import csv
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+
+import orjson
+
+ParsedRow = Tuple[int, Optional[dict], Optional[str]]
+
+# A body with no newline would otherwise be buffered whole
+MAX_LINE_CHARS = 1_000_000
+# A CSV record still inside a quoted field after this many lines (or MAX_LINE_CHARS
+# characters) fails on its own instead of swallowing the rest of the upload
+MAX_RECORD_LINES = 100
+
+# csv.Error raised in strict mode when the lines end inside a quoted field
+_UNEXPECTED_END = "unexpected end of data"
+
+CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+def import_format(content_type: str) -> Optional[str]:
+    """"csv" or "ndjson" for a Content-Type header value, None if it is neither."""
+    return CONTENT_TYPES.get(content_type.split(";")[0].strip().lower())
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decoded lines, newline included; a UTF-8 byte order mark is dropped."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        # Split on "\n" only: str.splitlines also breaks on characters such as U+2028
+        # that may legitimately appear inside JSON strings and CSV fields. The last
+        # piece may be a line cut off by the chunk boundary.
+        *lines, pending = (pending + decoder.decode(chunk)).split("\n")
+        if len(pending) > MAX_LINE_CHARS:
+            raise ValueError(f"Line longer than {MAX_LINE_CHARS} characters")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def iter_ndjson_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRow]:
+    number = 0
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            row = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            yield number, None, "Invalid JSON"
+            continue
+        if not isinstance(row, dict):
+            yield number, None, "Row must be a JSON object"
+            continue
+        yield number, row, None
+
+
+def _csv_records(lines: List[str], final: bool = False) -> Iterator[Tuple[Optional[List[str]], Optional[str]]]:
+    """Parse complete records off the front of ``lines``, yielding ``(values, error)``.
+
+    csv.reader decides where a record ends, so a quote inside an unquoted field
+    (``5" screen``) is plain text, as it is to ``csv``. Lines of an unfinished record
+    are left in ``lines`` for the next call, unless the body has ended (``final``) or
+    the record has outgrown the caps: then it fails on its own and parsing resumes at
+    the line after the one that opened it.
+    """
+    while lines:
+        reader = csv.reader(lines, strict=True)
+        consumed = 0
+        while True:
+            try:
+                values = next(reader)
+            except StopIteration:
+                lines.clear()
+                return
+            except csv.Error as e:
+                if str(e) == _UNEXPECTED_END:
+                    break
+                consumed = reader.line_num
+                yield None, f"Malformed CSV: {e}"
+                continue
+            consumed = reader.line_num
+            if len(values) > 1 or (values and values[0].strip()):
+                yield values, None
+
+        pending = lines[consumed:]
+        if not final and len(pending) < MAX_RECORD_LINES and sum(map(len, pending)) <= MAX_LINE_CHARS:
+            del lines[:consumed]
+            return
+        yield None, "Unterminated quoted field"
+        del lines[:consumed + 1]
+
+
+async def iter_csv_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[ParsedRow]:
+    header: Optional[List[str]] = None
+    number = 0
+    lines: List[str] = []
+
+    def rows(final: bool = False) -> Iterator[ParsedRow]:
+        nonlocal header, number
+        for values, error in _csv_records(lines, final):
+            if header is None:
+                if error is not None:
+                    raise ValueError(f"Invalid CSV header: {error}")
+                header = [name.strip() for name in values]
+                continue
+            number += 1
+            if error is not None:
+                yield number, None, error
+            elif len(values) != len(header):
+                yield number, None, f"Expected {len(header)} columns, got {len(values)}"
+            else:
+                yield number, dict(zip(header, values)), None
+
+    async for line in iter_lines(chunks):
+        lines.append(line)
+        for row in rows():
+            yield row
+    for row in rows(final=True):
+        yield row
@@ -1,7 +1,9 @@
-from typing import List, Optional, Any
+from typing import List, Literal, Optional, Any
 from uuid import uuid4
 
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, EmailStr, Field, model_validator
+
+from core.config import settings
 
 
 class TodoModel(BaseModel):
@@ -13,26 +15,20 @@ class TodoModel(BaseModel):
     description: Optional[str] = Field(default=None, max_length=1000)
     completed: bool = Field(default=False)
     priority: str = Field(default=3, ge=1, le=5)
-    due_date: Optional[str] = Field(
-        default=None, description="UNIX timestamp as string in milliseconds"
+    due_date: Optional[int] = Field(
+        default=None, description="UNIX timestamp in milliseconds"
     )
-    created_at: str = Field(..., description="UNIX timestamp as string")
-    updated_at: str = Field(..., description="UNIX timestamp as string")
-    is_deleted: bool = Field(default=False)
-    deleted_at: Optional[str] = Field(
-        default=None, description="UNIX timestamp as string"
+    due_date_display: Optional[str] = Field(
+        default=None, description="Due date as YYYY-MM-DD, precomputed at write time"
     )
-
-    @field_validator(
-        "created_at", "updated_at", "due_date", "deleted_at", mode="before"
+    created_at: int = Field(..., description="UNIX timestamp in milliseconds")
+    updated_at: Optional[int] = Field(
+        default=None, description="UNIX timestamp in milliseconds"
+    )
+    is_deleted: bool = Field(default=False)
+    deleted_at: Optional[int] = Field(
+        default=None, description="UNIX timestamp in milliseconds"
     )
-    @classmethod
-    def validate_unix_timestamp(cls, v):
-        if v is None:
-            return v
-        if not isinstance(v, str):
-            raise ValueError("Timestamp must be a string")
-        return v
 
 
 class TodoCreate(BaseModel):
@@ -40,7 +36,63 @@ class TodoCreate(BaseModel):
     description: str
     priority: str
     due_date: str
-    email: EmailStr
+    email: Optional[EmailStr] = Field(
+        default=None, description="Deprecated and ignored; the owner is the authenticated user"
+    )
+
+class TodoBatchOperation(BaseModel):
+    op: Literal["create", "complete", "delete"]
+    todo_id: Optional[str] = Field(default=None, description="Required for complete and delete")
+    todo: Optional[TodoCreate] = Field(default=None, description="Required for create")
+
+    @model_validator(mode="after")
+    def check_payload(self):
+        if self.op == "create" and self.todo is None:
+            raise ValueError("create operations require 'todo'")
+        if self.op != "create" and not self.todo_id:
+            raise ValueError(f"{self.op} operations require 'todo_id'")
+        return self
+
+
+class TodoBatchRequest(BaseModel):
+    operations: List[TodoBatchOperation] = Field(
+        ..., min_length=1, max_length=settings.TODO_BATCH_MAX_SIZE
+    )
+
+
+class TodoBatchResult(BaseModel):
+    index: int
+    op: str
+    status: str
+    todo_id: Optional[str] = None
+    message: Optional[str] = None
+
+
+class TodoBatchResponse(BaseModel):
+    data: List[TodoBatchResult]
+    status: str = "success"
+    message: str
+
+class TodoImportError(BaseModel):
+    row: int = Field(..., description="Data row number, starting at 1 (CSV header excluded)")
+    message: str
+
+
+class TodoImportSummary(BaseModel):
+    imported: int
+    failed: int
+    truncated: bool = Field(
+        default=False, description="True if rows past TODO_IMPORT_MAX_ROWS were not read"
+    )
+    errors: List[TodoImportError] = Field(
+        default=[], description="First TODO_IMPORT_MAX_ERRORS failed rows"
+    )
+
+
+class TodoImportResponse(BaseModel):
+    data: List[TodoImportSummary]
+    status: str = "success"
+    message: str
 
 class TodoUpdateResponse(BaseModel):
     data : List[Any] = []
@@ -65,6 +117,9 @@ class TodoResponse(BaseModel):
     status: str
     message: str
     data: List[TodoModel]
+    next_cursor: Optional[str] = Field(
+        default=None, description="Opaque cursor for the next page, null on the last page"
+    )
 
 
 
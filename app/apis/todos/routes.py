@@ -1,7 +1,15 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 
 from app.apis.todos import views
-from app.apis.todos.model import ErrorResponse, TodoResponse, TodoCreateResponse, TodoUpdateResponse
+from app.apis.todos.model import (
+    ErrorResponse,
+    TodoBatchResponse,
+    TodoCreateResponse,
+    TodoImportResponse,
+    TodoResponse,
+    TodoUpdateResponse,
+)
 from app.utils.auth_utils import get_token
 
 TodoRouter = APIRouter(
@@ -42,3 +50,41 @@ TodoRouter.add_api_route("/complete", views.complete_todo, methods=["PUT"],
                              500: {"model": ErrorResponse, "description": "Internal Server Error"}
                          }
                          )
+
+TodoRouter.add_api_route("/batch", views.batch_todos, methods=["POST"],
+                         response_model=TodoBatchResponse,
+                         responses={
+                             401: {"model": ErrorResponse, "description": "Unauthorized"},
+                             500: {"model": ErrorResponse, "description": "Internal Server Error"}
+                         }
+                         )
+
+TodoRouter.add_api_route("/export", views.export_todos, methods=["GET"],
+                         response_class=StreamingResponse,
+                         responses={
+                             200: {
+                                 "content": {"application/x-ndjson": {}, "application/gzip": {}},
+                                 "description": "One JSON todo per line",
+                             },
+                             401: {"model": ErrorResponse, "description": "Unauthorized"},
+                         }
+                         )
+
+TodoRouter.add_api_route("/import", views.import_todos, methods=["POST"],
+                         response_model=TodoImportResponse,
+                         openapi_extra={
+                             "requestBody": {
+                                 "required": True,
+                                 "content": {
+                                     "text/csv": {"schema": {"type": "string"}},
+                                     "application/x-ndjson": {"schema": {"type": "string"}},
+                                 },
+                             }
+                         },
+                         responses={
+                             400: {"model": TodoImportResponse, "description": "Malformed body"},
+                             401: {"model": ErrorResponse, "description": "Unauthorized"},
+                             415: {"model": ErrorResponse, "description": "Unsupported format"},
+                             500: {"model": ErrorResponse, "description": "Internal Server Error"}
+                         }
+                         )
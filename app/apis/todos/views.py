@@ -1,57 +1,135 @@
-import time
+import asyncio
+import base64
 import logging
-from datetime import datetime
+import zlib
+from typing import AsyncIterator, List, Literal, Optional, Tuple
 
+import orjson
 from bson import ObjectId
-from fastapi import Body, HTTPException
+from bson.errors import InvalidId
+from fastapi import Body, HTTPException, Query, Request
 from fastapi.params import Depends
-from fastapi.responses import ORJSONResponse
-from pymongo.asynchronous.database import AsyncDatabase
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import ValidationError
 
-from app.apis.todos.model import TodoCreate
-from app.database.database import get_db
+from app.apis.todos.imports import import_format, iter_csv_rows, iter_ndjson_rows
+from app.apis.todos.model import TodoBatchRequest, TodoCreate
+from app.database.database import get_storage
+from app.database.repository import Storage, TodoWrite
+from app.utils.auth_utils import Principal, get_token
+from app.utils.cache import TTLCache
+from app.utils.etag import bump_version, etag_headers, get_version, make_etag, not_modified
+from app.utils.time_utils import format_date, now_ms, parse_due_date, to_millis
+from core.config import settings
 
 
 logger = logging.getLogger(__name__)
 
+# Formatted todo pages keyed by (user, version, cursor, limit). Writes bump the user's
+# version, so stale pages are never read again and age out through LRU eviction.
+todo_cache = TTLCache("todo_pages", maxsize=settings.TODO_CACHE_SIZE, ttl=settings.TODO_CACHE_TTL)
 
-async def create_todo(body: TodoCreate = Body(), db: AsyncDatabase = Depends(get_db)):
+
+def invalidate_todos(email: str):
+    """Call after any write touching the user's todos; also changes their todo ETags."""
+    bump_version("todos", email)
+
+
+def todo_etag(email: str, *variant) -> str:
+    return make_etag(email, {"todos": settings.TODO_CACHE_TTL}, *variant)
+
+
+def format_legacy_todo(todo: dict) -> dict:
+    # Document not yet rewritten by the timestamp migration
+    todo["due_date"] = to_millis(todo.get("due_date"))
+    todo["due_date_display"] = format_date(todo["due_date"])
+    return todo
+
+
+def encode_cursor(todo: dict) -> str:
+    raw = orjson.dumps([todo.get("created_at"), todo["id"]])
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[object, ObjectId]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, todo_id = orjson.loads(raw)
+        todo_id = ObjectId(todo_id)
+    except (ValueError, TypeError, InvalidId, orjson.JSONDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # The value goes straight into the query, so anything but a stored created_at (int ms,
+    # or a string on rows the timestamp migration has not reached) could be an operator
+    if isinstance(created_at, bool) or not isinstance(created_at, (int, str)):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return created_at, todo_id
+
+
+async def fetch_todo_page(
+    storage: Storage, email: str, limit: int, cursor: Optional[str] = None
+) -> Tuple[List[dict], Optional[str]]:
+    """Formatted keyset page over (created_at, _id) descending, served from todo_cache when possible.
+
+    One extra row is fetched to tell whether there is a next page.
+    """
+    key = (email, get_version("todos", email), cursor, limit)
+    page = todo_cache.get(key)
+    if page is not None:
+        return page
+
+    after = decode_cursor(cursor) if cursor else None
+    todos = await storage.todos.list_active(email, limit + 1, after)
+
+    next_cursor = None
+    if len(todos) > limit:
+        todos = todos[:limit]
+        next_cursor = encode_cursor(todos[-1])
+    for todo in todos:
+        if "due_date_display" not in todo:
+            format_legacy_todo(todo)
+
+    page = (todos, next_cursor)
+    todo_cache.set(key, page)
+    return page
+
+
+def build_todo_document(email: str, todo: TodoCreate) -> dict:
+    due_date_ts, due_date_display = parse_due_date(todo.due_date)
+    return {
+        "user_id": email,
+        "title": todo.title,
+        "description": todo.description,
+        "due_date": due_date_ts,
+        "due_date_display": due_date_display,
+        "completed": False,
+        "priority": todo.priority,
+        "created_at": now_ms(),
+        "updated_at": None,
+        "is_deleted": False,
+        "deleted_at": None,
+    }
+
+
+async def create_todo(
+    body: TodoCreate = Body(),
+    principal: Principal = Depends(get_token),
+    storage: Storage = Depends(get_storage),
+):
     try:
         logger.info("Create todo request received")
-        body = body.model_dump()
-        due_date = body.get("due_date")
-        priority = body.get("priority")
-        title = body.get("title")
-        description = body.get("description")
-        email = body.get("email")
+        email = principal.user_id
 
         logger.debug(
             "Todo payload received | email=%s | title=%s | priority=%s",
             email,
-            title,
-            priority,
+            body.title,
+            body.priority,
         )
 
-        date_obj = datetime.strptime(due_date, "%Y-%m-%d")
-        due_date_ts = int(date_obj.timestamp() * 1000)
-        current_time = int(time.time() * 1000)
-
-        await db.todos.insert_one(
-            {
-                "user_id": email,
-                "title": title,
-                "description": description,
-                "due_date": str(due_date_ts),
-                "completed": False,
-                "priority": priority,
-                "created_at": str(current_time),
-                "updated_at": "",
-                "is_deleted": False,
-                "deleted_at": "",
-            }
-        )
+        await storage.todos.insert(build_todo_document(email, body))
 
-        logger.info("Todo created successfully | email=%s | title=%s", email, title)
+        invalidate_todos(email)
+        logger.info("Todo created successfully | email=%s | title=%s", email, body.title)
 
         return ORJSONResponse(
             {"data": [], "status": "success", "message": "Todo Created"}, 201
@@ -62,31 +140,34 @@ async def create_todo(body: TodoCreate = Body(), db: AsyncDatabase = Depends(get
         return ORJSONResponse({"data": [], "message": str(e), "status": "failed"}, 500)
 
 
-async def get_todos_by_userid(email: str, db: AsyncDatabase = Depends(get_db)):
+async def get_todos_by_userid(
+    request: Request,
+    principal: Principal = Depends(get_token),
+    limit: int = Query(settings.TODO_PAGE_SIZE, ge=1, le=settings.TODO_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    storage: Storage = Depends(get_storage),
+):
+    email = principal.user_id
     try:
         logger.info("Get todos request received | email=%s", email)
 
-        todos = (
-            await db.todos.find({"user_id": email, "is_deleted": False})
-            .sort("-created_at")
-            .to_list(100)
-        )
+        etag = todo_etag(email, cursor, limit)
+        cached = not_modified(request, etag)
+        if cached is not None:
+            logger.info("Todos not modified | email=%s", email)
+            return cached
+
+        todos, next_cursor = await fetch_todo_page(storage, email, limit, cursor)
 
-        if not todos:
+        if not todos and not cursor:
             logger.warning("No todos found for user | email=%s", email)
             raise HTTPException(status_code=404, detail="No Todos Found")
 
-        for todo in todos:
-            todo["id"] = str(todo.pop("_id"))
-            due_date_str = todo.get("due_date")
-            timestamp_ms = int(due_date_str)
-            todo["due_date"] = datetime.fromtimestamp(timestamp_ms / 1000).strftime(
-                "%Y-%m-%d"
-            )
-
         logger.info("Todos fetched successfully | email=%s | count=%d", email, len(todos))
 
-        return ORJSONResponse({"data": todos}, 200)
+        return ORJSONResponse(
+            {"data": todos, "next_cursor": next_cursor}, 200, headers=etag_headers(etag)
+        )
 
     except HTTPException as e:
         logger.warning(
@@ -102,20 +183,19 @@ async def get_todos_by_userid(email: str, db: AsyncDatabase = Depends(get_db)):
         return ORJSONResponse({"data": [], "message": str(e), "status": "failed"}, 500)
 
 
-async def delete_todo(todo_id: str, db: AsyncDatabase = Depends(get_db)):
+async def delete_todo(
+    todo_id: str,
+    principal: Principal = Depends(get_token),
+    storage: Storage = Depends(get_storage),
+):
     try:
         logger.info("Delete todo request received | todo_id=%s", todo_id)
 
-        current_time = str(int(time.time()))
-        result = await db.todos.update_one(
-            {"_id": ObjectId(todo_id)},
-            {"$set": {"is_deleted": True, "deleted_at": current_time}},
-        )
-
-        if result.modified_count == 0:
+        if not await storage.todos.mark_deleted(principal.user_id, ObjectId(todo_id), now_ms()):
             logger.warning("Todo not found | todo_id=%s", todo_id)
             raise HTTPException(status_code=404, detail="Todo not found")
 
+        invalidate_todos(principal.user_id)
         logger.info("Todo marked as deleted | todo_id=%s", todo_id)
 
         return ORJSONResponse(
@@ -137,22 +217,18 @@ async def delete_todo(todo_id: str, db: AsyncDatabase = Depends(get_db)):
         return ORJSONResponse({"data": [], "message": str(e), "status": "failed"}, 500)
 
 
-
-
-
-
-async def complete_todo(todo_id: str, db: AsyncDatabase = Depends(get_db)):
+async def complete_todo(
+    todo_id: str,
+    principal: Principal = Depends(get_token),
+    storage: Storage = Depends(get_storage),
+):
     try:
         logger.info("Mark complete todo request received | todo_id=%s", todo_id)
-        result = await db.todos.update_one(
-            {"_id": ObjectId(todo_id)},
-            {"$set": {"completed": True}},
-        )
-
-        if result.modified_count == 0:
+        if not await storage.todos.mark_completed(principal.user_id, ObjectId(todo_id), now_ms()):
             logger.warning("Todo not found | todo_id=%s", todo_id)
             raise HTTPException(status_code=404, detail="Todo not found")
 
+        invalidate_todos(principal.user_id)
         logger.info("Todo marked as completed | todo_id=%s", todo_id)
 
         return ORJSONResponse(
@@ -172,3 +248,270 @@ async def complete_todo(todo_id: str, db: AsyncDatabase = Depends(get_db)):
     except Exception as e:
         logger.exception("Unhandled error while deleting todo | todo_id=%s", todo_id)
         return ORJSONResponse({"data": [], "message": str(e), "status": "failed"}, 500)
+
+
+async def batch_todos(
+    body: TodoBatchRequest = Body(),
+    principal: Principal = Depends(get_token),
+    storage: Storage = Depends(get_storage),
+):
+    """Run mixed create/complete/delete operations as one unordered bulk write.
+
+    Complete and delete only touch the caller's own, not yet deleted todos.
+    """
+    email = principal.user_id
+    operations = body.operations
+    results = [
+        {"index": index, "op": op.op, "status": "success", "todo_id": op.todo_id, "message": None}
+        for index, op in enumerate(operations)
+    ]
+
+    def fail(index: int, message: str):
+        results[index]["status"] = "failed"
+        results[index]["message"] = message
+
+    try:
+        logger.info(
+            "Batch todo request received | email=%s | operations=%d", email, len(operations)
+        )
+
+        targets = {}
+        for index, op in enumerate(operations):
+            if op.op != "create":
+                try:
+                    targets[index] = ObjectId(op.todo_id)
+                except (InvalidId, TypeError):
+                    fail(index, "Invalid todo_id")
+
+        # bulk_write only reports aggregate counts, so resolve the targets first (one query)
+        # to give every update its own not-found result
+        found = set()
+        if targets:
+            found = await storage.todos.find_active_ids(email, targets.values())
+
+        current_time = now_ms()
+        writes, positions = [], []
+        for index, op in enumerate(operations):
+            if results[index]["status"] == "failed":
+                continue
+            if op.op == "create":
+                try:
+                    document = build_todo_document(email, op.todo)
+                except ValueError as e:
+                    fail(index, str(e))
+                    continue
+                document["_id"] = ObjectId()
+                results[index]["todo_id"] = str(document["_id"])
+                writes.append(TodoWrite(document))
+            else:
+                if targets[index] not in found:
+                    fail(index, "Todo not found")
+                    continue
+                if op.op == "complete":
+                    update = {"completed": True, "updated_at": current_time}
+                else:
+                    update = {"is_deleted": True, "deleted_at": current_time, "updated_at": current_time}
+                writes.append(TodoWrite(update, todo_id=targets[index]))
+            positions.append(index)
+
+        if writes:
+            errors = await storage.todos.bulk_write(email, writes)
+            for position, message in errors.items():
+                fail(positions[position], message)
+            invalidate_todos(email)
+
+        failed = sum(1 for result in results if result["status"] == "failed")
+        logger.info(
+            "Batch todo request processed | email=%s | operations=%d | writes=%d | failed=%d",
+            email,
+            len(operations),
+            len(writes),
+            failed,
+        )
+
+        return ORJSONResponse(
+            {
+                "data": results,
+                "status": "failed" if failed else "success",
+                "message": f"{len(operations) - failed} of {len(operations)} operations succeeded",
+            },
+            200,
+        )
+
+    except Exception as e:
+        logger.exception("Unhandled error while processing todo batch | email=%s", email)
+        return ORJSONResponse({"data": [], "message": str(e), "status": "failed"}, 500)
+
+
+async def _export_chunks(
+    storage: Storage, email: str, include_deleted: bool, compress: bool
+) -> AsyncIterator[bytes]:
+    # wbits=31 writes a gzip container; level 1 keeps each batch's compression short so
+    # a large export does not stall the event loop
+    compressor = zlib.compressobj(1, zlib.DEFLATED, 31) if compress else None
+    rows = 0
+    try:
+        async for batch in storage.todos.export_batches(
+            email, include_deleted, settings.TODO_EXPORT_BATCH_SIZE
+        ):
+            for todo in batch:
+                if "due_date_display" not in todo:
+                    format_legacy_todo(todo)
+            chunk = b"".join(orjson.dumps(todo, option=orjson.OPT_APPEND_NEWLINE) for todo in batch)
+            rows += len(batch)
+            if compressor is not None:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+        if compressor is not None:
+            yield compressor.flush()
+        logger.info("Todo export completed | email=%s | rows=%d", email, rows)
+    except Exception:
+        # Headers are already sent; the client sees a truncated body
+        logger.exception("Todo export aborted | email=%s | rows=%d", email, rows)
+        raise
+
+
+async def export_todos(
+    include_deleted: bool = False,
+    compress: bool = False,
+    principal: Principal = Depends(get_token),
+    storage: Storage = Depends(get_storage),
+):
+    """Stream all of the caller's todos as NDJSON, one cursor batch at a time."""
+    email = principal.user_id
+    logger.info(
+        "Todo export request received | email=%s | include_deleted=%s | compress=%s",
+        email,
+        include_deleted,
+        compress,
+    )
+    filename = "todos.ndjson.gz" if compress else "todos.ndjson"
+    return StreamingResponse(
+        _export_chunks(storage, email, include_deleted, compress),
+        media_type="application/gzip" if compress else "application/x-ndjson",
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+        },
+    )
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}"
+        for item in error.errors()
+    )
+
+
+async def import_todos(
+    request: Request,
+    format: Optional[Literal["csv", "ndjson"]] = None,
+    principal: Principal = Depends(get_token),
+    storage: Storage = Depends(get_storage),
+):
+    """Create todos from a CSV (header row required) or NDJSON request body.
+
+    Rows are parsed and validated as the body streams in and written with unordered
+    insert_many batches; a batch is written while the next one is being parsed. Bad
+    rows are reported by row number and never abort the import.
+    """
+    email = principal.user_id
+    summary = {"imported": 0, "failed": 0, "truncated": False, "errors": []}
+    pending: Optional[asyncio.Task] = None
+
+    def fail(row: int, message: str):
+        summary["failed"] += 1
+        if len(summary["errors"]) < settings.TODO_IMPORT_MAX_ERRORS:
+            summary["errors"].append({"row": row, "message": message})
+
+    async def write(documents: List[dict], rows: List[int]):
+        errors = await storage.todos.insert_many(documents)
+        for position, message in errors.items():
+            fail(rows[position], message)
+        summary["imported"] += len(documents) - len(errors)
+
+    try:
+        body_format = format or import_format(request.headers.get("content-type", ""))
+        logger.info("Todo import request received | email=%s | format=%s", email, body_format)
+        if body_format is None:
+            raise HTTPException(
+                status_code=415,
+                detail="Unsupported import format; send text/csv or application/x-ndjson",
+            )
+        parse = iter_csv_rows if body_format == "csv" else iter_ndjson_rows
+
+        documents, rows = [], []
+        try:
+            async for number, row, error in parse(request.stream()):
+                if number > settings.TODO_IMPORT_MAX_ROWS:
+                    summary["truncated"] = True
+                    break
+                if error is not None:
+                    fail(number, error)
+                    continue
+                try:
+                    documents.append(build_todo_document(email, TodoCreate.model_validate(row)))
+                except ValidationError as e:
+                    fail(number, _validation_message(e))
+                    continue
+                except ValueError as e:
+                    # parse_due_date rejected the date
+                    fail(number, str(e))
+                    continue
+                rows.append(number)
+
+                if len(documents) >= settings.TODO_IMPORT_BATCH_SIZE:
+                    if pending is not None:
+                        await pending
+                    pending = asyncio.create_task(write(documents, rows))
+                    documents, rows = [], []
+
+            if pending is not None:
+                await pending
+                pending = None
+            if documents:
+                await write(documents, rows)
+        finally:
+            if pending is not None:
+                # Parsing failed while a batch was in flight; let it finish before reporting
+                await asyncio.gather(pending, return_exceptions=True)
+            if summary["imported"]:
+                invalidate_todos(email)
+
+        summary["errors"].sort(key=lambda item: item["row"])
+        total = summary["imported"] + summary["failed"]
+        logger.info(
+            "Todo import processed | email=%s | imported=%d | failed=%d | truncated=%s",
+            email,
+            summary["imported"],
+            summary["failed"],
+            summary["truncated"],
+        )
+
+        message = f"{summary['imported']} of {total} rows imported"
+        if summary["truncated"]:
+            message += f"; stopped after {settings.TODO_IMPORT_MAX_ROWS} rows"
+        return ORJSONResponse(
+            {
+                "data": [summary],
+                "status": "failed" if summary["failed"] or summary["truncated"] else "success",
+                "message": message,
+            },
+            200,
+        )
+
+    except HTTPException as e:
+        logger.warning("Handled error while importing todos | email=%s | reason=%s", email, e.detail)
+        return ORJSONResponse(
+            {"data": [], "message": str(e.detail), "status": "failed"}, e.status_code
+        )
+    except ValueError as e:
+        # Malformed body (e.g. an over-long line); rows written so far are kept
+        logger.warning("Todo import aborted | email=%s | reason=%s", email, e)
+        return ORJSONResponse(
+            {"data": [summary], "message": str(e), "status": "failed"}, 400
+        )
+    except Exception as e:
+        logger.exception("Unhandled error while importing todos | email=%s", email)
+        return ORJSONResponse({"data": [], "message": str(e), "status": "failed"}, 500)
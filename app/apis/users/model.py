@@ -1,4 +1,4 @@
-from typing import List, Any
+from typing import List, Any, Optional
 
 from pydantic import BaseModel, EmailStr, Field
 
@@ -8,8 +8,10 @@ class User(BaseModel):
     email: EmailStr
     password: str
     role: str
-    created_at: str = Field(..., description="UNIX timestamp as string")
-    updated_at: str = Field(..., description="UNIX timestamp as string")
+    created_at: int = Field(..., description="UNIX timestamp in milliseconds")
+    updated_at: Optional[int] = Field(
+        default=None, description="UNIX timestamp in milliseconds"
+    )
     enabled: bool = Field(default=False)
 
 
@@ -25,8 +27,10 @@ class UserResponse(BaseModel):
     username: str
     email: EmailStr
     role: str
-    created_at: str = Field(..., description="UNIX timestamp as string")
-    updated_at: str = Field(..., description="UNIX timestamp as string")
+    created_at: int = Field(..., description="UNIX timestamp in milliseconds")
+    updated_at: Optional[int] = Field(
+        default=None, description="UNIX timestamp in milliseconds"
+    )
     enabled: bool = Field(default=False)
 
 class ErrorResponse(BaseModel):
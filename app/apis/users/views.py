@@ -1,19 +1,51 @@
-import time
 import logging
+from typing import Optional
 
-from fastapi import Body, Depends, HTTPException
+from fastapi import Body, Depends, HTTPException, Request
 from fastapi.responses import ORJSONResponse
-from jose import jwt
-from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import DuplicateKeyError
 
 from app.apis.users.model import User, UserCreateReq
-from app.database.database import get_db
-from app.utils.auth_utils import hash_password
+from app.database.database import get_storage
+from app.database.repository import Storage
+from app.utils.auth_utils import Principal, get_token, hash_password, run_bcrypt
+from app.utils.cache import TTLCache
+from app.utils.etag import bump_version, etag_headers, make_etag, not_modified
+from app.utils.time_utils import now_ms
+from core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Public profile only: the password hash is projected out before caching
+user_cache = TTLCache(
+    "user_profiles", maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL
+)
 
-async def create_user(body: UserCreateReq = Body(), db: AsyncDatabase = Depends(get_db)):
+
+async def get_user_profile(storage: Storage, email: str) -> Optional[dict]:
+    profile = user_cache.get(email)
+    if profile is None:
+        user = await storage.users.find_by_email(email)
+        if not user:
+            return None
+        user["id"] = str(user.pop("_id"))
+        user.pop("password", None)
+        profile = user
+        user_cache.set(email, profile)
+    return dict(profile)
+
+
+def invalidate_user(email: str):
+    """Call after any write to a user document; also changes the user's ETags."""
+    user_cache.invalidate(email)
+    bump_version("users", email)
+
+
+def user_etag(email: str) -> str:
+    return make_etag(email, {"users": settings.USER_CACHE_TTL})
+
+
+async def create_user(body: UserCreateReq = Body(), storage: Storage = Depends(get_storage)):
     logger.info("Create user request received")
 
     try:
@@ -21,7 +53,7 @@ async def create_user(body: UserCreateReq = Body(), db: AsyncDatabase = Depends(
         email = body.get("email")
         logger.debug("Checking if user exists: %s", email)
 
-        existing_user = await db.users.find_one({"email": email})
+        existing_user = await get_user_profile(storage, email)
         if existing_user:
             logger.warning("User already exists: %s", email)
             raise HTTPException(409, "User Already Exists")
@@ -30,28 +62,31 @@ async def create_user(body: UserCreateReq = Body(), db: AsyncDatabase = Depends(
         username = body.get("username")
 
         logger.debug("Hashing password for user: %s", email)
-        hashed_pass = hash_password(password)
+        hashed_pass = await run_bcrypt(hash_password, password)
 
-        timestamp = str(int(time.time() * 1000))
+        timestamp = now_ms()
         user = User(
             **{
                 "email": email,
                 "username": username,
                 "password": hashed_pass,
                 "created_at": timestamp,
-                "updated_at": "",
+                "updated_at": None,
                 "role": "user",
                 "enabled": True,
             }
         )
 
         logger.debug("Inserting user into database: %s", email)
-        await db.users.insert_one(user.model_dump(exclude={"_id"}))
+        try:
+            await storage.users.insert(user.model_dump(exclude={"_id"}))
+        except DuplicateKeyError:
+            # Lost a race with a concurrent signup; the unique email index rejected it
+            logger.warning("User already exists: %s", email)
+            raise HTTPException(409, "User Already Exists")
 
-        user_data = await db.users.find_one({"email": email})
-        if user_data:
-            user_data["id"] = str(user_data.pop("_id"))
-            user_data.pop("password", None)
+        invalidate_user(email)
+        user_data = await get_user_profile(storage, email)
 
         logger.info("User created successfully: %s", email)
         return ORJSONResponse(
@@ -81,32 +116,31 @@ async def create_user(body: UserCreateReq = Body(), db: AsyncDatabase = Depends(
         )
 
 
-async def get_current_userid(token):
-    logger.debug("Decoding JWT token to extract user_id")
-
-    payload = jwt.decode(token, "Authorization", algorithms=["HS256"])
-    email = payload.get("user_id")
-
-    logger.debug("Extracted user_id from token: %s", email)
-    return email
-
-
-async def ger_user(email: str, db: AsyncDatabase = Depends(get_db)):
+async def ger_user(
+    request: Request,
+    principal: Principal = Depends(get_token),
+    storage: Storage = Depends(get_storage),
+):
+    email = principal.user_id
     logger.info("Get user request received for email: %s", email)
 
     try:
-        user = await db.users.find_one({"email": email})
+        etag = user_etag(email)
+        cached = not_modified(request, etag)
+        if cached is not None:
+            logger.info("User not modified: %s", email)
+            return cached
+
+        user = await get_user_profile(storage, email)
         if not user:
             logger.warning("User not found: %s", email)
             raise HTTPException(status_code=404, detail="User Not Found")
 
-        user["id"] = str(user.pop("_id"))
-        user.pop("password")
-
         logger.info("User retrieved successfully: %s", email)
         return ORJSONResponse(
             {"data": [user], "status": "success", "message": "User Found"},
             status_code=200,
+            headers=etag_headers(etag),
         )
 
     except HTTPException as e:
@@ -1,19 +1,77 @@
+import asyncio
 import logging
+import random
+import time
+from importlib.util import find_spec
+from typing import List, Optional
 
+from fastapi import Depends
 from pymongo import AsyncMongoClient
 from starlette.requests import Request
 
+from app.database.mongo_storage import MongoStorage
+from app.database.monitoring import (
+    POOL_MAX_SIZE,
+    POOL_OPEN,
+    CommandMetricsListener,
+    PoolMetricsListener,
+)
+from app.database.repository import Storage
 from core.config import settings
 
 logger = logging.getLogger(__name__)
 
-mongodb_client = AsyncMongoClient(settings.MONGO_URI)
+# Created by init_db and closed by close_db, so shutdown drains the pool requests used
+mongodb_client: Optional[AsyncMongoClient] = None
+
+_COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+
+def _compressors() -> List[str]:
+    available = []
+    for name in settings.MONGO_COMPRESSORS:
+        module = _COMPRESSOR_MODULES.get(name)
+        if module is None or find_spec(module) is None:
+            logger.info("MongoDB compressor %r is not available, skipping it", name)
+            continue
+        available.append(name)
+    if settings.MONGO_COMPRESSORS and not available:
+        logger.warning(
+            "None of MONGO_COMPRESSORS=%s is available; wire compression is off",
+            settings.MONGO_COMPRESSORS,
+        )
+    return available
+
+
+def create_client() -> AsyncMongoClient:
+    options = {
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "maxConnecting": settings.MONGO_MAX_CONNECTING,
+        "maxIdleTimeMS": settings.MONGO_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "socketTimeoutMS": settings.MONGO_SOCKET_TIMEOUT_MS,
+    }
+    compressors = _compressors()
+    if compressors:
+        options["compressors"] = compressors
+    POOL_MAX_SIZE.set(settings.MONGO_MAX_POOL_SIZE)
+    return AsyncMongoClient(
+        settings.MONGO_URI,
+        event_listeners=[CommandMetricsListener(), PoolMetricsListener()],
+        **options,
+    )
 
 
 async def init_db():
+    global mongodb_client
     logger.info("Initializing MongoDB connection")
 
     try:
+        if mongodb_client is None:
+            mongodb_client = create_client()
         db = mongodb_client[settings.DB_NAME]
         logger.info("MongoDB connection initialized successfully")
         return db
@@ -26,10 +84,67 @@ async def init_db():
         raise
 
 
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff, so restarted workers do not retry in lockstep."""
+    ceiling = min(
+        settings.MONGO_CONNECT_BACKOFF_MAX, settings.MONGO_CONNECT_BACKOFF_BASE * 2 ** (attempt - 1)
+    )
+    return random.uniform(0, ceiling)
+
+
+async def connect_with_retry():
+    """init_db and a ping, retried up to MONGO_CONNECT_ATTEMPTS times; raises the last error."""
+    attempts = max(settings.MONGO_CONNECT_ATTEMPTS, 1)
+    for attempt in range(1, attempts + 1):
+        db = await init_db()
+        try:
+            await db.command("ping")
+            logger.info("MongoDB ping successful | attempt=%d", attempt)
+            return db
+        except Exception as e:
+            if attempt == attempts:
+                logger.error(
+                    "MongoDB unreachable, giving up | attempts=%d | error=%s", attempts, str(e)
+                )
+                raise
+            delay = backoff_delay(attempt)
+            logger.warning(
+                "MongoDB ping failed, retrying | attempt=%d/%d | delay_s=%.2f | error=%s",
+                attempt,
+                attempts,
+                delay,
+                str(e),
+            )
+            await asyncio.sleep(delay)
+
+
+async def warm_pool():
+    """Open up to MONGO_MIN_POOL_SIZE connections before traffic arrives.
+
+    Concurrent pings each check out a connection, so the pool grows to about that many;
+    the driver keeps it at minPoolSize from then on.
+    """
+    size = settings.MONGO_MIN_POOL_SIZE
+    if mongodb_client is None or size <= 0:
+        return
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(mongodb_client.admin.command("ping") for _ in range(size)))
+        logger.info(
+            "MongoDB pool warmed | connections=%d | elapsed_ms=%.1f",
+            POOL_OPEN.get(),
+            (time.perf_counter() - started) * 1000,
+        )
+    except Exception as e:
+        logger.warning("MongoDB pool warmup failed | error=%s", str(e))
+
+
 async def close_db():
+    global mongodb_client
+    if mongodb_client is None:
+        return
     logger.info("Closing MongoDB connection")
     try:
-        mongodb_client = AsyncMongoClient(settings.MONGO_URI)
         await mongodb_client.close()
         logger.info("MongoDB connection closed successfully")
     except Exception as e:
@@ -38,8 +153,16 @@ async def close_db():
             str(e),
             exc_info=True,
         )
+    finally:
+        mongodb_client = None
 
 
 async def get_db(request: Request):
     logger.debug("Providing database instance from application state")
     return request.app.state.db
+
+
+async def get_storage(request: Request, db=Depends(get_db)) -> Storage:
+    if settings.STORAGE_BACKEND == "memory":
+        return request.app.state.storage
+    return MongoStorage(db)
@@ -0,0 +1,154 @@
+import logging
+from typing import Dict, List
+
+from bson import ObjectId, json_util
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.asynchronous.database import AsyncDatabase
+
+from app.database.mongo_storage import TODO_EXPORT_SORT
+
+logger = logging.getLogger(__name__)
+
+
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    "todos": [
+        # Serves the (created_at, _id) keyset pagination without an in-memory sort
+        IndexModel(
+            [
+                ("user_id", ASCENDING),
+                ("is_deleted", ASCENDING),
+                ("created_at", DESCENDING),
+                ("_id", DESCENDING),
+            ],
+            name="user_active_created_id",
+        ),
+    ],
+}
+
+# One entry per query shape issued by the API views, with placeholder values
+QUERY_SHAPES = [
+    {
+        "name": "users by email (login, create_user, ger_user, dashboard)",
+        "collection": "users",
+        "filter": {"email": "explain@example.com"},
+        "sort": None,
+        "limit": 1,
+    },
+    {
+        "name": "active todos by user (get_todos_by_userid, dashboard)",
+        "collection": "todos",
+        "filter": {"user_id": "explain@example.com", "is_deleted": False},
+        "sort": [("created_at", DESCENDING), ("_id", DESCENDING)],
+        "limit": 21,
+    },
+    {
+        "name": "next page of active todos by keyset cursor (get_todos_by_userid, dashboard)",
+        "collection": "todos",
+        "filter": {
+            "user_id": "explain@example.com",
+            "is_deleted": False,
+            "$or": [
+                {"created_at": {"$lt": 0}},
+                {"created_at": 0, "_id": {"$lt": ObjectId("0" * 24)}},
+            ],
+        },
+        "sort": [("created_at", DESCENDING), ("_id", DESCENDING)],
+        "limit": 21,
+    },
+    {
+        "name": "next page from an unmigrated string created_at cursor (get_todos_by_userid, dashboard)",
+        "collection": "todos",
+        "filter": {
+            "user_id": "explain@example.com",
+            "is_deleted": False,
+            "$or": [
+                {"created_at": {"$lt": "0"}},
+                {"created_at": "0", "_id": {"$lt": ObjectId("0" * 24)}},
+                {"created_at": {"$type": "number"}},
+            ],
+        },
+        "sort": [("created_at", DESCENDING), ("_id", DESCENDING)],
+        "limit": 21,
+    },
+    {
+        "name": "own active todos by id (batch_todos find_active_ids)",
+        "collection": "todos",
+        "filter": {
+            "_id": {"$in": [ObjectId("0" * 24), ObjectId("f" * 24)]},
+            "user_id": "explain@example.com",
+            "is_deleted": False,
+        },
+        "sort": None,
+        "limit": None,
+    },
+    {
+        "name": "own active todo by id (complete_todo, delete_todo update filter)",
+        "collection": "todos",
+        "filter": {"_id": ObjectId("0" * 24), "user_id": "explain@example.com", "is_deleted": False},
+        "sort": None,
+        "limit": 1,
+    },
+    {
+        "name": "all todos by user, deleted last (export_todos with include_deleted)",
+        "collection": "todos",
+        "filter": {"user_id": "explain@example.com"},
+        "sort": TODO_EXPORT_SORT,
+        "limit": None,
+    },
+    {
+        "name": "active todos by user, unbounded (export_todos)",
+        "collection": "todos",
+        "filter": {"user_id": "explain@example.com", "is_deleted": False},
+        "sort": TODO_EXPORT_SORT,
+        "limit": None,
+    },
+]
+
+
+async def ensure_indexes(db: AsyncDatabase):
+    """Create the indexes the views rely on; create_indexes is a no-op for existing ones."""
+    for collection, models in INDEXES.items():
+        existing = await db[collection].index_information()
+        for model in models:
+            name = model.document["name"]
+            if name not in existing:
+                logger.warning(
+                    "Missing index, creating | collection=%s | index=%s | keys=%s",
+                    collection,
+                    name,
+                    dict(model.document["key"]),
+                )
+        await db[collection].create_indexes(models)
+        logger.info(
+            "Indexes verified | collection=%s | indexes=%s",
+            collection,
+            [model.document["name"] for model in models],
+        )
+
+
+async def explain_queries(db: AsyncDatabase) -> List[dict]:
+    plans = []
+    for shape in QUERY_SHAPES:
+        cursor = db[shape["collection"]].find(shape["filter"])
+        if shape["sort"]:
+            cursor = cursor.sort(shape["sort"])
+        if shape["limit"]:
+            cursor = cursor.limit(shape["limit"])
+        explain = await cursor.explain()
+        plans.append(
+            {
+                "name": shape["name"],
+                "collection": shape["collection"],
+                "winningPlan": explain.get("queryPlanner", {}).get("winningPlan"),
+            }
+        )
+    return plans
+
+
+async def print_explain_plans(db: AsyncDatabase):
+    for plan in await explain_queries(db):
+        print(f"== {plan['name']} [{plan['collection']}]")
+        print(json_util.dumps(plan["winningPlan"], indent=2))
@@ -0,0 +1,214 @@
+"""Storage kept in process memory.
+
+Used to run and benchmark the app without a mongod: every operation is an indexed
+dict or bisect lookup, so what remains in a request's latency is the framework, auth,
+caching and serialization. Data is lost on restart and not shared between workers.
+"""
+import bisect
+import threading
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+from app.database.repository import (
+    TODO_EXPORT_FIELDS,
+    TODO_LIST_FIELDS,
+    Storage,
+    TodoPosition,
+    TodoRepository,
+    TodoWrite,
+    UserRepository,
+)
+
+# (BSON type rank of created_at, created_at, _id)
+SortKey = Tuple[int, object, ObjectId]
+
+
+class MemoryUserRepository(UserRepository):
+    def __init__(self, lock: threading.RLock):
+        self._lock = lock
+        self._by_email: Dict[str, dict] = {}
+        self._by_id: Dict[ObjectId, dict] = {}
+
+    async def find_by_email(self, email: str, with_password: bool = False) -> Optional[dict]:
+        with self._lock:
+            user = self._by_email.get(email)
+            if user is None:
+                return None
+            user = dict(user)
+        if not with_password:
+            user.pop("password", None)
+        return user
+
+    async def insert(self, document: dict):
+        user = dict(document)
+        user.setdefault("_id", ObjectId())
+        with self._lock:
+            if user.get("email") in self._by_email or user["_id"] in self._by_id:
+                raise DuplicateKeyError("E11000 duplicate key error collection: users")
+            self._by_email[user.get("email")] = user
+            self._by_id[user["_id"]] = user
+
+    async def replace_password(
+        self, user_id: ObjectId, old_hash: str, new_hash: str, updated_at: int
+    ) -> bool:
+        with self._lock:
+            user = self._by_id.get(user_id)
+            if user is None or user.get("password") != old_hash:
+                return False
+            user["password"] = new_hash
+            user["updated_at"] = updated_at
+            return True
+
+
+class MemoryTodoRepository(TodoRepository):
+    def __init__(self, lock: threading.RLock):
+        self._lock = lock
+        self._by_id: Dict[ObjectId, dict] = {}
+        # user_id -> sort keys of the user's active / deleted todos, ascending; pages
+        # are read backwards from a bisect position, like the Mongo index scan
+        self._active: Dict[str, List[SortKey]] = {}
+        self._deleted: Dict[str, List[SortKey]] = {}
+
+    @staticmethod
+    def _sort_key(created_at: object, todo_id: ObjectId) -> SortKey:
+        # Ranked by BSON type first (null < numbers < strings), as Mongo sorts them, so
+        # unmigrated string timestamps never get compared with ints
+        rank = 0 if created_at is None else 2 if isinstance(created_at, str) else 1
+        return rank, created_at, todo_id
+
+    @classmethod
+    def _key(cls, todo: dict) -> SortKey:
+        return cls._sort_key(todo.get("created_at"), todo["_id"])
+
+    @staticmethod
+    def _row(todo: dict, fields: Tuple[str, ...] = TODO_LIST_FIELDS) -> dict:
+        row = {"id": str(todo["_id"])}
+        for field in fields:
+            if field in todo:
+                row[field] = todo[field]
+        return row
+
+    def _insert(self, document: dict) -> ObjectId:
+        todo = dict(document)
+        todo.setdefault("_id", ObjectId())
+        if todo["_id"] in self._by_id:
+            raise DuplicateKeyError("E11000 duplicate key error collection: todos index: _id_")
+        self._by_id[todo["_id"]] = todo
+        index = self._deleted if todo.get("is_deleted") else self._active
+        bisect.insort(index.setdefault(todo.get("user_id"), []), self._key(todo))
+        return todo["_id"]
+
+    def _set(self, todo: dict, fields: dict) -> bool:
+        was_active = not todo.get("is_deleted")
+        changed = any(todo.get(name) != value for name, value in fields.items())
+        todo.update(fields)
+        if was_active and todo.get("is_deleted"):
+            key = self._key(todo)
+            active = self._active.get(todo.get("user_id"), [])
+            position = bisect.bisect_left(active, key)
+            if position < len(active) and active[position] == key:
+                del active[position]
+            bisect.insort(self._deleted.setdefault(todo.get("user_id"), []), key)
+        return changed
+
+    async def insert(self, document: dict) -> ObjectId:
+        with self._lock:
+            return self._insert(document)
+
+    async def insert_many(self, documents: List[dict]) -> Dict[int, str]:
+        errors = {}
+        with self._lock:
+            for index, document in enumerate(documents):
+                try:
+                    self._insert(document)
+                except DuplicateKeyError as e:
+                    errors[index] = str(e)
+        return errors
+
+    async def list_active(
+        self, user_id: str, limit: int, after: Optional[TodoPosition] = None
+    ) -> List[dict]:
+        with self._lock:
+            active = self._active.get(user_id, [])
+            end = bisect.bisect_left(active, self._sort_key(*after)) if after else len(active)
+            keys = active[max(end - limit, 0):end]
+            return [self._row(self._by_id[todo_id]) for *_, todo_id in reversed(keys)]
+
+    async def export_batches(
+        self, user_id: str, include_deleted: bool, batch_size: int
+    ) -> AsyncIterator[List[dict]]:
+        indexes = (self._active, self._deleted) if include_deleted else (self._active,)
+        for index in indexes:
+            position = None
+            while True:
+                # Lock per batch and resume from the last key, so writes are not blocked
+                # for the whole export and only one batch of copies exists at a time
+                with self._lock:
+                    keys = index.get(user_id, [])
+                    end = bisect.bisect_left(keys, position) if position else len(keys)
+                    batch = keys[max(end - batch_size, 0):end]
+                    rows = [
+                        self._row(self._by_id[todo_id], TODO_EXPORT_FIELDS)
+                        for *_, todo_id in reversed(batch)
+                    ]
+                if not rows:
+                    break
+                position = batch[0]
+                yield rows
+
+    def _owned_active(self, user_id: str, todo_id: ObjectId) -> Optional[dict]:
+        todo = self._by_id.get(todo_id)
+        if todo is None or todo.get("user_id") != user_id or todo.get("is_deleted"):
+            return None
+        return todo
+
+    async def mark_completed(self, user_id: str, todo_id: ObjectId, updated_at: int) -> bool:
+        with self._lock:
+            todo = self._owned_active(user_id, todo_id)
+            return todo is not None and self._set(
+                todo, {"completed": True, "updated_at": updated_at}
+            )
+
+    async def mark_deleted(self, user_id: str, todo_id: ObjectId, deleted_at: int) -> bool:
+        with self._lock:
+            todo = self._owned_active(user_id, todo_id)
+            return todo is not None and self._set(
+                todo, {"is_deleted": True, "deleted_at": deleted_at, "updated_at": deleted_at}
+            )
+
+    async def find_active_ids(self, user_id: str, todo_ids: Iterable[ObjectId]) -> Set[ObjectId]:
+        with self._lock:
+            return {
+                todo_id
+                for todo_id in todo_ids
+                if (todo := self._by_id.get(todo_id)) is not None
+                and todo.get("user_id") == user_id
+                and not todo.get("is_deleted")
+            }
+
+    async def bulk_write(self, user_id: str, writes: List[TodoWrite]) -> Dict[int, str]:
+        errors = {}
+        # One lock hold for the whole batch, so readers never see half of it
+        with self._lock:
+            for index, write in enumerate(writes):
+                if write.todo_id is None:
+                    try:
+                        self._insert(write.document)
+                    except DuplicateKeyError as e:
+                        errors[index] = str(e)
+                    continue
+                todo = self._owned_active(user_id, write.todo_id)
+                if todo is not None:
+                    self._set(todo, write.document)
+        return errors
+
+
+class MemoryStorage(Storage):
+    def __init__(self):
+        # Operations never await while holding the lock; it guards against callers on
+        # other threads (sync test clients, threadpool dependencies), not other tasks
+        lock = threading.RLock()
+        self.users = MemoryUserRepository(lock)
+        self.todos = MemoryTodoRepository(lock)
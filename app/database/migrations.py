@@ -0,0 +1,108 @@
+import asyncio
+import logging
+from typing import Dict, List
+
+from pymongo import ASCENDING, UpdateOne
+from pymongo.asynchronous.database import AsyncDatabase
+
+from app.utils.time_utils import format_date, to_millis
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_ID = "numeric_timestamps_v1"
+
+TIMESTAMP_FIELDS: Dict[str, List[str]] = {
+    "todos": ["created_at", "updated_at", "due_date", "deleted_at"],
+    "users": ["created_at", "updated_at"],
+}
+
+
+def _build_update(collection: str, doc: dict) -> dict:
+    update = {}
+    for field in TIMESTAMP_FIELDS[collection]:
+        if field in doc and not isinstance(doc[field], int):
+            update[field] = to_millis(doc[field])
+    if collection == "todos" and "due_date_display" not in doc:
+        due_date = update.get("due_date", doc.get("due_date"))
+        update["due_date_display"] = format_date(due_date)
+    return update
+
+
+async def _migrate_collection(
+    db: AsyncDatabase, collection: str, batch_size: int, pause: float
+) -> int:
+    checkpoints = db.migrations
+    state = await checkpoints.find_one({"_id": MIGRATION_ID}) or {}
+    last_id = state.get(collection)
+
+    fields = TIMESTAMP_FIELDS[collection]
+    pending = [{field: {"$type": "string"}} for field in fields]
+    if collection == "todos":
+        pending.append({"due_date_display": {"$exists": False}})
+
+    migrated = 0
+    while True:
+        query = {"$or": pending}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        docs = (
+            await db[collection]
+            .find(query, {field: 1 for field in fields + ["due_date_display"]})
+            .sort("_id", ASCENDING)
+            .limit(batch_size)
+            .to_list(batch_size)
+        )
+        if not docs:
+            break
+
+        requests = []
+        for doc in docs:
+            # Match on the values we read so a concurrent write from the app is never overwritten
+            guard = {"_id": doc["_id"]}
+            guard.update({field: doc[field] for field in fields if field in doc})
+            requests.append(UpdateOne(guard, {"$set": _build_update(collection, doc)}))
+
+        result = await db[collection].bulk_write(requests, ordered=False)
+        migrated += result.modified_count
+        if result.matched_count < len(requests):
+            logger.warning(
+                "Timestamp migration skipped concurrently modified documents | collection=%s | skipped=%d | "
+                "re-run with --restart to sweep them",
+                collection,
+                len(requests) - result.matched_count,
+            )
+        last_id = docs[-1]["_id"]
+        await checkpoints.update_one(
+            {"_id": MIGRATION_ID}, {"$set": {collection: last_id}}, upsert=True
+        )
+        logger.info(
+            "Timestamp migration batch | collection=%s | batch=%d | modified=%d | last_id=%s",
+            collection,
+            len(docs),
+            result.modified_count,
+            last_id,
+        )
+        if pause:
+            await asyncio.sleep(pause)
+
+    return migrated
+
+
+async def migrate_timestamps(
+    db: AsyncDatabase, batch_size: int = 500, pause_ms: int = 0, restart: bool = False
+) -> Dict[str, int]:
+    """Rewrite string timestamps as int64 milliseconds in batches.
+
+    Progress is checkpointed per collection in the ``migrations`` collection, so an
+    interrupted run resumes where it stopped; ``restart`` rescans from the beginning.
+    """
+    if restart:
+        await db.migrations.delete_one({"_id": MIGRATION_ID})
+
+    summary = {}
+    for collection in TIMESTAMP_FIELDS:
+        summary[collection] = await _migrate_collection(
+            db, collection, batch_size, pause_ms / 1000
+        )
+    logger.info("Timestamp migration finished | modified=%s", summary)
+    return summary
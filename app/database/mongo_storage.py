@@ -0,0 +1,166 @@
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, InsertOne, UpdateOne
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import BulkWriteError
+
+from app.database.repository import (
+    TODO_EXPORT_FIELDS,
+    TODO_LIST_FIELDS,
+    Storage,
+    TodoPosition,
+    TodoRepository,
+    TodoWrite,
+    UserRepository,
+)
+
+
+def _write_errors(error: BulkWriteError) -> Dict[int, str]:
+    return {
+        item["index"]: item.get("errmsg", "Write failed")
+        for item in error.details.get("writeErrors", [])
+    }
+
+
+class MongoUserRepository(UserRepository):
+    def __init__(self, db: AsyncDatabase):
+        self.collection = db.users
+
+    async def find_by_email(self, email: str, with_password: bool = False) -> Optional[dict]:
+        if with_password:
+            return await self.collection.find_one({"email": email})
+        return await self.collection.find_one({"email": email}, {"password": 0})
+
+    async def insert(self, document: dict):
+        await self.collection.insert_one(document)
+
+    async def replace_password(
+        self, user_id: ObjectId, old_hash: str, new_hash: str, updated_at: int
+    ) -> bool:
+        result = await self.collection.update_one(
+            {"_id": user_id, "password": old_hash},
+            {"$set": {"password": new_hash, "updated_at": updated_at}},
+        )
+        return bool(result.modified_count)
+
+
+# The server renames _id to a string "id" (MongoDB 4.4+ projection expressions), so
+# decoded rows need no per-document reshaping before serialization
+TODO_LIST_PROJECTION = {
+    "_id": 0,
+    "id": {"$toString": "$_id"},
+    **{field: 1 for field in TODO_LIST_FIELDS},
+}
+
+TODO_EXPORT_PROJECTION = {
+    "_id": 0,
+    "id": {"$toString": "$_id"},
+    **{field: 1 for field in TODO_EXPORT_FIELDS},
+}
+# Walks the (user_id, is_deleted, created_at, _id) index in order, so no in-memory sort
+# is needed even when deleted todos are included
+TODO_EXPORT_SORT = [("is_deleted", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]
+
+
+class MongoTodoRepository(TodoRepository):
+    def __init__(self, db: AsyncDatabase):
+        self.collection = db.todos
+
+    async def insert(self, document: dict) -> ObjectId:
+        result = await self.collection.insert_one(document)
+        return result.inserted_id
+
+    async def insert_many(self, documents: List[dict]) -> Dict[int, str]:
+        try:
+            await self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            return _write_errors(e)
+        return {}
+
+    async def list_active(
+        self, user_id: str, limit: int, after: Optional[TodoPosition] = None
+    ) -> List[dict]:
+        query = {"user_id": user_id, "is_deleted": False}
+        if after:
+            created_at, todo_id = after
+            query["$or"] = [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "_id": {"$lt": todo_id}},
+            ]
+            if isinstance(created_at, str):
+                # Rows the timestamp migration has not reached keep a string created_at,
+                # which sorts above every number; $lt on a string only matches strings,
+                # so the numeric rows that follow in sort order are added explicitly
+                query["$or"].append({"created_at": {"$type": "number"}})
+        # Served by the (user_id, is_deleted, created_at, _id) index
+        return (
+            await self.collection.find(query, TODO_LIST_PROJECTION, limit=limit)
+            .sort([("created_at", DESCENDING), ("_id", DESCENDING)])
+            .to_list(limit)
+        )
+
+    async def export_batches(
+        self, user_id: str, include_deleted: bool, batch_size: int
+    ) -> AsyncIterator[List[dict]]:
+        query = {"user_id": user_id}
+        if not include_deleted:
+            query["is_deleted"] = False
+        # batch_size bounds each getMore reply, so the driver buffers one batch at a time
+        cursor = self.collection.find(query, TODO_EXPORT_PROJECTION, batch_size=batch_size).sort(
+            TODO_EXPORT_SORT
+        )
+        try:
+            batch = []
+            async for todo in cursor:
+                batch.append(todo)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        finally:
+            await cursor.close()
+
+    async def mark_completed(self, user_id: str, todo_id: ObjectId, updated_at: int) -> bool:
+        result = await self.collection.update_one(
+            {"_id": todo_id, "user_id": user_id, "is_deleted": False},
+            {"$set": {"completed": True, "updated_at": updated_at}},
+        )
+        return bool(result.modified_count)
+
+    async def mark_deleted(self, user_id: str, todo_id: ObjectId, deleted_at: int) -> bool:
+        result = await self.collection.update_one(
+            {"_id": todo_id, "user_id": user_id, "is_deleted": False},
+            {"$set": {"is_deleted": True, "deleted_at": deleted_at, "updated_at": deleted_at}},
+        )
+        return bool(result.modified_count)
+
+    async def find_active_ids(self, user_id: str, todo_ids: Iterable[ObjectId]) -> Set[ObjectId]:
+        docs = await self.collection.find(
+            {"_id": {"$in": list(set(todo_ids))}, "user_id": user_id, "is_deleted": False},
+            {"_id": 1},
+        ).to_list(None)
+        return {doc["_id"] for doc in docs}
+
+    async def bulk_write(self, user_id: str, writes: List[TodoWrite]) -> Dict[int, str]:
+        requests = [
+            InsertOne(write.document)
+            if write.todo_id is None
+            else UpdateOne(
+                {"_id": write.todo_id, "user_id": user_id, "is_deleted": False},
+                {"$set": write.document},
+            )
+            for write in writes
+        ]
+        try:
+            await self.collection.bulk_write(requests, ordered=False)
+        except BulkWriteError as e:
+            return _write_errors(e)
+        return {}
+
+
+class MongoStorage(Storage):
+    def __init__(self, db: AsyncDatabase):
+        self.users = MongoUserRepository(db)
+        self.todos = MongoTodoRepository(db)
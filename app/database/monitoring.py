@@ -0,0 +1,174 @@
+import logging
+from typing import Any, Dict, Tuple
+
+import orjson
+from pymongo import monitoring
+
+from app.utils.metrics import Counter, Gauge, Histogram, add_timing
+from core.config import settings
+
+slow_query_logger = logging.getLogger("app.database.slow_query")
+
+COMMAND_DURATION = Histogram(
+    "mongodb_command_duration_seconds",
+    "Driver-measured MongoDB command round trip",
+    labelnames=("command", "collection"),
+)
+COMMAND_FAILURES = Counter(
+    "mongodb_command_failures_total",
+    "MongoDB commands that returned an error",
+    labelnames=("command", "collection"),
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "mongodb_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection"
+)
+POOL_CHECKOUT_FAILURES = Counter(
+    "mongodb_pool_checkout_failures_total", "Failed connection checkouts", labelnames=("reason",)
+)
+POOL_CHECKED_OUT = Gauge(
+    "mongodb_pool_checked_out_connections", "Connections currently checked out of the pool"
+)
+POOL_OPEN = Gauge("mongodb_pool_open_connections", "Connections currently open, idle or in use")
+POOL_WAITING = Gauge(
+    "mongodb_pool_waiting_checkouts", "Operations currently waiting for a pooled connection"
+)
+POOL_MAX_SIZE = Gauge("mongodb_pool_max_size", "Configured maxPoolSize, per server")
+
+# Where each command keeps the part of its body that decides which documents it touches
+_FILTER_FIELDS = {
+    "find": ("filter", "sort"),
+    "count": ("query",),
+    "distinct": ("query",),
+    "findAndModify": ("query", "sort"),
+    "aggregate": ("pipeline",),
+}
+_STATEMENT_FIELDS = {"update": ("updates", "q"), "delete": ("deletes", "q")}
+
+
+def filter_shape(value: Any) -> Any:
+    """``value`` with every literal replaced by ``"?"``; keys, operators and nesting are kept."""
+    if isinstance(value, dict):
+        return {key: filter_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)) and any(isinstance(item, (dict, list, tuple)) for item in value):
+        return [filter_shape(item) for item in value]
+    return "?"
+
+
+def command_shape(command_name: str, command: dict) -> Dict[str, Any]:
+    shape = {}
+    for field in _FILTER_FIELDS.get(command_name, ()):
+        if field in command:
+            # Sort specs are field names and directions only, so they are logged verbatim
+            shape[field] = command[field] if field == "sort" else filter_shape(command[field])
+    if command_name in _STATEMENT_FIELDS:
+        statements, key = _STATEMENT_FIELDS[command_name]
+        shapes = []
+        for statement in command.get(statements, ()):
+            statement_shape = filter_shape(statement.get(key, {}))
+            if statement_shape not in shapes:
+                shapes.append(statement_shape)
+        shape[key] = shapes
+    return shape
+
+
+def _collection(command_name: str, command: dict) -> str:
+    if command_name == "getMore":
+        return command.get("collection", "")
+    target = command.get(command_name)
+    return target if isinstance(target, str) else ""
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Per-command latency metrics, the request's ``mongo`` Server-Timing phase and the
+    slow-query log.
+
+    The async driver publishes these events inline in the awaiting task, so timings land
+    in the context of the request that issued the command.
+    """
+
+    def __init__(self):
+        # (connection, request id) -> (command name, collection, command) until it completes
+        self._pending: Dict[Tuple[Any, int], Tuple[str, str, dict]] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        self._pending[(event.connection_id, event.request_id)] = (
+            event.command_name,
+            _collection(event.command_name, event.command),
+            event.command,
+        )
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        self._finish(event, failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        self._finish(event, failed=True)
+
+    def _finish(self, event, failed: bool):
+        seconds = event.duration_micros / 1_000_000
+        add_timing("mongo", seconds)
+
+        pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+        command_name, collection, command = pending
+        labels = (command_name, collection)
+        COMMAND_DURATION.observe(seconds, labels)
+        if failed:
+            COMMAND_FAILURES.inc(labels=labels)
+
+        threshold = settings.MONGO_SLOW_QUERY_MS
+        if threshold is not None and seconds * 1000 >= threshold:
+            # Shapes only: literal values (emails, titles, ids) never reach the log
+            slow_query_logger.warning(
+                "Slow MongoDB command | command=%s | collection=%s | duration_ms=%.2f | failed=%s | shape=%s",
+                command_name,
+                collection,
+                seconds * 1000,
+                failed,
+                orjson.dumps(command_shape(command_name, command), default=str).decode(),
+            )
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Checkout waits and queue depth plus open and checked-out connection counts.
+
+    Checked-out over max size is pool utilization; a growing waiting count or checkout
+    wait means maxPoolSize (or maxConnecting) is too small for the load.
+    """
+
+    def connection_check_out_started(self, event: monitoring.ConnectionCheckOutStartedEvent):
+        POOL_WAITING.inc()
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent):
+        POOL_WAITING.dec()
+        POOL_CHECKOUT_WAIT.observe(event.duration)
+        POOL_CHECKED_OUT.inc()
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent):
+        POOL_WAITING.dec()
+        POOL_CHECKOUT_WAIT.observe(event.duration)
+        POOL_CHECKOUT_FAILURES.inc(labels=(str(event.reason),))
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent):
+        POOL_CHECKED_OUT.dec()
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent):
+        POOL_OPEN.inc()
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent):
+        POOL_OPEN.dec()
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
@@ -0,0 +1,102 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+from bson import ObjectId
+
+# Keyset position in a todo list: the (created_at, _id) of the last row already seen
+TodoPosition = Tuple[object, ObjectId]
+
+# What list_active returns per todo, besides "id" (the string form of _id). Rows come
+# back in response shape, ready for orjson; is_deleted and deleted_at are left out
+# because they are always False and None for active todos.
+TODO_LIST_FIELDS = (
+    "user_id",
+    "title",
+    "description",
+    "completed",
+    "priority",
+    "due_date",
+    "due_date_display",
+    "created_at",
+    "updated_at",
+)
+
+# Export rows also carry the soft-delete state, since exports can include deleted todos
+TODO_EXPORT_FIELDS = TODO_LIST_FIELDS + ("is_deleted", "deleted_at")
+
+
+@dataclass(frozen=True)
+class TodoWrite:
+    """One write in a todo bulk operation.
+
+    Inserts ``document`` when ``todo_id`` is None; otherwise sets the fields in
+    ``document`` on that todo, provided it belongs to the user and is not deleted.
+    """
+
+    document: dict
+    todo_id: Optional[ObjectId] = None
+
+
+class UserRepository(ABC):
+    @abstractmethod
+    async def find_by_email(self, email: str, with_password: bool = False) -> Optional[dict]:
+        """The user document, without the password hash unless ``with_password``."""
+
+    @abstractmethod
+    async def insert(self, document: dict):
+        """Insert a new user; raises ``DuplicateKeyError`` if the email is taken."""
+
+    @abstractmethod
+    async def replace_password(
+        self, user_id: ObjectId, old_hash: str, new_hash: str, updated_at: int
+    ) -> bool:
+        """Swap the hash only if it is still ``old_hash``; False if someone else changed it."""
+
+
+class TodoRepository(ABC):
+    @abstractmethod
+    async def insert(self, document: dict) -> ObjectId:
+        """Insert a todo and return its id."""
+
+    @abstractmethod
+    async def insert_many(self, documents: List[dict]) -> Dict[int, str]:
+        """Insert unordered; returns an error message per failed document index."""
+
+    @abstractmethod
+    async def list_active(
+        self, user_id: str, limit: int, after: Optional[TodoPosition] = None
+    ) -> List[dict]:
+        """Up to ``limit`` non-deleted todos, newest first by (created_at, _id), starting
+        strictly after ``after``; each row has "id" plus ``TODO_LIST_FIELDS``."""
+
+    @abstractmethod
+    def export_batches(
+        self, user_id: str, include_deleted: bool, batch_size: int
+    ) -> AsyncIterator[List[dict]]:
+        """All of the user's todos in lists of at most ``batch_size`` rows: active ones
+        newest first, then deleted ones newest first. Each row has "id" plus
+        ``TODO_EXPORT_FIELDS``; only one batch is held at a time."""
+
+    @abstractmethod
+    async def mark_completed(self, user_id: str, todo_id: ObjectId, updated_at: int) -> bool:
+        """Complete the todo; False unless it belongs to the user and is not deleted."""
+
+    @abstractmethod
+    async def mark_deleted(self, user_id: str, todo_id: ObjectId, deleted_at: int) -> bool:
+        """Soft-delete the todo; False unless it belongs to the user and is not deleted."""
+
+    @abstractmethod
+    async def find_active_ids(self, user_id: str, todo_ids: Iterable[ObjectId]) -> Set[ObjectId]:
+        """The subset of ``todo_ids`` owned by the user and not deleted."""
+
+    @abstractmethod
+    async def bulk_write(self, user_id: str, writes: List[TodoWrite]) -> Dict[int, str]:
+        """Apply ``writes`` unordered; returns an error message per failed write index."""
+
+
+class Storage:
+    """The repositories the API works through, one per collection."""
+
+    users: UserRepository
+    todos: TodoRepository
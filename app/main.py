@@ -1,4 +1,3 @@
-import asyncio
 import logging
 from contextlib import asynccontextmanager
 
@@ -6,10 +5,24 @@ from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import ORJSONResponse
 from starlette import status
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.requests import Request
 
-from app.database.database import close_db, init_db
+from app.database.database import close_db, connect_with_retry, warm_pool
+from app.database.indexes import ensure_indexes
+from app.database.memory_storage import MemoryStorage
 from app.routes.router import include_routes
+from app.utils.api_handler import close_http_client, init_http_client
+from app.utils.auth_middleware import AuthContextMiddleware
+from app.utils.auth_utils import (
+    calibrate_bcrypt_rounds,
+    run_bcrypt,
+    set_bcrypt_rounds,
+    shutdown_bcrypt_pool,
+)
+from app.utils.health import health
+from app.utils.metrics_middleware import MetricsMiddleware
+from core.config import settings
 from app.utils.logging import setup_logging
 
 setup_logging()
@@ -21,30 +34,62 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     logger.info("Application startup initiated")
 
-    app.state.db = await init_db()
-
-    try:
-        await app.state.db.command("ping")
-        logger.info("MongoDB ping successful")
-    except Exception as e:
-        logger.warning(
-            "MongoDB ping failed, retrying after delay | error=%s",
-            str(e),
-            exc_info=True,
+    if settings.STORAGE_BACKEND == "memory":
+        logger.info("Using in-memory storage; data is not persisted")
+        app.state.db = None
+        app.state.storage = MemoryStorage()
+    else:
+        app.state.db = await connect_with_retry()
+        health.add_check("mongo", lambda: app.state.db.command("ping"))
+
+        try:
+            await ensure_indexes(app.state.db)
+        except Exception as e:
+            logger.error("Index bootstrap failed | error=%s", str(e), exc_info=True)
+
+        await warm_pool()
+
+    await init_http_client(app)
+
+    if settings.BCRYPT_TARGET_MS:
+        rounds = await run_bcrypt(
+            calibrate_bcrypt_rounds,
+            settings.BCRYPT_TARGET_MS,
+            settings.BCRYPT_MIN_ROUNDS,
+            settings.BCRYPT_MAX_ROUNDS,
+        )
+        set_bcrypt_rounds(rounds)
+        logger.info(
+            "bcrypt cost calibrated | rounds=%d | target_ms=%s", rounds, settings.BCRYPT_TARGET_MS
         )
-        await asyncio.sleep(5)
-        logger.info("Retrying MongoDB initialization")
-        await init_db()
 
+    await health.start()
     logger.info("Application startup completed")
     yield
 
     logger.info("Application shutdown initiated")
-    await close_db()
+    await health.stop()
+    await close_http_client()
+    shutdown_bcrypt_pool()
+    if settings.STORAGE_BACKEND == "mongo":
+        await close_db()
     logger.info("Application shutdown completed")
 
 
 app = FastAPI(lifespan=lifespan, title="To-Do App")
+app.add_middleware(AuthContextMiddleware)
+# Added last so it wraps everything, including the auth middleware it times
+app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(StarletteHTTPException)
+async def http_exception_handler(request: Request, exc: StarletteHTTPException):
+    # Raised outside the views (auth dependency, unknown routes); keep the API envelope
+    return ORJSONResponse(
+        status_code=exc.status_code,
+        content={"data": [], "message": exc.detail, "status": "failed"},
+        headers=getattr(exc, "headers", None),
+    )
 
 
 @app.exception_handler(RequestValidationError)
@@ -2,6 +2,7 @@ from fastapi import APIRouter
 
 from app.pages.pages import (
     add_todo_page,
+    bulk_todo_page,
     delete_todo,
     homepage,
     login_page,
@@ -26,3 +27,4 @@ PageRouter.add_api_route(
 )
 PageRouter.add_api_route("/complete-todo/{todo_id}", complete_todo_page, name="todos", methods=["POST"])
 PageRouter.add_api_route("/logout", logout_user, name="todos", methods=["GET"])
+PageRouter.add_api_route("/bulk-todos", bulk_todo_page, name="todos", methods=["POST"])
@@ -1,20 +1,25 @@
 import logging
 import time
 from datetime import date
+from urllib.parse import quote_plus
 
-from jose import ExpiredSignatureError
 from starlette import status
 from starlette.requests import Request
 from starlette.responses import RedirectResponse
 
-from app.apis.users.views import get_current_userid
-from app.templates.init_templates import templates
+from app.templates.init_templates import stream_template, templates
 from app.utils.api_handler import api_handler
 
 
 logger = logging.getLogger(__name__)
 
 
+def _is_auth_failure(message: str) -> bool:
+    """Whether an API failure message comes from a missing, invalid or expired token (401/403)."""
+    message = message.lower()
+    return any(word in message for word in ("token", "unauthorized", "expired", "missing"))
+
+
 async def login_page(request: Request, msg: str = None, error: str = None):
     logger.info("Login page accessed | method=%s", request.method)
     try:
@@ -65,7 +70,7 @@ async def login_page(request: Request, msg: str = None, error: str = None):
             status_code=500,
         )
 
-async def homepage(request: Request, msg: str = None, error: str = None):
+async def homepage(request: Request, msg: str = None, error: str = None, cursor: str = None):
     logger.info("Home page requested")
     token = request.cookies.get("access_token")
     if not token:
@@ -73,50 +78,65 @@ async def homepage(request: Request, msg: str = None, error: str = None):
         return RedirectResponse(
             url="/login?error=Session+expired.+Please+sign+in+again."
         )
+    principal = request.state.principal
+    if principal is None:
+        logger.warning("Session expired (JWT) during home access")
+        return RedirectResponse(url="/login?error=session_expired")
     try:
-
-
-        email = await get_current_userid(token)
+        email = principal.user_id
         logger.debug("Authenticated user | email=%s", email)
 
-        users = await api_handler("GET", "/users", params={"email": email}, token=token)
-        if users.get("status") == "failed":
-            message = users.get("message", "").lower()
+        started = time.perf_counter()
+        params = {}
+        if cursor:
+            params["cursor"] = cursor
+        dashboard = await api_handler("GET", "/dashboard", params=params, token=token)
+        if dashboard.get("status") == "failed":
+            message = dashboard.get("message", "")
             logger.warning(
                 "User lookup failed | email=%s | message=%s", email, message
             )
 
-            return RedirectResponse(
-                url="/login?error=unauthorized",
-                status_code=status.HTTP_303_SEE_OTHER,
+            if cursor and message == "Invalid cursor":
+                # A stale or hand-edited page link; start again from the first page
+                return RedirectResponse(
+                    url="/home?error=That+page+is+no+longer+available",
+                    status_code=status.HTTP_303_SEE_OTHER,
+                )
+            if _is_auth_failure(message):
+                return RedirectResponse(
+                    url="/login?error=unauthorized",
+                    status_code=status.HTTP_303_SEE_OTHER,
+                )
+            return templates.TemplateResponse(
+                "error.html",
+                {"request": request, "error": "Something went wrong"},
+                status_code=500,
             )
 
-        todos_res = await api_handler(
-            "GET", "/todos", params={"email": email}, token=token
+        data = dashboard.get("data")[0]
+        todos = data.get("todos", [])
+        logger.info(
+            "Todos loaded | email=%s | count=%d | elapsed_ms=%.2f",
+            email,
+            len(todos),
+            (time.perf_counter() - started) * 1000,
         )
 
-        if todos_res.get("status") == "failed":
-            error = todos_res.get("message", "")
-            logger.warning("Todo fetch failed | email=%s | message=%s", email, error)
-
-        todos = todos_res.get("data", [])
-        logger.info("Todos loaded | email=%s | count=%d", email, len(todos))
-
-        return templates.TemplateResponse(
+        return stream_template(
+            request,
             "todo_list.html",
             {
                 "request": request,
                 "todos": todos,
+                "next_cursor": data.get("next_cursor"),
+                "is_first_page": not cursor,
                 "msg": msg,
-                "user": users.get("data")[0],
+                "user": data.get("user"),
                 "error": error,
             },
         )
 
-    except ExpiredSignatureError:
-        logger.warning("Session expired (JWT) during home access")
-        return RedirectResponse(url="/login?error=session_expired")
-
     except Exception:
         logger.exception("Unhandled error while loading home page")
         return templates.TemplateResponse(
@@ -147,10 +167,6 @@ async def register_page(request: Request, msg: str = None, error: str = None):
                 "username": form.get("username"),
                 "email": form.get("email"),
                 "password": form.get("password"),
-                "role": "user",
-                "created_at": str(int(time.time() * 1000)),
-                "updated_at": "",
-                "enabled": True,
             }
 
             logger.info("User registration attempt | email=%s", body.get("email"))
@@ -217,14 +233,19 @@ async def add_todo_page(request: Request, msg: str = None, error: str = None):
             logger.warning("Add todo denied | missing access_token")
             return RedirectResponse(url="/login")
 
-        email = await get_current_userid(token)
+        principal = request.state.principal
+        if principal is None:
+            logger.warning("Add todo denied | session expired")
+            return RedirectResponse(url="/login?error=session_expired")
+        email = principal.user_id
         logger.debug("Add todo user | email=%s", email)
 
-        users = await api_handler("GET", "/users", params={"email": email}, token=token)
+        users = await api_handler(
+            "GET", "/dashboard", params={"include_todos": False}, token=token
+        )
         if users.get("status") == "failed":
             logger.warning("Add todo user validation failed | email=%s", email)
-            message = users.get("message", "").lower()
-            if "token" in message or "unauthorized" in message or "expired" in message:
+            if _is_auth_failure(users.get("message", "")):
                 return RedirectResponse(url="/login?error=session_expired")
             return RedirectResponse(url="/login?error=account_not_found")
 
@@ -235,7 +256,6 @@ async def add_todo_page(request: Request, msg: str = None, error: str = None):
                 "description": form.get("description"),
                 "due_date": form.get("due_date"),
                 "priority": form.get("priority"),
-                "email": await get_current_userid(token),
             }
 
             logger.info("Creating todo | email=%s | title=%s", email, body.get("title"))
@@ -255,7 +275,7 @@ async def add_todo_page(request: Request, msg: str = None, error: str = None):
             return RedirectResponse(url="/home", status_code=status.HTTP_303_SEE_OTHER)
         return templates.TemplateResponse(
             "add_todo.html",
-            {"request": request, "user": users.get("data")[0], "today": date.today().isoformat(), "error": error, "msg": msg},
+            {"request": request, "user": users.get("data")[0].get("user"), "today": date.today().isoformat(), "error": error, "msg": msg},
         )
 
     except Exception:
@@ -322,3 +342,43 @@ async def complete_todo_page(request: Request, todo_id: str):
                 {"request": request, "error": "Something went wrong"},
                 status_code=500,
             )
+
+
+async def bulk_todo_page(request: Request):
+    logger.info("Bulk todo action requested")
+    token = request.cookies.get("access_token")
+    if not token:
+        logger.warning("Bulk todo action denied | missing access_token")
+        return RedirectResponse(url="/login")
+    try:
+        form = await request.form()
+        action = form.get("action")
+        todo_ids = form.getlist("todo_ids")
+        if action not in ("complete", "delete") or not todo_ids:
+            return RedirectResponse(url="/home?error=No+tasks+selected", status_code=303)
+
+        body = {"operations": [{"op": action, "todo_id": todo_id} for todo_id in todo_ids]}
+        res = await api_handler("POST", "/todos/batch", body=body, token=token)
+        logger.info(
+            "Bulk todo action finished | action=%s | count=%d | message=%s",
+            action,
+            len(todo_ids),
+            res.get("message"),
+        )
+
+        if res.get("status") == "failed":
+            return RedirectResponse(
+                url=f"/home?error={quote_plus(res.get('message', 'Bulk action failed'))}",
+                status_code=303,
+            )
+        done = "Completed" if action == "complete" else "Removed"
+        return RedirectResponse(
+            url=f"/home?msg={quote_plus(f'{done} {len(todo_ids)} tasks')}", status_code=303
+        )
+    except Exception:
+        logger.exception("Unhandled error while running bulk todo action")
+        return templates.TemplateResponse(
+            "error.html",
+            {"request": request, "error": "Something went wrong"},
+            status_code=500,
+        )
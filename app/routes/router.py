@@ -1,9 +1,13 @@
 from fastapi import FastAPI
 
 from app.apis.auth.routes import AuthRouter
+from app.apis.dashboard.routes import DashboardRouter
+from app.apis.health.routes import HealthRouter
+from app.apis.metrics.routes import MetricsRouter
 from app.apis.todos.routes import TodoRouter
 from app.apis.users.routes import UserRouter
 from app.pages.page_router import PageRouter
+from core.config import settings
 
 
 def include_routes(app: FastAPI):
@@ -19,7 +23,14 @@ def include_routes(app: FastAPI):
         UserRouter,
         prefix="/api/v1",
     )
+    app.include_router(
+        DashboardRouter,
+        prefix="/api/v1",
+    )
     app.include_router(
         PageRouter,
         prefix="",
     )
+    app.include_router(HealthRouter)
+    if settings.METRICS_ENABLED:
+        app.include_router(MetricsRouter)
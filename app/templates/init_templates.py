@@ -1,3 +1,96 @@
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from markupsafe import Markup
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
 from starlette.templating import Jinja2Templates
 
-templates = Jinja2Templates(directory="app/templates")
+from app.utils.cache import TTLCache
+from app.utils.metrics import timed
+from core.config import settings
+
+TEMPLATE_DIR = Path(__file__).resolve().parent
+
+# Rendered todo rows keyed by the values the row displays, so any edit yields a new key
+# and an unchanged row is reused across renders and users' pages
+fragment_cache = TTLCache("template_fragments", maxsize=settings.TEMPLATE_FRAGMENT_CACHE_SIZE)
+
+_ROW_FIELDS = ("id", "title", "description", "completed", "due_date_display", "priority")
+
+
+def _bytecode_cache(kind: str) -> Optional[FileSystemBytecodeCache]:
+    if not settings.TEMPLATE_BYTECODE_CACHE:
+        return None
+    directory = settings.TEMPLATE_BYTECODE_CACHE_DIR
+    if directory:
+        Path(directory).mkdir(parents=True, exist_ok=True)
+    # Sync and async environments compile different code for the same source; keep them apart
+    return FileSystemBytecodeCache(directory, pattern=f"__taskpilot_{kind}_%s.cache")
+
+
+def _environment(kind: str, **options) -> Environment:
+    return Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=True,
+        bytecode_cache=_bytecode_cache(kind),
+        **options,
+    )
+
+
+class _TimedTemplates(Jinja2Templates):
+    def TemplateResponse(self, *args, **kwargs):
+        # Rendering happens here, before the response starts, so it shows in Server-Timing
+        with timed("render"):
+            return super().TemplateResponse(*args, **kwargs)
+
+
+# Regular pages render through Starlette's TemplateResponse, which needs a sync environment
+templates = _TimedTemplates(env=_environment("sync"))
+
+# Large pages stream through generate_async
+async_env = _environment("async", enable_async=True)
+async_env.globals.update(templates.env.globals)
+
+
+async def render_todo_row(todo: dict) -> Markup:
+    key = tuple(todo.get(field) for field in _ROW_FIELDS)
+    html = fragment_cache.get(key)
+    if html is None:
+        html = Markup(await async_env.get_template("todo_row.html").render_async(todo=todo))
+        fragment_cache.set(key, html)
+    return html
+
+
+async_env.globals["render_todo_row"] = render_todo_row
+
+
+async def _buffered(chunks: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    # generate_async yields many tiny strings; coalesce them so each send carries real payload
+    buffer, size = [], 0
+    async for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= settings.TEMPLATE_STREAM_CHUNK_SIZE:
+            yield "".join(buffer).encode()
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode()
+
+
+def stream_template(
+    request: Request, name: str, context: dict, status_code: int = 200
+) -> StreamingResponse:
+    """Stream ``name`` as it renders.
+
+    The status code is sent before rendering starts, so resolve anything that can fail
+    (API calls, lookups) before calling this.
+    """
+    context.setdefault("request", request)
+    template = async_env.get_template(name)
+    return StreamingResponse(
+        _buffered(template.generate_async(context)),
+        status_code=status_code,
+        media_type="text/html",
+    )
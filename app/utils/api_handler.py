@@ -1,12 +1,141 @@
+import hashlib
+import time
+from importlib.util import find_spec
 from typing import Any, Dict, Optional
 import logging
 
 import httpx
 
+from app.utils.cache import TTLCache
+from app.utils.metrics import Gauge, add_collector
 from core.config import settings
 
 logger = logging.getLogger(__name__)
 
+_client: Optional[httpx.AsyncClient] = None
+
+# (url, params, sha256(token)) -> (etag, parsed body) for conditional GETs; keyed on the
+# digest so live tokens are not kept in memory. Bodies are shared between callers, so
+# treat what api_handler returns as read-only.
+etag_cache = TTLCache("api_etags", maxsize=settings.API_ETAG_CACHE_SIZE)
+
+POOL_CONNECTIONS = Gauge("http_client_pool_connections", "Connections open in the shared HTTP client pool")
+POOL_ACTIVE = Gauge("http_client_pool_active_connections", "Pooled connections serving a request")
+POOL_IDLE = Gauge("http_client_pool_idle_connections", "Pooled keep-alive connections waiting for reuse")
+POOL_PENDING = Gauge(
+    "http_client_pool_pending_requests", "Requests queued in the pool, including those waiting for a connection"
+)
+POOL_MAX_CONNECTIONS = Gauge("http_client_pool_max_connections", "Configured HTTP_CLIENT_MAX_CONNECTIONS")
+
+
+def _build_client(app=None) -> httpx.AsyncClient:
+    if app is not None and settings.API_TRANSPORT == "asgi":
+        # Same-process dispatch: no socket, no pool; only the API path prefix matters
+        prefix = httpx.URL(settings.API_BASE_URL).path
+        return httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url=f"http://in-process{prefix}",
+            timeout=settings.HTTP_CLIENT_TIMEOUT,
+        )
+
+    http2 = settings.HTTP_CLIENT_HTTP2
+    if http2 and find_spec("h2") is None:
+        logger.warning("HTTP/2 requested but 'h2' is not installed, falling back to HTTP/1.1")
+        http2 = False
+
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE,
+        keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(
+        settings.HTTP_CLIENT_TIMEOUT,
+        connect=settings.HTTP_CLIENT_CONNECT_TIMEOUT,
+        pool=settings.HTTP_CLIENT_POOL_TIMEOUT,
+    )
+    return httpx.AsyncClient(
+        base_url=settings.API_BASE_URL,
+        limits=limits,
+        timeout=timeout,
+        http2=http2,
+    )
+
+
+async def init_http_client(app=None) -> httpx.AsyncClient:
+    """Create the shared client; pass the FastAPI app to enable the in-process ASGI transport."""
+    global _client
+
+    if _client is None or _client.is_closed:
+        logger.info(
+            "Initializing shared HTTP client | transport=%s base_url=%s max_connections=%s max_keepalive=%s http2=%s",
+            settings.API_TRANSPORT if app is not None else "http",
+            settings.API_BASE_URL,
+            settings.HTTP_CLIENT_MAX_CONNECTIONS,
+            settings.HTTP_CLIENT_MAX_KEEPALIVE,
+            settings.HTTP_CLIENT_HTTP2,
+        )
+        _client = _build_client(app)
+    return _client
+
+
+async def close_http_client():
+    global _client
+
+    if _client is None:
+        return
+    logger.info("Closing shared HTTP client | pool=%s", get_pool_stats())
+    try:
+        await _client.aclose()
+    except Exception as e:
+        logger.error("Failed to close shared HTTP client | error=%s", str(e), exc_info=True)
+    finally:
+        _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating an HTTP one lazily when lifespan did not run (tests, scripts)."""
+    global _client
+
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    stats = {
+        "initialized": _client is not None and not _client.is_closed,
+        "transport": "asgi" if isinstance(getattr(_client, "_transport", None), httpx.ASGITransport) else "http",
+        "max_connections": settings.HTTP_CLIENT_MAX_CONNECTIONS,
+        "max_keepalive": settings.HTTP_CLIENT_MAX_KEEPALIVE,
+        "connections": 0,
+        "active": 0,
+        "idle": 0,
+        "pending_requests": 0,
+    }
+    if not stats["initialized"]:
+        return stats
+
+    # httpx does not expose pool state publicly; read it from the httpcore pool when present
+    pool = getattr(getattr(_client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []))
+    idle = sum(1 for conn in connections if conn.is_idle())
+    stats["connections"] = len(connections)
+    stats["idle"] = idle
+    stats["active"] = len(connections) - idle
+    stats["pending_requests"] = len(getattr(pool, "_requests", []))
+    return stats
+
+
+@add_collector
+def _collect_pool_stats():
+    # httpcore has no pool events to count, so the gauges are sampled when /metrics renders
+    stats = get_pool_stats()
+    POOL_CONNECTIONS.set(stats["connections"])
+    POOL_ACTIVE.set(stats["active"])
+    POOL_IDLE.set(stats["idle"])
+    POOL_PENDING.set(stats["pending_requests"])
+    POOL_MAX_CONNECTIONS.set(stats["max_connections"])
+
 
 async def api_handler(
     method: str,
@@ -14,15 +143,22 @@ async def api_handler(
     params: Optional[Dict[str, Any]] = None,
     body: Optional[Dict[str, Any]] = None,
     token: Optional[str] = None,
+    timeout: Optional[float] = None,
 ) -> Any:
-    base_url = "http://127.0.0.1:8003/api/v1"
-
-    url = f"{base_url}/{endpoint.lstrip('/')}"
+    url = f"/{endpoint.lstrip('/')}"
     headers = {}
 
     if token:
         headers[settings.JWT_SECRET_KEY] = token
 
+    etag_key = cached = None
+    if method.upper() == "GET":
+        token_key = hashlib.sha256(token.encode("utf-8")).digest() if token else None
+        etag_key = (url, tuple(sorted((params or {}).items())), token_key)
+        cached = etag_cache.get(etag_key)
+        if cached is not None:
+            headers["If-None-Match"] = cached[0]
+
     logger.info(
         "API request started | method=%s url=%s params=%s",
         method.upper(),
@@ -30,40 +166,49 @@ async def api_handler(
         params,
     )
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.request(
-                method=method.upper(),
-                url=url,
-                params=params,
-                headers=headers,
-                json=body,
-                timeout=10.0,
-            )
-
-            logger.info(
-                "API response received | status=%s url=%s",
-                response.status_code,
-                url,
-            )
-
-            response.raise_for_status()
-            return response.json()
-
-        except httpx.HTTPStatusError as e:
-            logger.warning(
-                "API error response | status=%s url=%s response=%s",
-                e.response.status_code,
-                url,
-                e.response.text,
-            )
-            return e.response.json()
-
-        except Exception as e:
-            logger.error(
-                "API connection error | url=%s error=%s",
-                url,
-                str(e),
-                exc_info=True,
-            )
-            return {"data": [], "message": str(e), "status": "failed"}
+    client = get_http_client()
+    started = time.perf_counter()
+    try:
+        response = await client.request(
+            method=method.upper(),
+            url=url,
+            params=params,
+            headers=headers,
+            json=body,
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+        )
+
+        logger.info(
+            "API response received | status=%s url=%s elapsed_ms=%.2f",
+            response.status_code,
+            url,
+            (time.perf_counter() - started) * 1000,
+        )
+
+        if response.status_code == 304 and cached is not None:
+            return cached[1]
+
+        response.raise_for_status()
+        data = response.json()
+        etag = response.headers.get("etag")
+        if etag_key is not None and etag:
+            etag_cache.set(etag_key, (etag, data))
+        return data
+
+    except httpx.HTTPStatusError as e:
+        logger.warning(
+            "API error response | status=%s url=%s response=%s",
+            e.response.status_code,
+            url,
+            e.response.text,
+        )
+        return e.response.json()
+
+    except Exception as e:
+        logger.error(
+            "API connection error | url=%s error=%s",
+            url,
+            str(e),
+            exc_info=True,
+        )
+        return {"data": [], "message": str(e), "status": "failed"}
@@ -0,0 +1,31 @@
+import logging
+
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.utils.auth_utils import authenticate, extract_token
+from app.utils.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+
+class AuthContextMiddleware:
+    """Resolve the caller once per request and store it as ``request.state.principal``.
+
+    A missing or invalid token leaves the principal as ``None``; routes that require
+    authentication reject it through the ``get_token`` dependency.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http":
+            with timed("auth"):
+                connection = HTTPConnection(scope)
+                token = extract_token(connection.headers, connection.cookies)
+                principal = authenticate(token)
+            if token and principal is None:
+                logger.debug("Request carried an invalid or expired token | path=%s", scope["path"])
+            scope.setdefault("state", {})["principal"] = principal
+        await self.app(scope, receive, send)
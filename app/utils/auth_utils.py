@@ -1,16 +1,92 @@
+import asyncio
+import hashlib
+import logging
+import os
 import time
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, TypeVar
 
 import bcrypt
 from fastapi import HTTPException, Request
-from fastapi.responses import ORJSONResponse
 from jose import ExpiredSignatureError, JWTError, jwt
 
+from app.utils.cache import TTLCache
+from app.utils.metrics import Counter, Histogram
 from core.config import settings
 
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+BCRYPT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0)
+BCRYPT_QUEUE_WAIT = Histogram(
+    "bcrypt_queue_wait_seconds",
+    "Time a bcrypt call waited for a free hashing slot",
+    labelnames=("operation",),
+    buckets=BCRYPT_BUCKETS,
+)
+BCRYPT_DURATION = Histogram(
+    "bcrypt_duration_seconds",
+    "Time spent inside bcrypt",
+    labelnames=("operation",),
+    buckets=BCRYPT_BUCKETS,
+)
+BCRYPT_CALLS = Counter("bcrypt_calls_total", "bcrypt calls completed", labelnames=("operation",))
+
+token_cache = TTLCache("verified_tokens", maxsize=settings.TOKEN_CACHE_SIZE)
+
+_bcrypt_executor: Optional[ThreadPoolExecutor] = None
+_bcrypt_semaphore: Optional[asyncio.Semaphore] = None
+_bcrypt_rounds: int = settings.BCRYPT_ROUNDS
+
+
+def get_bcrypt_rounds() -> int:
+    return _bcrypt_rounds
+
+
+def set_bcrypt_rounds(rounds: int):
+    global _bcrypt_rounds
+
+    _bcrypt_rounds = rounds
+
+
+def calibrate_bcrypt_rounds(target_ms: float, min_rounds: int, max_rounds: int) -> int:
+    """Return the highest cost whose hash time stays within target_ms on this machine.
+
+    Each extra round doubles the cost, so probing stops at the first cost over budget.
+    """
+    chosen = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        started = time.perf_counter()
+        bcrypt.hashpw(b"calibration-password", bcrypt.gensalt(rounds=rounds))
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.debug("bcrypt calibration | rounds=%d | elapsed_ms=%.1f", rounds, elapsed_ms)
+        if elapsed_ms > target_ms:
+            break
+        chosen = rounds
+    return chosen
+
+
+def get_hash_rounds(password_hash: str) -> Optional[int]:
+    # Modular crypt format: $2b$<cost>$<salt+hash>
+    try:
+        return int(password_hash.split("$")[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def needs_rehash(password_hash: str) -> bool:
+    rounds = get_hash_rounds(password_hash)
+    if rounds is None:
+        return False
+    if settings.BCRYPT_REHASH_DOWNGRADE:
+        return rounds != _bcrypt_rounds
+    return rounds < _bcrypt_rounds
+
 
 def hash_password(password):
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=_bcrypt_rounds)
     password_bytes = password.encode("utf-8")
     password_hash = bcrypt.hashpw(password_bytes, salt).decode("utf-8")
     return password_hash
@@ -23,13 +99,66 @@ def verify_password(raw_password: str, hash_password: str):
     return bcrypt.checkpw(password_bytes, hash_password.encode("utf-8"))
 
 
+def _bcrypt_pool_size() -> int:
+    return settings.BCRYPT_POOL_SIZE or min(4, os.cpu_count() or 1)
+
+
+def _get_bcrypt_executor() -> ThreadPoolExecutor:
+    global _bcrypt_executor
+
+    if _bcrypt_executor is None:
+        _bcrypt_executor = ThreadPoolExecutor(
+            max_workers=_bcrypt_pool_size(), thread_name_prefix="bcrypt"
+        )
+    return _bcrypt_executor
+
+
+def _get_bcrypt_semaphore() -> asyncio.Semaphore:
+    global _bcrypt_semaphore
+
+    if _bcrypt_semaphore is None:
+        _bcrypt_semaphore = asyncio.Semaphore(
+            settings.BCRYPT_MAX_CONCURRENCY or _bcrypt_pool_size()
+        )
+    return _bcrypt_semaphore
+
+
+async def run_bcrypt(func: Callable[..., T], *args) -> T:
+    """Run a blocking bcrypt call on the bcrypt thread pool; bcrypt releases the GIL while hashing."""
+    operation = getattr(func, "__name__", "bcrypt")
+    queued = time.perf_counter()
+
+    def timed():
+        started = time.perf_counter()
+        return func(*args), started, time.perf_counter()
+
+    async with _get_bcrypt_semaphore():
+        loop = asyncio.get_running_loop()
+        result, started, finished = await loop.run_in_executor(_get_bcrypt_executor(), timed)
+
+    BCRYPT_QUEUE_WAIT.observe(started - queued, (operation,))
+    BCRYPT_DURATION.observe(finished - started, (operation,))
+    BCRYPT_CALLS.inc(labels=(operation,))
+    return result
+
+
+def shutdown_bcrypt_pool():
+    global _bcrypt_executor, _bcrypt_semaphore
+
+    if _bcrypt_executor is not None:
+        logger.info("Shutting down bcrypt pool")
+        _bcrypt_executor.shutdown(wait=False, cancel_futures=True)
+    _bcrypt_executor = None
+    _bcrypt_semaphore = None
+
+
 def signJWT(user_id: str) -> Dict[str, str]:
     payload = {"user_id": user_id, "expires": time.time() + 24 * 60 * 60}
     token = jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm="HS256")
     return {"access_token": token}
 
 
-def decodeJWT(token: str) -> dict:
+def _decode_and_verify(token: str) -> Optional[dict]:
     try:
         decoded_token = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=["HS256"])
         if decoded_token["expires"] >= time.time():
@@ -41,19 +170,57 @@ def decodeJWT(token: str) -> dict:
         return None
 
 
-async def get_token(request: Request):
-    try:
-        token = request.headers.get(settings.JWT_SECRET_KEY)
-        if not token:
-            raise HTTPException(
-                status_code=403, detail=f"Header '{settings.JWT_SECRET_KEY}' is missing!"
-            )
-        payload = decodeJWT(token)
-        if not payload:
-            raise HTTPException(status_code=401, detail="Token is invalid or expired")
+def decodeJWT(token: str) -> dict:
+    """Verify a token, reusing the payload of a token verified earlier until its `expires` claim."""
+    # Keyed by digest so raw bearer tokens are not kept in memory
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
         return payload
-    except HTTPException as e:
-        return ORJSONResponse(
-            content={"data": [], "message": e.detail, "status": "failed"},
-            status_code=e.status_code,
-        )
+
+    payload = _decode_and_verify(token)
+    if payload is not None:
+        token_cache.set(key, payload, expires_at=payload["expires"])
+    return payload
+
+
+_UNRESOLVED = object()
+
+
+@dataclass(frozen=True)
+class Principal:
+    user_id: str
+    expires: float
+
+
+def extract_token(headers, cookies) -> Optional[str]:
+    """API clients send the token in the auth header, the browser pages in the access_token cookie."""
+    token = headers.get(settings.JWT_SECRET_KEY) or cookies.get("access_token")
+    if token and token.startswith("Bearer "):
+        token = token[7:]
+    return token or None
+
+
+def authenticate(token: Optional[str]) -> Optional[Principal]:
+    if not token:
+        return None
+    payload = decodeJWT(token)
+    if not payload or not payload.get("user_id"):
+        return None
+    return Principal(user_id=payload["user_id"], expires=payload["expires"])
+
+
+async def get_token(request: Request) -> Principal:
+    """Dependency returning the principal resolved by AuthContextMiddleware."""
+    token = extract_token(request.headers, request.cookies)
+    if not token:
+        # The header name is the signing key, so it must never appear in a response
+        raise HTTPException(status_code=403, detail="Authentication token is missing")
+
+    principal = getattr(request.state, "principal", _UNRESOLVED)
+    if principal is _UNRESOLVED:
+        # Middleware not installed (e.g. a bare router in a script): resolve it here once
+        principal = request.state.principal = authenticate(token)
+    if principal is None:
+        raise HTTPException(status_code=401, detail="Token is invalid or expired")
+    return principal
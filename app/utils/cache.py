@@ -0,0 +1,73 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from app.utils.metrics import Counter
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "In-process cache lookups", labelnames=("cache", "result")
+)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Size-bounded LRU cache with an optional default TTL and per-entry expiry.
+
+    Meant for use from the event loop thread only; no locking.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: Optional[float] = None):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._hit_labels = (name, "hit")
+        self._miss_labels = (name, "miss")
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key, _MISSING)
+        if entry is not _MISSING:
+            value, expires_at = entry
+            if expires_at is None or expires_at > time.time():
+                self._data.move_to_end(key)
+                self.hits += 1
+                CACHE_REQUESTS.inc(labels=self._hit_labels)
+                return value
+            del self._data[key]
+        self.misses += 1
+        CACHE_REQUESTS.inc(labels=self._miss_labels)
+        return default
+
+    def set(self, key: Hashable, value: Any, expires_at: Optional[float] = None):
+        if self.maxsize <= 0:
+            return
+        if self.ttl is not None:
+            ttl_expiry = time.time() + self.ttl
+            expires_at = ttl_expiry if expires_at is None else min(expires_at, ttl_expiry)
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
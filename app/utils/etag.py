@@ -0,0 +1,61 @@
+import hashlib
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Random per process: counters restart at zero, so an ETag minted before a restart must not match
+_EPOCH = os.urandom(8).hex()
+
+# (resource, user) -> version, bumped on every write to that user's data
+_versions: Dict[Tuple[str, str], int] = {}
+
+
+def bump_version(resource: str, user: str):
+    key = (resource, user)
+    _versions[key] = _versions.get(key, 0) + 1
+
+
+def get_version(resource: str, user: str) -> int:
+    return _versions.get((resource, user), 0)
+
+
+def make_etag(user: str, resources: Dict[str, float], *variant) -> str:
+    """Strong ETag over the user's versions of ``resources`` plus the request ``variant``.
+
+    ``resources`` maps a resource name to its max age in seconds. The tag rolls over once
+    per window so a write handled by another worker, which never bumps this process's
+    counter, is not hidden for longer than the matching cache would hide it.
+    """
+    now = time.time()
+    parts = [_EPOCH, user]
+    for resource, max_age in sorted(resources.items()):
+        window = int(now // max_age) if max_age and max_age > 0 else 0
+        parts.append(f"{resource}:{get_version(resource, user)}:{window}")
+    parts.extend(repr(value) for value in variant)
+    digest = hashlib.blake2b("|".join(parts).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so a W/ prefix added by a proxy still matches
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Return a 304 when the request already holds ``etag``, otherwise None."""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=etag_headers(etag))
+    return None
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    # private: per-user data; no-cache: always revalidate, which is a cheap 304 when unchanged
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from app.utils.metrics import Gauge
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CHECK_UP = Gauge(
+    "health_check_up", "1 if the dependency passed its last background check", labelnames=("check",)
+)
+
+
+class HealthMonitor:
+    """Dependency checks run on a background task; probes read the last results.
+
+    A probe never waits on a dependency, so a slow or down Mongo cannot pile up probe
+    requests, and a thousand probes cost the same single ping per interval.
+    """
+
+    def __init__(self):
+        self.checks: Dict[str, Callable[[], Awaitable]] = {}
+        self.results: Dict[str, dict] = {}
+        self.started_at = time.time()
+        self.draining = False
+        self._task: Optional[asyncio.Task] = None
+
+    def add_check(self, name: str, check: Callable[[], Awaitable]):
+        self.checks[name] = check
+
+    async def _run_check(self, name: str, check: Callable[[], Awaitable]):
+        started = time.perf_counter()
+        error = None
+        try:
+            await asyncio.wait_for(check(), settings.HEALTH_CHECK_TIMEOUT)
+        except asyncio.TimeoutError:
+            error = "timeout"
+        except Exception as e:
+            error = str(e) or type(e).__name__
+
+        ok = error is None
+        if ok != self.results.get(name, {}).get("ok", True):
+            log = logger.info if ok else logger.warning
+            log("Health check changed | check=%s | ok=%s | error=%s", name, ok, error)
+        HEALTH_CHECK_UP.set(int(ok), labels=(name,))
+        self.results[name] = {
+            "ok": ok,
+            "error": error,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+            "checked_at": time.time(),
+        }
+
+    async def refresh(self):
+        await asyncio.gather(*(self._run_check(name, check) for name, check in self.checks.items()))
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(settings.HEALTH_CHECK_INTERVAL)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Health refresh failed")
+
+    async def start(self):
+        """Run the checks once, so readiness is known before traffic, then keep refreshing."""
+        self.draining = False
+        await self.refresh()
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        # Report not ready first so load balancers stop routing here during shutdown
+        self.draining = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def readiness(self) -> Tuple[bool, Dict[str, dict]]:
+        # A result older than a few intervals means the refresher is stuck; do not trust it
+        max_age = settings.HEALTH_CHECK_INTERVAL * 3 + settings.HEALTH_CHECK_TIMEOUT
+        now = time.time()
+        ready = not self.draining
+        for name in self.checks:
+            result = self.results.get(name)
+            if result is None or not result["ok"] or now - result["checked_at"] > max_age:
+                ready = False
+        return ready, dict(self.results)
+
+
+health = HealthMonitor()
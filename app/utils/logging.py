@@ -1,37 +1,121 @@
+import atexit
+import copy
 import logging
+import queue
+import random
 import sys
-from logging.config import dictConfig
-
-
-def setup_logging(log_level: str = "INFO"):
-    dictConfig(
-        {
-            "version": 1,
-            "disable_existing_loggers": False,
-            "formatters": {
-                "default": {
-                    "format": (
-                        "%(asctime)s | %(levelname)s | "
-                        "%(name)s | %(message)s"
-                    )
-                },
-                "access": {
-                    "format": (
-                        "%(asctime)s | ACCESS | "
-                        "%(client_addr)s | %(request_line)s | %(status_code)s"
-                    )
-                },
-            },
-            "handlers": {
-                "default": {
-                    "formatter": "default",
-                    "class": "logging.StreamHandler",
-                    "stream": sys.stdout,
-                },
-            },
-            "root": {
-                "level": log_level,
-                "handlers": ["default"],
-            },
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Sequence, TextIO
+
+import orjson
+
+from core.config import settings
+
+DEFAULT_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+
+class JSONFormatter(logging.Formatter):
+    """One orjson-encoded object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
         }
-    )
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+class SamplingFilter(logging.Filter):
+    """Sample and rate-limit INFO-and-below records from the hot-path loggers.
+
+    WARNING and above always pass. ``rate_limit`` caps records per logger per second.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        rate_limit: Optional[int] = None,
+        loggers: Sequence[str] = (),
+    ):
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.rate_limit = rate_limit
+        self.prefixes = tuple(loggers)
+        self._windows: Dict[str, list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO or not record.name.startswith(self.prefixes):
+            return True
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return False
+        if self.rate_limit is not None:
+            second = int(record.created)
+            window = self._windows.get(record.name)
+            if window is None or window[0] != second:
+                window = self._windows[record.name] = [second, 0]
+            if window[1] >= self.rate_limit:
+                return False
+            window[1] += 1
+        return True
+
+
+class _LocalQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue never leaves the process, so skip the pickling-oriented formatting the
+        # base class does here; only freeze the message and format on the listener thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def stop_logging():
+    """Drain the queue and stop the listener thread; safe to call more than once."""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def setup_logging(log_level: Optional[str] = None, stream: Optional[TextIO] = None):
+    global _listener
+
+    stop_logging()
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        output.setFormatter(JSONFormatter())
+    else:
+        output.setFormatter(logging.Formatter(DEFAULT_FORMAT))
+
+    handler: logging.Handler = output
+    if settings.LOG_QUEUE:
+        # Views log from the event loop thread; hand records to a background thread for I/O
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        handler = _LocalQueueHandler(log_queue)
+        _listener = QueueListener(log_queue, output, respect_handler_level=True)
+        _listener.start()
+
+    if settings.LOG_SAMPLE_RATE < 1 or settings.LOG_RATE_LIMIT is not None:
+        handler.addFilter(
+            SamplingFilter(
+                settings.LOG_SAMPLE_RATE, settings.LOG_RATE_LIMIT, settings.LOG_SAMPLED_LOGGERS
+            )
+        )
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+        existing.close()
+    root.addHandler(handler)
+    root.setLevel(log_level or settings.LOG_LEVEL)
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,157 @@
+import math
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Seconds; tuned for web request / database / hashing latencies
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+REGISTRY: List["Metric"] = []
+# Called before every render, for gauges read from state that has no events to hook
+COLLECTORS: List[Callable[[], None]] = []
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        REGISTRY.append(self)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, labels: Tuple[str, ...] = ()):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def get(self, labels: Tuple[str, ...] = ()) -> float:
+        return self.values.get(labels, 0)
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, labels: Tuple[str, ...] = ()):
+        self.values[labels] = self.values.get(labels, 0) - amount
+
+    def set(self, value: float, labels: Tuple[str, ...] = ()):
+        self.values[labels] = value
+
+
+class Histogram(Metric):
+    """Cumulative-bucket histogram; observe() is a bisect plus three additions."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self.values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, labels: Tuple[str, ...] = ()):
+        state = self.values.get(labels)
+        if state is None:
+            state = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def get(self, labels: Tuple[str, ...] = ()) -> Dict[str, float]:
+        counts, total, count = self.values.get(labels, [[], 0.0, 0])
+        return {"count": count, "sum": total}
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def add_collector(collect: Callable[[], None]) -> Callable[[], None]:
+    COLLECTORS.append(collect)
+    return collect
+
+
+def render_prometheus() -> str:
+    """Every registered metric in the Prometheus text exposition format (0.0.4)."""
+    for collect in COLLECTORS:
+        collect()
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for labels, value in list(metric.values.items()):
+            if isinstance(metric, Histogram):
+                counts, total, count = value
+                cumulative = 0
+                for bound, bucket_count in zip(metric.buckets + (math.inf,), counts):
+                    cumulative += bucket_count
+                    le = f'le="{_format_value(bound)}"'
+                    lines.append(
+                        f"{metric.name}_bucket{_labels(metric.labelnames, labels, le)} {cumulative}"
+                    )
+                suffix = _labels(metric.labelnames, labels)
+                lines.append(f"{metric.name}_sum{suffix} {_format_value(total)}")
+                lines.append(f"{metric.name}_count{suffix} {count}")
+            else:
+                lines.append(
+                    f"{metric.name}{_labels(metric.labelnames, labels)} {_format_value(value)}"
+                )
+    return "\n".join(lines) + "\n"
+
+
+# Per-request breakdown for the Server-Timing header: phase -> seconds. MetricsMiddleware
+# installs a dict per request; code outside a request records into nothing.
+request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def add_timing(name: str, seconds: float):
+    timings = request_timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_timing(name, time.perf_counter() - started)
+
+
+def format_server_timing(timings: Dict[str, float]) -> str:
+    return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in timings.items())
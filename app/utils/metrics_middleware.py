@@ -0,0 +1,81 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    format_server_timing,
+    request_timings,
+)
+from core.config import settings
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Request duration by route template",
+    labelnames=("method", "route"),
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requests currently being served", labelnames=("method",)
+)
+RESPONSES = Counter(
+    "http_responses_total", "Responses by route and status code", labelnames=("method", "route", "status")
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """Per-route latency, in-flight and status metrics plus a ``Server-Timing`` header.
+
+    Routes are labelled by their template (``/delete-todo/{todo_id}``), never the raw
+    path, so label cardinality stays bounded. Phases recorded with ``timed()`` or
+    ``add_timing()`` during the request (auth, mongo, render) appear in Server-Timing;
+    work done after the headers are sent, such as a streamed render, cannot.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        started = time.perf_counter()
+        parent = request_timings.get()
+        timings = {}
+        reset_token = request_timings.set(timings)
+        status_code = 500
+
+        async def send_with_timing(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.SERVER_TIMING:
+                    timings["app"] = time.perf_counter() - started
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", format_server_timing(timings).encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        in_flight = (method,)
+        REQUESTS_IN_FLIGHT.inc(labels=in_flight)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - started
+            REQUESTS_IN_FLIGHT.dec(labels=in_flight)
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            REQUEST_DURATION.observe(elapsed, (method, route))
+            RESPONSES.inc(labels=(method, route, str(status_code)))
+
+            request_timings.reset(reset_token)
+            if parent is not None:
+                # In-process API call made by a page: fold its phases into the page's breakdown
+                for name, seconds in timings.items():
+                    if name != "app":
+                        parent[name] = parent.get(name, 0.0) + seconds
+                parent["api"] = parent.get("api", 0.0) + elapsed
@@ -0,0 +1,47 @@
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Optional, Tuple
+
+# Anything below this is a UNIX timestamp in seconds (it is ~1973 in milliseconds)
+_SECONDS_CUTOFF = 100_000_000_000
+
+DISPLAY_DATE_FORMAT = "%Y-%m-%d"
+
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def to_millis(value: Any) -> Optional[int]:
+    """Normalise a legacy timestamp (ms/s digit string, number or ISO string) to int milliseconds."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool):
+        raise ValueError(f"Not a timestamp: {value!r}")
+    if isinstance(value, (int, float)):
+        number = int(value)
+    elif isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    elif isinstance(value, str):
+        try:
+            number = int(float(value))
+        except ValueError:
+            return int(datetime.fromisoformat(value).timestamp() * 1000)
+    else:
+        raise ValueError(f"Not a timestamp: {value!r}")
+    return number * 1000 if abs(number) < _SECONDS_CUTOFF else number
+
+
+def format_date(timestamp_ms: Optional[int]) -> Optional[str]:
+    if timestamp_ms is None:
+        return None
+    return datetime.fromtimestamp(timestamp_ms / 1000).strftime(DISPLAY_DATE_FORMAT)
+
+
+# Imports and batches repeat the same few due dates; strptime is the slow part
+@lru_cache(maxsize=4096)
+def parse_due_date(value: str) -> Tuple[int, str]:
+    """Parse a YYYY-MM-DD due date into (epoch ms at local midnight, display string)."""
+    date_obj = datetime.strptime(value, DISPLAY_DATE_FORMAT)
+    return int(date_obj.timestamp() * 1000), date_obj.strftime(DISPLAY_DATE_FORMAT)
@@ -0,0 +1,371 @@
+"""Endpoint load test: latency percentiles, throughput and event-loop lag per scenario.
+
+Drives the real app (routes, middleware, auth, caches, serialization) with concurrent
+virtual users running a weighted mix of login, create, list and complete requests.
+
+Targets:
+    --target asgi     app.main.app in-process through httpx.ASGITransport (default)
+    --target uvicorn  spawn a local uvicorn process and drive it over HTTP
+    --target url      an already running server given by --url
+
+Storage (asgi and uvicorn targets; a --url server uses its own STORAGE_BACKEND):
+    --storage memory  STORAGE_BACKEND=memory, no mongod needed (default)
+    --storage mongo   settings.MONGO_URI / DB_NAME, e.g. a local mongod
+
+    python -m benchmarks.bench_endpoints --concurrency 50 --requests 5000 --json before.json
+    python -m benchmarks.bench_endpoints --json after.json --compare before.json
+"""
+import argparse
+import asyncio
+import contextlib
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from typing import Dict, List, Optional
+
+os.environ.setdefault("JWT_SECRET_KEY", "Authorization")
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "todo_app_bench")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx  # noqa: E402
+import orjson  # noqa: E402
+
+from core.config import settings  # noqa: E402
+
+SCENARIOS = {
+    "list": {"list": 1},
+    "create": {"create": 1},
+    "complete": {"complete": 1},
+    "login": {"login": 1},
+    "mixed": {"login": 2, "create": 15, "list": 68, "complete": 15},
+}
+
+PASSWORD = "bench-password-1"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(samples),
+        "mean": sum(samples) / len(samples) if samples else 0.0,
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "max": max(samples, default=0.0),
+    }
+
+
+class VirtualUser:
+    def __init__(self, email: str):
+        self.email = email
+        self.token: Optional[str] = None
+        self.open_todos: List[str] = []
+
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, args):
+        self.client = client
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.run_id = uuid.uuid4().hex[:8]
+        self.users: List[VirtualUser] = []
+
+    def _headers(self, user: VirtualUser) -> Dict[str, str]:
+        return {settings.JWT_SECRET_KEY: user.token}
+
+    async def seed(self):
+        """Register users, log them in and give each a stock of open todos to complete."""
+        for index in range(self.args.users):
+            user = VirtualUser(f"bench-{self.run_id}-{index}@example.com")
+            response = await self.client.post(
+                "/api/v1/users",
+                json={"email": user.email, "password": PASSWORD, "username": f"Bench {index}"},
+            )
+            response.raise_for_status()
+            await self.login(user)
+            await self.seed_todos(user, self.args.todos_per_user)
+            self.users.append(user)
+
+    async def seed_todos(self, user: VirtualUser, count: int):
+        for start in range(0, count, settings.TODO_BATCH_MAX_SIZE):
+            operations = [
+                {"op": "create", "todo": self._todo_body(start + i)}
+                for i in range(min(settings.TODO_BATCH_MAX_SIZE, count - start))
+            ]
+            response = await self.client.post(
+                "/api/v1/todos/batch", json={"operations": operations}, headers=self._headers(user)
+            )
+            response.raise_for_status()
+            user.open_todos.extend(item["todo_id"] for item in response.json()["data"])
+
+    def _todo_body(self, index: int) -> dict:
+        return {
+            "title": f"Benchmark task {index}",
+            "description": "Generated by benchmarks.bench_endpoints",
+            "priority": str(index % 5 + 1),
+            "due_date": "2030-01-01",
+        }
+
+    async def login(self, user: VirtualUser) -> httpx.Response:
+        response = await self.client.post(
+            "/api/v1/login", json={"email": user.email, "password": PASSWORD}
+        )
+        if response.status_code == 200:
+            user.token = response.json()["data"][0]["access_token"]
+        return response
+
+    async def run_op(self, op: str, user: VirtualUser) -> httpx.Response:
+        if op == "login":
+            return await self.login(user)
+        if op == "create":
+            return await self.client.post(
+                "/api/v1/todos/create", json=self._todo_body(0), headers=self._headers(user)
+            )
+        if op == "complete":
+            return await self.client.put(
+                "/api/v1/todos/complete",
+                params={"todo_id": user.open_todos.pop()},
+                headers=self._headers(user),
+            )
+        return await self.client.get(
+            "/api/v1/todos", params={"limit": settings.TODO_PAGE_SIZE}, headers=self._headers(user)
+        )
+
+    async def run_scenario(self, mix: Dict[str, int]) -> dict:
+        ops, weights = list(mix), list(mix.values())
+        latencies: Dict[str, List[float]] = {op: [] for op in ops}
+        errors: Dict[str, int] = {op: 0 for op in ops}
+        lags: List[float] = []
+        remaining = self.args.requests + self.args.warmup
+        recorded = 0
+        stop = asyncio.Event()
+
+        # Every complete needs an open todo; top users up so the scenario never runs dry
+        share = mix.get("complete", 0) / sum(weights)
+        needed = math.ceil(remaining * share / len(self.users) * 1.5) + 1 if share else 0
+        for user in self.users:
+            if len(user.open_todos) < needed:
+                await self.seed_todos(user, needed - len(user.open_todos))
+
+        async def monitor_loop():
+            interval = 0.005
+            while not stop.is_set():
+                expected = time.perf_counter() + interval
+                await asyncio.sleep(interval)
+                lags.append(max(0.0, time.perf_counter() - expected) * 1000)
+
+        async def worker(user: VirtualUser):
+            nonlocal remaining, recorded
+            while remaining > 0:
+                remaining -= 1
+                warmup = remaining >= self.args.requests
+                op = self.rng.choices(ops, weights)[0]
+                if op == "complete" and not user.open_todos:
+                    # Several workers share a user, so the top-up is an estimate
+                    await self.seed_todos(user, 10)
+                started = time.perf_counter()
+                response = await self.run_op(op, user)
+                elapsed = (time.perf_counter() - started) * 1000
+                # The in-process transport never suspends; yield like a socket read would
+                await asyncio.sleep(0)
+                if warmup:
+                    continue
+                recorded += 1
+                latencies[op].append(elapsed)
+                if response.status_code >= 400:
+                    errors[op] += 1
+
+        monitor = asyncio.create_task(monitor_loop())
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(worker(self.users[i % len(self.users)]) for i in range(self.args.concurrency))
+        )
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await monitor
+
+        everything = [value for samples in latencies.values() for value in samples]
+        return {
+            "requests": recorded,
+            "errors": sum(errors.values()),
+            "duration_s": elapsed,
+            "rps": recorded / elapsed if elapsed else 0.0,
+            "latency_ms": summarize(everything),
+            "operations": {
+                op: {**summarize(samples), "errors": errors[op]}
+                for op, samples in latencies.items()
+                if samples
+            },
+            "loop_lag_ms": {key: summarize(lags)[key] for key in ("p50", "p99", "max")},
+        }
+
+
+@contextlib.asynccontextmanager
+async def asgi_client(storage: str):
+    from app.main import app
+
+    settings.STORAGE_BACKEND = storage
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            yield client
+
+
+@contextlib.asynccontextmanager
+async def http_client(url: str, concurrency: int):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30.0) as client:
+        yield client
+
+
+@contextlib.contextmanager
+def uvicorn_process(port: int, storage: str):
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env={**os.environ, "STORAGE_BACKEND": storage},
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                httpx.get(f"{url}/openapi.json", timeout=1.0)
+                break
+            except httpx.TransportError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn did not start")
+                time.sleep(0.2)
+        yield url
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(results: Dict[str, dict], baseline: Optional[dict]):
+    header = f"{'scenario':<10} {'rps':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7} {'lag p99':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, result in results.items():
+        latency = result["latency_ms"]
+        line = (
+            f"{name:<10} {result['rps']:9.0f} {latency['p50']:8.2f} {latency['p95']:8.2f} "
+            f"{latency['p99']:8.2f} {result['errors']:7d} {result['loop_lag_ms']['p99']:8.2f}"
+        )
+        previous = (baseline or {}).get("scenarios", {}).get(name)
+        if previous:
+            rps_delta = (result["rps"] / previous["rps"] - 1) * 100 if previous["rps"] else 0.0
+            p99_delta = (
+                (latency["p99"] / previous["latency_ms"]["p99"] - 1) * 100
+                if previous["latency_ms"]["p99"]
+                else 0.0
+            )
+            line += f"   vs baseline: rps {rps_delta:+.1f}%  p99 {p99_delta:+.1f}%"
+        print(line)
+
+
+async def run(args) -> dict:
+    if args.bcrypt_rounds is not None:
+        from app.utils.auth_utils import set_bcrypt_rounds
+
+        set_bcrypt_rounds(args.bcrypt_rounds)
+
+    async with contextlib.AsyncExitStack() as stack:
+        if args.target == "asgi":
+            client = await stack.enter_async_context(asgi_client(args.storage))
+        else:
+            url = args.url
+            if args.target == "uvicorn":
+                url = stack.enter_context(uvicorn_process(args.port, args.storage))
+            client = await stack.enter_async_context(http_client(url, args.concurrency))
+
+        test = LoadTest(client, args)
+        await test.seed()
+
+        results = {}
+        for name in args.scenario:
+            mix = SCENARIOS[name] if name in SCENARIOS else parse_mix(name)
+            results[name] = await test.run_scenario(mix)
+        return results
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    """``list=70,create=20,complete=10`` -> weights."""
+    mix = {}
+    for part in text.split(","):
+        op, _, weight = part.partition("=")
+        if op not in SCENARIOS["mixed"]:
+            raise argparse.ArgumentTypeError(f"Unknown operation {op!r}")
+        mix[op] = int(weight or 1)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--target", choices=("asgi", "uvicorn", "url"), default="asgi")
+    parser.add_argument("--storage", choices=("memory", "mongo"), default="memory")
+    parser.add_argument("--url", default="http://127.0.0.1:8003")
+    parser.add_argument("--port", type=int, default=8013, help="port for --target uvicorn")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        help=f"one of {', '.join(SCENARIOS)} or a custom mix such as list=70,create=30 (repeatable)",
+    )
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=5000, help="measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=200, help="unmeasured requests per scenario")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--todos-per-user", type=int, default=200)
+    parser.add_argument(
+        "--bcrypt-rounds", type=int, help="override the bcrypt cost for new hashes (asgi target)"
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="print deltas against a previous --json file")
+    args = parser.parse_args()
+    args.scenario = args.scenario or ["list", "create", "complete", "mixed"]
+
+    results = asyncio.run(run(args))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "rb") as handle:
+            baseline = orjson.loads(handle.read())
+    print_report(results, baseline)
+
+    if args.json:
+        report = {
+            "revision": git_revision(),
+            "config": {
+                key: value for key, value in vars(args).items() if key not in ("json", "compare")
+            },
+            "scenarios": results,
+        }
+        with open(args.json, "wb") as handle:
+            handle.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+
+
+if __name__ == "__main__":
+    main()
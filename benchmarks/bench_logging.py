@@ -0,0 +1,117 @@
+"""Request throughput under each logging mode.
+
+Simulates concurrent requests that log like the API views do (a few INFO lines each,
+interleaved with awaits) and reports requests/second and the worst event-loop stall.
+
+    python -m benchmarks.bench_logging --requests 20000 --concurrency 100
+    python -m benchmarks.bench_logging --sink-latency-us 50
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+os.environ.setdefault("JWT_SECRET_KEY", "Authorization")
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "todo_app_bench")
+
+from app.utils import logging as app_logging  # noqa: E402
+from core.config import settings  # noqa: E402
+
+MODES = {
+    "off": {"LOG_LEVEL": "WARNING"},
+    "sync_text": {"LOG_QUEUE": False},
+    "queued_text": {"LOG_QUEUE": True},
+    "queued_json": {"LOG_QUEUE": True, "LOG_FORMAT": "json"},
+    "queued_sampled_10pct": {"LOG_QUEUE": True, "LOG_SAMPLE_RATE": 0.1},
+}
+
+logger = logging.getLogger("app.apis.todos.views")
+
+
+class SlowStream:
+    """Wraps a file so every write blocks, like stdout piped to a busy log collector."""
+
+    def __init__(self, stream, latency_us: float):
+        self.stream = stream
+        self.latency = latency_us / 1_000_000
+
+    def write(self, data: str):
+        time.sleep(self.latency)
+        return self.stream.write(data)
+
+    def flush(self):
+        self.stream.flush()
+
+
+async def fake_request(index: int):
+    logger.info("Get todos request received | email=%s", f"user{index % 100}@example.com")
+    await asyncio.sleep(0)
+    logger.info("Todos fetched successfully | email=%s | count=%d", "user@example.com", 20)
+    await asyncio.sleep(0)
+    logger.info("API response received | status=%s url=%s elapsed_ms=%.2f", 200, "/todos", 1.5)
+
+
+async def run(requests: int, concurrency: int) -> dict:
+    stall = 0.0
+    done = asyncio.Event()
+
+    async def watch_loop():
+        nonlocal stall
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            stall = max(stall, time.perf_counter() - started - 0.001)
+
+    async def worker(offset: int):
+        for index in range(offset, requests, concurrency):
+            await fake_request(index)
+
+    watcher = asyncio.create_task(watch_loop())
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await watcher
+    return {"rps": requests / elapsed, "max_stall_ms": stall * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument(
+        "--output", help="file the logs are written to (default: a temporary file)"
+    )
+    parser.add_argument(
+        "--sink-latency-us",
+        type=float,
+        default=0,
+        help="block each log write this long to model a slow stdout consumer",
+    )
+    args = parser.parse_args()
+
+    defaults = {name: getattr(settings, name) for mode in MODES.values() for name in mode}
+    output = open(args.output, "w") if args.output else tempfile.NamedTemporaryFile("w", suffix=".log")
+    with output as stream:
+        if args.sink_latency_us:
+            stream = SlowStream(stream, args.sink_latency_us)
+        for mode, overrides in MODES.items():
+            for name, value in {**defaults, **overrides}.items():
+                setattr(settings, name, value)
+            app_logging.setup_logging(stream=stream)
+            result = asyncio.run(run(args.requests, args.concurrency))
+            # Include the drain time so queued modes are not credited for deferred writes
+            drain_started = time.perf_counter()
+            app_logging.stop_logging()
+            drain_ms = (time.perf_counter() - drain_started) * 1000
+            print(
+                f"{mode:<22} {result['rps']:12.0f} req/s   "
+                f"max loop stall {result['max_stall_ms']:7.2f} ms   drain {drain_ms:7.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
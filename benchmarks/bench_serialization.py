@@ -0,0 +1,123 @@
+"""Time to turn 1,000 todos from wire BSON into a JSON response body.
+
+Each path decodes a reply batch of 1,000 documents and serializes the list envelope:
+
+    full_docs      previous path: whole documents, _id -> id and due-date fixes in Python
+    raw_bson       whole documents decoded lazily as RawBSONDocument, shaped in Python
+    projected      current path: the server projects response-shaped rows, so rows are
+                   decoded straight into dicts orjson can serialize as they are
+
+The routes' response_model classes only document the API: the views return
+ORJSONResponse directly, so FastAPI never validates or re-serializes through them.
+
+    python -m benchmarks.bench_serialization --rounds 200
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("JWT_SECRET_KEY", "Authorization")
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "todo_app_bench")
+
+import bson  # noqa: E402
+import orjson  # noqa: E402
+from bson import ObjectId  # noqa: E402
+from bson.codec_options import CodecOptions  # noqa: E402
+from bson.raw_bson import RawBSONDocument  # noqa: E402
+
+from app.database.repository import TODO_LIST_FIELDS  # noqa: E402
+from app.utils.time_utils import format_date, to_millis  # noqa: E402
+
+RAW_OPTIONS = CodecOptions(document_class=RawBSONDocument)
+
+
+def make_documents(count: int):
+    created_at = 1_735_500_000_000
+    full, projected = [], []
+    for index in range(count):
+        doc = {
+            "_id": ObjectId(),
+            "user_id": "bench@example.com",
+            "title": f"Todo {index}",
+            "description": "Write the quarterly report and send it to the team",
+            "due_date": created_at + 86_400_000,
+            "due_date_display": "2024-12-30",
+            "completed": index % 3 == 0,
+            "priority": "High",
+            "created_at": created_at - index,
+            "updated_at": None,
+            "is_deleted": False,
+            "deleted_at": None,
+        }
+        full.append(doc)
+        projected.append({"id": str(doc["_id"]), **{field: doc[field] for field in TODO_LIST_FIELDS}})
+    return (
+        b"".join(bson.encode(doc) for doc in full),
+        b"".join(bson.encode(doc) for doc in projected),
+    )
+
+
+def shape_full(todo: dict) -> dict:
+    # What format_todo did for every row before the projection moved it to the server
+    todo["id"] = str(todo.pop("_id"))
+    if "due_date_display" not in todo:
+        todo["due_date"] = to_millis(todo.get("due_date"))
+        todo["due_date_display"] = format_date(todo["due_date"])
+    return todo
+
+
+def envelope(todos) -> dict:
+    return {"data": todos, "next_cursor": "cursor", "status": "success", "message": "Todos"}
+
+
+def full_docs(full_batch: bytes, projected_batch: bytes) -> bytes:
+    todos = [shape_full(todo) for todo in bson.decode_all(full_batch)]
+    return orjson.dumps(envelope(todos))
+
+
+def raw_bson(full_batch: bytes, projected_batch: bytes) -> bytes:
+    todos = []
+    for raw in bson.decode_all(full_batch, RAW_OPTIONS):
+        todo = {"id": str(raw["_id"])}
+        for field in TODO_LIST_FIELDS:
+            todo[field] = raw[field]
+        todos.append(todo)
+    return orjson.dumps(envelope(todos))
+
+
+def projected(full_batch: bytes, projected_batch: bytes) -> bytes:
+    return orjson.dumps(envelope(bson.decode_all(projected_batch)))
+
+
+PATHS = {
+    "full_docs": full_docs,
+    "raw_bson": raw_bson,
+    "projected": projected,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--todos", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    batches = make_documents(args.todos)
+    per_1000 = 1000 / args.todos
+    results = {}
+    for name, path in PATHS.items():
+        path(*batches)
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            body = path(*batches)
+        elapsed = (time.perf_counter() - started) / args.rounds
+        results[name] = elapsed * 1000 * per_1000
+        print(f"{name:<16} {results[name]:8.3f} ms per 1,000 todos   {len(body) / 1024:7.1f} KiB")
+    print(f"{'speedup':<16} {results['full_docs'] / results['projected']:8.1f}x (full_docs -> projected)")
+
+
+if __name__ == "__main__":
+    main()
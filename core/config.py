@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import List, Literal, Optional
 
 from pydantic_settings import BaseSettings
 
@@ -9,6 +10,114 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str
     MONGO_URI: str
     DB_NAME: str
+    # "memory" keeps users and todos in process (no mongod needed; lost on restart,
+    # not shared between workers), for benchmarks and local runs
+    STORAGE_BACKEND: Literal["mongo", "memory"] = "mongo"
+
+    LOG_LEVEL: str = "INFO"
+    # "json" writes one orjson object per line, cheaper for log ingest than parsing text
+    LOG_FORMAT: Literal["text", "json"] = "text"
+    # Hand records to a background thread so views never block on stdout
+    LOG_QUEUE: bool = True
+    # INFO-and-below records from these loggers are sampled and/or capped per second
+    LOG_SAMPLE_RATE: float = 1.0
+    LOG_RATE_LIMIT: Optional[int] = None
+    LOG_SAMPLED_LOGGERS: List[str] = ["app.apis", "app.pages", "app.utils.api_handler", "httpx"]
+
+    # Prometheus text exposition at /metrics and a Server-Timing header on every response
+    METRICS_ENABLED: bool = True
+    SERVER_TIMING: bool = True
+    # MongoDB commands at or above this duration are logged with their filter shape; None disables
+    MONGO_SLOW_QUERY_MS: Optional[float] = 100.0
+
+    # MongoDB client pool, one per worker. Startup opens MONGO_MIN_POOL_SIZE connections
+    # so the first requests do not pay for TCP/TLS handshakes and auth.
+    MONGO_MIN_POOL_SIZE: int = 10
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MAX_CONNECTING: int = 2
+    MONGO_MAX_IDLE_TIME_MS: Optional[int] = 300_000
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = 5_000
+    MONGO_CONNECT_TIMEOUT_MS: int = 5_000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 5_000
+    MONGO_SOCKET_TIMEOUT_MS: Optional[int] = None
+    # Wire compression in order of preference; the server picks the first it supports.
+    # zstd needs `zstandard`, snappy needs `python-snappy`; missing ones are skipped.
+    # zlib is always available, so compression stays on without the optional packages.
+    MONGO_COMPRESSORS: List[str] = ["zstd", "snappy", "zlib"]
+    # Startup pings Mongo up to this many times, sleeping a random 0..min(max, base * 2^n)
+    # seconds between attempts, then gives up so the orchestrator restarts the process
+    MONGO_CONNECT_ATTEMPTS: int = 6
+    MONGO_CONNECT_BACKOFF_BASE: float = 0.5
+    MONGO_CONNECT_BACKOFF_MAX: float = 10.0
+
+    # /readyz answers from checks refreshed in the background at this interval
+    HEALTH_CHECK_INTERVAL: float = 5.0
+    HEALTH_CHECK_TIMEOUT: float = 2.0
+
+    # Internal API client used by the page layer.
+    # "asgi" dispatches page -> API calls straight into this process,
+    # "http" goes over the network to API_BASE_URL (split deployments).
+    API_TRANSPORT: Literal["asgi", "http"] = "asgi"
+    API_BASE_URL: str = "http://127.0.0.1:8003/api/v1"
+    HTTP_CLIENT_TIMEOUT: float = 10.0
+    HTTP_CLIENT_CONNECT_TIMEOUT: float = 5.0
+    HTTP_CLIENT_POOL_TIMEOUT: float = 5.0
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE: int = 20
+    HTTP_CLIENT_KEEPALIVE_EXPIRY: Optional[float] = 30.0
+    HTTP_CLIENT_HTTP2: bool = False
+    # Last ETag and body kept per (url, params, token) so repeat GETs revalidate with a 304
+    API_ETAG_CACHE_SIZE: int = 1000
+
+    # bcrypt runs on a dedicated thread pool; None sizes it from the CPU count (max 4)
+    BCRYPT_POOL_SIZE: Optional[int] = None
+    BCRYPT_MAX_CONCURRENCY: Optional[int] = None
+    # Cost factor for new hashes; with BCRYPT_TARGET_MS set, startup calibration picks the
+    # highest cost in [BCRYPT_MIN_ROUNDS, BCRYPT_MAX_ROUNDS] that hashes within that budget
+    BCRYPT_ROUNDS: int = 12
+    BCRYPT_TARGET_MS: Optional[float] = None
+    BCRYPT_MIN_ROUNDS: int = 10
+    BCRYPT_MAX_ROUNDS: int = 15
+    # Workers calibrate independently and may pick different costs; stored hashes are only
+    # ever upgraded, unless lowering them is asked for explicitly
+    BCRYPT_REHASH_DOWNGRADE: bool = False
+
+    # Verified JWT payloads kept in memory (LRU, each entry expires with its token); 0 disables
+    TOKEN_CACHE_SIZE: int = 10000
+
+    # In-process user profile cache (per worker)
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL: float = 60.0
+
+    # Todo list pagination
+    TODO_PAGE_SIZE: int = 20
+    TODO_MAX_PAGE_SIZE: int = 100
+
+    # In-process cache of formatted todo pages (entries are pages, per worker)
+    TODO_CACHE_SIZE: int = 20000
+    TODO_CACHE_TTL: float = 30.0
+
+    # Most operations accepted by one POST /todos/batch call
+    TODO_BATCH_MAX_SIZE: int = 500
+
+    # Rows per cursor batch streamed by GET /todos/export; bounds its memory use
+    # whatever the size of the user's history
+    TODO_EXPORT_BATCH_SIZE: int = 500
+
+    # POST /todos/import writes rows with insert_many(ordered=False) in batches of this size,
+    # stops reading after TODO_IMPORT_MAX_ROWS rows and reports at most
+    # TODO_IMPORT_MAX_ERRORS row errors (the failed count is always complete)
+    TODO_IMPORT_BATCH_SIZE: int = 1000
+    TODO_IMPORT_MAX_ROWS: int = 100_000
+    TODO_IMPORT_MAX_ERRORS: int = 100
+
+    # Compiled templates persisted across restarts; None uses Jinja's per-user temp directory
+    TEMPLATE_BYTECODE_CACHE: bool = True
+    TEMPLATE_BYTECODE_CACHE_DIR: Optional[str] = None
+    # Rendered todo rows kept in memory (per worker); 0 disables
+    TEMPLATE_FRAGMENT_CACHE_SIZE: int = 5000
+    # Bytes of HTML buffered before each write of a streamed page
+    TEMPLATE_STREAM_CHUNK_SIZE: int = 16384
 
     class Config:
         env_file = f"{BASE_DIR}/.env"
@@ -1,5 +1,54 @@
+import argparse
+import asyncio
+
 import uvicorn
 
+
+async def explain_queries():
+    from app.database.database import close_db, init_db
+    from app.database.indexes import print_explain_plans
+
+    db = await init_db()
+    try:
+        await print_explain_plans(db)
+    finally:
+        await close_db()
+
+
+async def migrate_timestamps(batch_size: int, pause_ms: int, restart: bool):
+    from app.database.database import close_db, init_db
+    from app.database.migrations import migrate_timestamps as run_migration
+    from app.utils.logging import setup_logging
+
+    setup_logging()
+    db = await init_db()
+    try:
+        summary = await run_migration(db, batch_size, pause_ms, restart)
+        print(f"Migrated documents: {summary}")
+    finally:
+        await close_db()
+
+
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8003, reload=True)
+    parser = argparse.ArgumentParser(description="To-Do App")
+    parser.add_argument(
+        "--explain-queries",
+        action="store_true",
+        help="print MongoDB explain() plans for every query the API views issue and exit",
+    )
+    parser.add_argument(
+        "--migrate-timestamps",
+        action="store_true",
+        help="rewrite string timestamps as int64 milliseconds (resumable, safe to run while serving) and exit",
+    )
+    parser.add_argument("--batch-size", type=int, default=500, help="documents per migration batch")
+    parser.add_argument("--pause-ms", type=int, default=0, help="pause between migration batches")
+    parser.add_argument("--restart", action="store_true", help="ignore the saved migration checkpoint")
+    args = parser.parse_args()
 
+    if args.explain_queries:
+        asyncio.run(explain_queries())
+    elif args.migrate_timestamps:
+        asyncio.run(migrate_timestamps(args.batch_size, args.pause_ms, args.restart))
+    else:
+        uvicorn.run("app.main:app", host="0.0.0.0", port=8003, reload=True)
@@ -14,7 +14,8 @@ from core.config import settings
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
-    from app.database.database import get_db
+    from app.database.database import get_db, get_storage
+    from app.database.memory_storage import MemoryStorage
     from app.main import app
 
 except ImportError as e:
@@ -22,7 +23,7 @@ except ImportError as e:
     from fastapi import FastAPI
 
     app = FastAPI()
-    get_db = None
+    get_db = get_storage = MemoryStorage = None
 
 
 @pytest.fixture(scope="session")
@@ -79,12 +80,43 @@ async def set_test_db(mock_db):
     app.state.db = None
 
 
+@pytest.fixture(scope="function", autouse=True)
+def clear_caches():
+    from app.apis.todos.views import todo_cache
+    from app.apis.users.views import user_cache
+    from app.templates.init_templates import fragment_cache
+    from app.utils.api_handler import etag_cache
+
+    caches = (user_cache, todo_cache, etag_cache, fragment_cache)
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+
+
 @pytest.fixture(scope="function")
-async def client_with_mock_db(async_client, mock_get_db):
+async def client_with_mock_db(async_client, mock_get_db, auth_token):
 
     if get_db is not None:
         app.dependency_overrides[get_db] = mock_get_db
 
+    async_client.headers[settings.JWT_SECRET_KEY] = auth_token
+    yield async_client
+
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="function")
+def memory_storage():
+    return MemoryStorage()
+
+
+@pytest.fixture(scope="function")
+async def client_with_memory_storage(async_client, memory_storage, auth_token):
+    app.dependency_overrides[get_storage] = lambda: memory_storage
+
+    async_client.headers[settings.JWT_SECRET_KEY] = auth_token
     yield async_client
 
     app.dependency_overrides.clear()
@@ -145,9 +177,10 @@ def sample_todo_document():
 def sample_todo_list():
     now_ms = str(int(time.time() * 1000))
 
+    # Rows as the todo list projection returns them: "id" instead of _id, no soft-delete fields
     return [
         {
-            "_id": "507f1f77bcf86cd799439012",
+            "id": "507f1f77bcf86cd799439012",
             "user_id": "test@example.com",
             "title": "Todo 1",
             "description": "First todo",
@@ -156,11 +189,9 @@ def sample_todo_list():
             "priority": "High",
             "created_at": now_ms,
             "updated_at": "",
-            "is_deleted": False,
-            "deleted_at": "",
         },
         {
-            "_id": "507f1f77bcf86cd799439013",
+            "id": "507f1f77bcf86cd799439013",
             "user_id": "test@example.com",
             "title": "Todo 2",
             "description": "Second todo",
@@ -169,8 +200,6 @@ def sample_todo_list():
             "priority": "Low",
             "created_at": now_ms,
             "updated_at": "",
-            "is_deleted": False,
-            "deleted_at": "",
         },
     ]
 
@@ -180,7 +209,7 @@ def auth_token():
     try:
         from app.utils.auth_utils import signJWT
 
-        return signJWT("507f1f77bcf86cd799439011")["access_token"]
+        return signJWT("test@example.com")["access_token"]
 
     except Exception:
         return (
@@ -2,6 +2,8 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from app.utils import auth_utils
+
 
 class TestAuthAPI:
 
@@ -33,6 +35,35 @@ class TestAuthAPI:
         assert len(data["data"]) == 1
         assert "access_token" in data["data"][0]
 
+    @pytest.mark.asyncio
+    async def test_login_rehashes_outdated_cost(
+        self,
+        client_with_mock_db,
+        mock_db,
+        sample_user_document,
+        mock_password_hash,
+    ):
+        sample_user_document["password"] = "$2b$04$" + "x" * 53
+        mock_collection = AsyncMock()
+        mock_collection.find_one = AsyncMock(return_value=sample_user_document)
+        mock_db.users = mock_collection
+
+        previous = auth_utils.get_bcrypt_rounds()
+        auth_utils.set_bcrypt_rounds(5)
+        try:
+            response = await client_with_mock_db.post(
+                "/api/v1/login",
+                json={"email": "test@example.com", "password": "securepassword123"},
+            )
+        finally:
+            auth_utils.set_bcrypt_rounds(previous)
+
+        assert response.status_code == 200
+        mock_collection.update_one.assert_awaited_once()
+        query, update = mock_collection.update_one.await_args.args
+        assert query["_id"] == sample_user_document["_id"]
+        assert auth_utils.get_hash_rounds(update["$set"]["password"]) == 5
+
     @pytest.mark.asyncio
     async def test_login_user_not_found(self, client_with_mock_db, mock_db):
         mock_collection = AsyncMock()
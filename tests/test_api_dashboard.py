@@ -0,0 +1,61 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+
+class TestDashboardAPI:
+
+    @pytest.mark.asyncio
+    async def test_get_dashboard_success(
+        self, client_with_mock_db, mock_db, sample_user_document, sample_todo_list
+    ):
+        mock_db.users = AsyncMock()
+        mock_db.users.find_one = AsyncMock(return_value=sample_user_document)
+
+        mock_cursor = Mock()
+        mock_cursor.sort.return_value = mock_cursor
+        mock_cursor.to_list = AsyncMock(return_value=sample_todo_list)
+        mock_db.todos = Mock()
+        mock_db.todos.find = Mock(return_value=mock_cursor)
+
+        response = await client_with_mock_db.get("/api/v1/dashboard")
+
+        assert response.status_code == 200
+        data = response.json()["data"][0]
+        assert data["user"]["email"] == sample_user_document["email"]
+        assert "password" not in data["user"]
+        assert len(data["todos"]) == len(sample_todo_list)
+
+    @pytest.mark.asyncio
+    async def test_get_dashboard_without_todos(
+        self, client_with_mock_db, mock_db, sample_user_document
+    ):
+        mock_db.users = AsyncMock()
+        mock_db.users.find_one = AsyncMock(return_value=sample_user_document)
+        mock_db.todos = Mock()
+
+        response = await client_with_mock_db.get(
+            "/api/v1/dashboard?include_todos=false"
+        )
+
+        assert response.status_code == 200
+        assert response.json()["data"][0]["todos"] == []
+        mock_db.todos.find.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_dashboard_user_not_found(self, client_with_mock_db, mock_db):
+        mock_db.users = AsyncMock()
+        mock_db.users.find_one = AsyncMock(return_value=None)
+
+        mock_cursor = Mock()
+        mock_cursor.sort.return_value = mock_cursor
+        mock_cursor.to_list = AsyncMock(return_value=[])
+        mock_db.todos = Mock()
+        mock_db.todos.find = Mock(return_value=mock_cursor)
+
+        response = await client_with_mock_db.get(
+            "/api/v1/dashboard"
+        )
+
+        assert response.status_code == 404
+        assert response.json()["status"] == "failed"
@@ -0,0 +1,91 @@
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from app.main import app
+from app.utils import api_handler as handler
+
+
+class TestApiHandler:
+
+    @pytest.mark.asyncio
+    async def test_client_is_reused_between_calls(self, monkeypatch):
+        seen = []
+
+        def respond(request):
+            seen.append(request)
+            return httpx.Response(200, json={"data": [], "status": "success"})
+
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(respond), base_url="http://test/api/v1"
+        )
+        monkeypatch.setattr(handler, "_client", client)
+
+        await handler.api_handler("GET", "/users", params={"email": "a@b.com"})
+        await handler.api_handler("GET", "/todos", timeout=1.0)
+
+        assert handler.get_http_client() is client
+        assert [r.url.path for r in seen] == ["/api/v1/users", "/api/v1/todos"]
+        assert seen[1].extensions["timeout"]["read"] == 1.0
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_get_revalidates_with_stored_etag(self, monkeypatch):
+        seen = []
+        body = {"data": [{"email": "a@b.com"}], "status": "success"}
+
+        def respond(request):
+            seen.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304, headers={"ETag": '"v1"'})
+            return httpx.Response(200, json=body, headers={"ETag": '"v1"'})
+
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(respond), base_url="http://test/api/v1"
+        )
+        monkeypatch.setattr(handler, "_client", client)
+
+        first = await handler.api_handler("GET", "/users", token="t1")
+        second = await handler.api_handler("GET", "/users", token="t1")
+        other = await handler.api_handler("GET", "/users", token="t2")
+
+        assert first == second == other == body
+        assert seen == [None, '"v1"', None]
+        # Entries are keyed on a digest, so live tokens are not held by the cache
+        assert not any(token in key for key in handler.etag_cache._data for token in ("t1", "t2"))
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_init_and_close_http_client(self, monkeypatch):
+        monkeypatch.setattr(handler, "_client", None)
+
+        client = await handler.init_http_client()
+        stats = handler.get_pool_stats()
+
+        assert stats["initialized"] is True
+        assert stats["connections"] == 0
+
+        await handler.close_http_client()
+
+        assert client.is_closed
+        assert handler.get_pool_stats()["initialized"] is False
+
+    @pytest.mark.asyncio
+    async def test_asgi_transport_dispatches_in_process(
+        self, monkeypatch, client_with_mock_db, mock_db, sample_user_document, auth_token
+    ):
+        mock_db.users = AsyncMock()
+        mock_db.users.find_one = AsyncMock(return_value=sample_user_document)
+        monkeypatch.setattr(handler, "_client", None)
+        monkeypatch.setattr(handler.settings, "API_TRANSPORT", "asgi")
+
+        await handler.init_http_client(app)
+        try:
+            res = await handler.api_handler("GET", "/users", token=auth_token)
+            assert handler.get_pool_stats()["transport"] == "asgi"
+        finally:
+            await handler.close_http_client()
+
+        assert res["status"] == "success"
+        assert res["data"][0]["email"] == sample_user_document["email"]
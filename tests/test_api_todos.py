@@ -1,7 +1,18 @@
+import base64
+import gzip
 from unittest.mock import AsyncMock, Mock
 
+import orjson
 import pytest
 from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+from app.apis.todos.views import decode_cursor
+from app.database.mongo_storage import (
+    TODO_EXPORT_PROJECTION,
+    TODO_EXPORT_SORT,
+    TODO_LIST_PROJECTION,
+)
 
 
 class TestTodoAPI:
@@ -19,7 +30,7 @@ class TestTodoAPI:
         mock_collection.find = Mock(return_value=mock_cursor)
         mock_db.todos = mock_collection
 
-        response = await client_with_mock_db.get("/api/v1/todos?email=test@example.com")
+        response = await client_with_mock_db.get("/api/v1/todos")
 
         assert response.status_code == 200
         data = response.json()
@@ -37,10 +48,128 @@ class TestTodoAPI:
         mock_collection.find = Mock(return_value=mock_cursor)
         mock_db.todos = mock_collection
 
-        response = await client_with_mock_db.get("/api/v1/todos?email=test@example.com")
+        response = await client_with_mock_db.get("/api/v1/todos")
 
         assert response.status_code == 404
 
+    @pytest.mark.asyncio
+    async def test_get_todos_returns_next_cursor(
+        self, client_with_mock_db, mock_db, sample_todo_list
+    ):
+        first_id = ObjectId(sample_todo_list[0]["id"])
+        first_created_at = sample_todo_list[0]["created_at"]
+
+        mock_cursor = Mock()
+        mock_cursor.sort.return_value = mock_cursor
+        mock_cursor.to_list = AsyncMock(return_value=sample_todo_list)
+        mock_db.todos = Mock()
+        mock_db.todos.find = Mock(return_value=mock_cursor)
+
+        response = await client_with_mock_db.get(
+            "/api/v1/todos?limit=1"
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert len(body["data"]) == 1
+        assert body["next_cursor"]
+        mock_db.todos.find.assert_called_once_with(
+            {"user_id": "test@example.com", "is_deleted": False}, TODO_LIST_PROJECTION, limit=2
+        )
+
+        created_at, todo_id = decode_cursor(body["next_cursor"])
+        assert created_at == first_created_at
+        assert todo_id == first_id
+
+        mock_cursor.to_list = AsyncMock(return_value=[])
+        response = await client_with_mock_db.get(
+            f"/api/v1/todos?limit=1&cursor={body['next_cursor']}"
+        )
+
+        assert response.status_code == 200
+        assert response.json()["next_cursor"] is None
+        query = mock_db.todos.find.call_args.args[0]
+        # sample_todo_list rows are unmigrated (string created_at), so numeric rows follow
+        assert query["$or"] == [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": todo_id}},
+            {"created_at": {"$type": "number"}},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_get_todos_string_cursor_includes_numeric_rows(
+        self, client_with_mock_db, mock_db
+    ):
+        mock_cursor = Mock()
+        mock_cursor.sort.return_value = mock_cursor
+        mock_cursor.to_list = AsyncMock(return_value=[])
+        mock_db.todos = Mock()
+        mock_db.todos.find = Mock(return_value=mock_cursor)
+        todo_id = ObjectId()
+        raw = orjson.dumps(["1700000000", str(todo_id)])
+        cursor = base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+        response = await client_with_mock_db.get(f"/api/v1/todos?cursor={cursor}")
+
+        assert response.status_code == 200
+        query = mock_db.todos.find.call_args.args[0]
+        assert query["$or"] == [
+            {"created_at": {"$lt": "1700000000"}},
+            {"created_at": "1700000000", "_id": {"$lt": todo_id}},
+            {"created_at": {"$type": "number"}},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_get_todos_invalid_cursor(self, client_with_mock_db, mock_db):
+        mock_db.todos = Mock()
+
+        response = await client_with_mock_db.get(
+            "/api/v1/todos?cursor=not-a-cursor"
+        )
+
+        assert response.status_code == 400
+        assert response.json()["message"] == "Invalid cursor"
+        mock_db.todos.find.assert_not_called()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("created_at", [{"$ne": None}, [1], None, True, 1.5])
+    async def test_get_todos_rejects_cursor_operators(
+        self, client_with_mock_db, mock_db, client_with_memory_storage, created_at
+    ):
+        mock_db.todos = Mock()
+        mock_db.todos.find = Mock()
+        raw = orjson.dumps([created_at, str(ObjectId())])
+        cursor = base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+        for client in (client_with_mock_db, client_with_memory_storage):
+            response = await client.get(f"/api/v1/todos?cursor={cursor}")
+
+            assert response.status_code == 400
+            assert response.json()["message"] == "Invalid cursor"
+        mock_db.todos.find.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_todos_cached_until_write(
+        self, client_with_mock_db, mock_db, sample_todo_list
+    ):
+        mock_cursor = Mock()
+        mock_cursor.sort.return_value = mock_cursor
+        mock_cursor.to_list = AsyncMock(side_effect=lambda n: [dict(t) for t in sample_todo_list])
+        mock_db.todos = Mock()
+        mock_db.todos.find = Mock(return_value=mock_cursor)
+        mock_db.todos.update_one = AsyncMock(return_value=Mock(modified_count=1))
+
+        first = await client_with_mock_db.get("/api/v1/todos")
+        second = await client_with_mock_db.get("/api/v1/todos")
+
+        assert first.json() == second.json()
+        assert mock_db.todos.find.call_count == 1
+
+        await client_with_mock_db.put(f"/api/v1/todos/complete?todo_id={ObjectId()}")
+        await client_with_mock_db.get("/api/v1/todos")
+
+        assert mock_db.todos.find.call_count == 2
+
     @pytest.mark.asyncio
     async def test_create_todo_success(self, client_with_mock_db, mock_db):
         mock_collection = AsyncMock()
@@ -60,6 +189,11 @@ class TestTodoAPI:
         assert response.status_code == 201
         assert response.json()["status"] == "success"
 
+        document = mock_collection.insert_one.await_args.args[0]
+        assert isinstance(document["created_at"], int)
+        assert isinstance(document["due_date"], int)
+        assert document["due_date_display"] == "2025-12-30"
+
     @pytest.mark.asyncio
     async def test_create_todo_missing_title(self, client_with_mock_db):
         payload = {
@@ -137,11 +271,27 @@ class TestTodoAPI:
         assert body["status"] == "success"
         assert body["message"] == "Todo marked as completed"
 
-        mock_collection.update_one.assert_awaited_once_with(
-            {"_id": ObjectId(todo_id)},
-            {"$set": {"completed": True}},
+        query, update = mock_collection.update_one.await_args.args
+        assert query == {"_id": ObjectId(todo_id), "user_id": "test@example.com", "is_deleted": False}
+        assert update["$set"]["completed"] is True
+        assert isinstance(update["$set"]["updated_at"], int)
+
+    @pytest.mark.asyncio
+    async def test_complete_and_delete_only_touch_own_todos(
+        self, client_with_memory_storage, memory_storage
+    ):
+        theirs = await memory_storage.todos.insert(
+            {"user_id": "other@example.com", "title": "Not mine", "created_at": 1,
+             "completed": False, "is_deleted": False}
         )
 
+        completed = await client_with_memory_storage.put(f"/api/v1/todos/complete?todo_id={theirs}")
+        deleted = await client_with_memory_storage.delete(f"/api/v1/todos?todo_id={theirs}")
+
+        assert (completed.status_code, deleted.status_code) == (404, 404)
+        (todo,) = await memory_storage.todos.list_active("other@example.com", 10)
+        assert todo["completed"] is False
+
     @pytest.mark.asyncio
     async def test_complete_todo_not_found(self, client_with_mock_db, mock_db):
         mock_collection = AsyncMock()
@@ -197,3 +347,259 @@ class TestTodoAPI:
         assert body["status"] == "failed"
         assert "DB failure" in body["message"]
 
+    @pytest.mark.asyncio
+    async def test_batch_todos_reports_each_item(self, client_with_mock_db, mock_db):
+        existing = ObjectId()
+        missing = ObjectId()
+        mock_cursor = Mock()
+        mock_cursor.to_list = AsyncMock(return_value=[{"_id": existing}])
+        mock_db.todos = Mock()
+        mock_db.todos.find = Mock(return_value=mock_cursor)
+        mock_db.todos.bulk_write = AsyncMock()
+
+        payload = {
+            "operations": [
+                {
+                    "op": "create",
+                    "todo": {
+                        "title": "Batch Todo",
+                        "description": "Created in a batch",
+                        "priority": "3",
+                        "due_date": "2030-01-01",
+                    },
+                },
+                {"op": "complete", "todo_id": str(existing)},
+                {"op": "delete", "todo_id": str(missing)},
+                {"op": "delete", "todo_id": "not-an-id"},
+            ]
+        }
+
+        response = await client_with_mock_db.post("/api/v1/todos/batch", json=payload)
+
+        assert response.status_code == 200
+        body = response.json()
+        assert [item["status"] for item in body["data"]] == [
+            "success", "success", "failed", "failed"
+        ]
+        assert body["data"][0]["todo_id"]
+        assert body["data"][2]["message"] == "Todo not found"
+        assert body["message"] == "2 of 4 operations succeeded"
+
+        requests = mock_db.todos.bulk_write.await_args.args[0]
+        assert mock_db.todos.bulk_write.await_args.kwargs == {"ordered": False}
+        assert len(requests) == 2
+        assert requests[1]._filter == {
+            "_id": existing, "user_id": "test@example.com", "is_deleted": False
+        }
+
+    @pytest.mark.asyncio
+    async def test_batch_todos_maps_write_errors(self, client_with_mock_db, mock_db):
+        mock_db.todos = Mock()
+        mock_db.todos.bulk_write = AsyncMock(
+            side_effect=BulkWriteError(
+                {"writeErrors": [{"index": 0, "errmsg": "Document failed validation"}]}
+            )
+        )
+        todo = {"title": "T", "description": "D", "priority": "1", "due_date": "2030-01-01"}
+
+        response = await client_with_mock_db.post(
+            "/api/v1/todos/batch",
+            json={"operations": [{"op": "create", "todo": todo}] * 2},
+        )
+
+        data = response.json()["data"]
+        assert [item["status"] for item in data] == ["failed", "success"]
+        assert data[0]["message"] == "Document failed validation"
+
+    @pytest.mark.asyncio
+    async def test_batch_todos_rejects_missing_payload(self, client_with_mock_db):
+        response = await client_with_mock_db.post(
+            "/api/v1/todos/batch", json={"operations": [{"op": "complete"}]}
+        )
+
+        assert response.status_code == 422
+
+
+class TestTodoExport:
+
+    @pytest.mark.asyncio
+    async def test_export_streams_batches_as_ndjson(
+        self, client_with_memory_storage, memory_storage, monkeypatch
+    ):
+        monkeypatch.setattr("app.apis.todos.views.settings.TODO_EXPORT_BATCH_SIZE", 2)
+        ids = [
+            await memory_storage.todos.insert(
+                {"user_id": "test@example.com", "title": f"T{n}", "created_at": n,
+                 "due_date_display": None, "is_deleted": False}
+            )
+            for n in range(5)
+        ]
+        await memory_storage.todos.insert(
+            {"user_id": "other@example.com", "title": "Not mine", "created_at": 9,
+             "due_date_display": None, "is_deleted": False}
+        )
+        await memory_storage.todos.mark_deleted("test@example.com", ids[0], 10)
+
+        response = await client_with_memory_storage.get("/api/v1/todos/export")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        rows = [orjson.loads(line) for line in response.content.splitlines()]
+        assert [row["title"] for row in rows] == ["T4", "T3", "T2", "T1"]
+
+        response = await client_with_memory_storage.get(
+            "/api/v1/todos/export?include_deleted=true&compress=true"
+        )
+
+        assert response.headers["content-type"] == "application/gzip"
+        rows = [orjson.loads(line) for line in gzip.decompress(response.content).splitlines()]
+        assert [row["title"] for row in rows] == ["T4", "T3", "T2", "T1", "T0"]
+        assert rows[-1]["is_deleted"] is True
+
+    @pytest.mark.asyncio
+    async def test_export_reads_mongo_cursor_in_batches(self, client_with_mock_db, mock_db):
+        docs = [{"id": str(ObjectId()), "title": "T", "due_date_display": None}] * 3
+
+        class Cursor:
+            def sort(self, spec):
+                self.sort_spec = spec
+                return self
+
+            def __aiter__(self):
+                return self._iterate()
+
+            async def _iterate(self):
+                for doc in docs:
+                    yield dict(doc)
+
+        cursor = Cursor()
+        cursor.close = AsyncMock()
+        mock_db.todos = Mock()
+        mock_db.todos.find = Mock(return_value=cursor)
+
+        response = await client_with_mock_db.get("/api/v1/todos/export")
+
+        assert len(response.content.splitlines()) == 3
+        mock_db.todos.find.assert_called_once_with(
+            {"user_id": "test@example.com", "is_deleted": False},
+            TODO_EXPORT_PROJECTION,
+            batch_size=500,
+        )
+        assert cursor.sort_spec == TODO_EXPORT_SORT
+        cursor.close.assert_awaited_once()
+
+
+class TestTodoImport:
+
+    @pytest.mark.asyncio
+    async def test_import_csv_reports_bad_rows(self, client_with_memory_storage, memory_storage):
+        body = (
+            "title,description,priority,due_date\n"
+            'Report,"Line one\nline two",1,2030-01-01\n'
+            "Bad date,D,1,2030-13-01\n"
+            "Short row,D\n"
+            "Groceries,Milk,2,2030-01-02\n"
+        )
+
+        response = await client_with_memory_storage.post(
+            "/api/v1/todos/import", content=body, headers={"Content-Type": "text/csv"}
+        )
+
+        assert response.status_code == 200
+        result = response.json()
+        assert result["status"] == "failed"
+        assert result["message"] == "2 of 4 rows imported"
+        summary = result["data"][0]
+        assert (summary["imported"], summary["failed"], summary["truncated"]) == (2, 2, False)
+        assert [error["row"] for error in summary["errors"]] == [2, 3]
+        assert summary["errors"][1]["message"] == "Expected 4 columns, got 2"
+        todos = await memory_storage.todos.list_active("test@example.com", 10)
+        assert {todo["title"] for todo in todos} == {"Report", "Groceries"}
+        assert any(todo["description"] == "Line one\nline two" for todo in todos)
+
+    @pytest.mark.asyncio
+    async def test_import_csv_stray_quote_fails_only_its_row(
+        self, client_with_memory_storage, memory_storage
+    ):
+        header = "title,description,priority,due_date\n"
+        rows = "".join(f"T{n},D,1,2030-01-01\n" for n in range(1000))
+
+        # A quote inside an unquoted field is plain text, as it is to the csv module
+        response = await client_with_memory_storage.post(
+            "/api/v1/todos/import",
+            content=header + 'TV,5" screen,1,2030-01-01\n' + rows,
+            headers={"Content-Type": "text/csv"},
+        )
+
+        summary = response.json()["data"][0]
+        assert (summary["imported"], summary["failed"]) == (1001, 0)
+
+        # A quoted field that never closes fails its own row; parsing resumes on the next line
+        response = await client_with_memory_storage.post(
+            "/api/v1/todos/import",
+            content=header + 'TV,"5 screen,1,2030-01-01\n' + rows,
+            headers={"Content-Type": "text/csv"},
+        )
+
+        summary = response.json()["data"][0]
+        assert (summary["imported"], summary["failed"]) == (1000, 1)
+        assert summary["errors"] == [{"row": 1, "message": "Unterminated quoted field"}]
+
+    @pytest.mark.asyncio
+    async def test_import_ndjson_in_batches(
+        self, client_with_memory_storage, memory_storage, monkeypatch
+    ):
+        monkeypatch.setattr("app.apis.todos.views.settings.TODO_IMPORT_BATCH_SIZE", 2)
+        calls = []
+        insert_many = memory_storage.todos.insert_many
+
+        async def record(documents):
+            calls.append(len(documents))
+            return await insert_many(documents)
+
+        monkeypatch.setattr(memory_storage.todos, "insert_many", record)
+        todo = {"description": "D", "priority": "1", "due_date": "2030-01-01"}
+        lines = [orjson.dumps({"title": f"T{n}", **todo}) for n in range(5)]
+        lines.insert(2, b"not json")
+        lines.insert(3, b'{"title": "No description"}')
+
+        response = await client_with_memory_storage.post(
+            "/api/v1/todos/import?format=ndjson", content=b"\n".join(lines)
+        )
+
+        summary = response.json()["data"][0]
+        assert (summary["imported"], summary["failed"]) == (5, 2)
+        assert summary["errors"][0] == {"row": 3, "message": "Invalid JSON"}
+        assert summary["errors"][1]["row"] == 4
+        assert calls == [2, 2, 1]
+        assert len(await memory_storage.todos.list_active("test@example.com", 10)) == 5
+
+    @pytest.mark.asyncio
+    async def test_import_maps_mongo_write_errors(self, client_with_mock_db, mock_db):
+        mock_db.todos = Mock()
+        mock_db.todos.insert_many = AsyncMock(
+            side_effect=BulkWriteError(
+                {"writeErrors": [{"index": 1, "errmsg": "Document failed validation"}]}
+            )
+        )
+        body = "title,description,priority,due_date\nA,D,1,2030-01-01\nB,D,1,2030-01-01\n"
+
+        response = await client_with_mock_db.post(
+            "/api/v1/todos/import", content=body, headers={"Content-Type": "text/csv"}
+        )
+
+        summary = response.json()["data"][0]
+        assert (summary["imported"], summary["failed"]) == (1, 1)
+        assert summary["errors"] == [{"row": 2, "message": "Document failed validation"}]
+        documents = mock_db.todos.insert_many.call_args.args[0]
+        assert [document["title"] for document in documents] == ["A", "B"]
+        assert mock_db.todos.insert_many.call_args.kwargs == {"ordered": False}
+
+    @pytest.mark.asyncio
+    async def test_import_rejects_unknown_format(self, client_with_memory_storage):
+        response = await client_with_memory_storage.post(
+            "/api/v1/todos/import", content=b"{}", headers={"Content-Type": "application/json"}
+        )
+
+        assert response.status_code == 415
+        assert response.json()["status"] == "failed"
@@ -2,6 +2,10 @@
 from unittest.mock import AsyncMock, patch
 
 import pytest
+from pymongo.errors import DuplicateKeyError
+
+from app.apis.users.views import invalidate_user, user_cache
+from core.config import settings
 
 
 class TestUserAPI:
@@ -59,6 +63,24 @@ class TestUserAPI:
 
         assert response.status_code == 409
 
+    @pytest.mark.asyncio
+    async def test_create_user_duplicate_key_race(
+        self, client_with_mock_db, mock_db, sample_user_data
+    ):
+        mock_collection = AsyncMock()
+        mock_collection.find_one = AsyncMock(return_value=None)
+        mock_collection.insert_one = AsyncMock(
+            side_effect=DuplicateKeyError("E11000 duplicate key error")
+        )
+        mock_db.users = mock_collection
+
+        response = await client_with_mock_db.post(
+            "/api/v1/users", json=sample_user_data
+        )
+
+        assert response.status_code == 409
+        assert response.json()["message"] == "User Already Exists"
+
     @pytest.mark.asyncio
     async def test_get_user_by_email_success(
         self, client_with_mock_db, mock_db, sample_user_document
@@ -69,9 +91,7 @@ class TestUserAPI:
 
         mock_db.users = mock_collection
 
-        response = await client_with_mock_db.get(
-            f"/api/v1/users?email={sample_user_document['email']}"
-        )
+        response = await client_with_mock_db.get("/api/v1/users")
 
         assert response.status_code == 200
         response_data = response.json()
@@ -93,14 +113,118 @@ class TestUserAPI:
 
         mock_db.users = mock_collection
 
-        response = await client_with_mock_db.get(
-            "/api/v1/users?email=nonexistent@example.com"
-        )
+        response = await client_with_mock_db.get("/api/v1/users")
 
         assert response.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_get_user_missing_email_param(self, client_with_mock_db):
+    async def test_get_user_missing_token(self, client_with_mock_db, mock_db):
+        mock_db.users = AsyncMock()
+        del client_with_mock_db.headers[settings.JWT_SECRET_KEY]
+
         response = await client_with_mock_db.get("/api/v1/users")
 
-        assert response.status_code == 422
+        assert response.status_code == 403
+        assert response.json()["status"] == "failed"
+        assert response.json()["message"] == "Authentication token is missing"
+        mock_db.users.find_one.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_auth_failures_never_expose_signing_key(self, client_with_mock_db):
+        for token in (None, "not-a-token"):
+            if token is None:
+                del client_with_mock_db.headers[settings.JWT_SECRET_KEY]
+            else:
+                client_with_mock_db.headers[settings.JWT_SECRET_KEY] = token
+
+            for path in ("/api/v1/users", "/api/v1/todos", "/api/v1/dashboard"):
+                response = await client_with_mock_db.get(path)
+
+                assert response.status_code in (401, 403)
+                assert settings.JWT_SECRET_KEY not in response.text
+
+    @pytest.mark.asyncio
+    async def test_get_user_invalid_token(self, client_with_mock_db, mock_db):
+        mock_db.users = AsyncMock()
+        client_with_mock_db.headers[settings.JWT_SECRET_KEY] = "not-a-token"
+
+        response = await client_with_mock_db.get("/api/v1/users")
+
+        assert response.status_code == 401
+        assert response.json()["message"] == "Token is invalid or expired"
+        mock_db.users.find_one.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_user_uses_token_identity(
+        self, client_with_mock_db, mock_db, sample_user_document
+    ):
+        mock_db.users = AsyncMock()
+        mock_db.users.find_one = AsyncMock(return_value=sample_user_document)
+
+        response = await client_with_mock_db.get(
+            "/api/v1/users?email=someone-else@example.com"
+        )
+
+        assert response.status_code == 200
+        mock_db.users.find_one.assert_awaited_once_with(
+            {"email": "test@example.com"}, {"password": 0}
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_user_is_served_from_cache(
+        self, client_with_mock_db, mock_db, sample_user_document
+    ):
+        mock_db.users = AsyncMock()
+        mock_db.users.find_one = AsyncMock(return_value=dict(sample_user_document))
+
+        first = await client_with_mock_db.get("/api/v1/users")
+        second = await client_with_mock_db.get("/api/v1/users")
+
+        assert first.json()["data"] == second.json()["data"]
+        assert "password" not in second.json()["data"][0]
+        assert mock_db.users.find_one.await_count == 1
+        assert "password" not in user_cache.get("test@example.com")
+
+    @pytest.mark.asyncio
+    async def test_create_user_caches_fresh_profile(
+        self, client_with_mock_db, mock_db, sample_user_data
+    ):
+        mock_db.users = AsyncMock()
+        mock_db.users.find_one = AsyncMock(
+            side_effect=[None, {"_id": "fresh", "email": sample_user_data["email"]}]
+        )
+
+        response = await client_with_mock_db.post("/api/v1/users", json=sample_user_data)
+
+        assert response.status_code == 201
+        assert response.json()["data"][0]["id"] == "fresh"
+        assert user_cache.get(sample_user_data["email"])["id"] == "fresh"
+
+    @pytest.mark.asyncio
+    async def test_get_user_conditional_request(
+        self, client_with_mock_db, mock_db, sample_user_document
+    ):
+        mock_db.users = AsyncMock()
+        mock_db.users.find_one = AsyncMock(
+            side_effect=lambda *args: dict(sample_user_document)
+        )
+
+        first = await client_with_mock_db.get("/api/v1/users")
+        etag = first.headers["etag"]
+        user_cache.clear()
+
+        second = await client_with_mock_db.get(
+            "/api/v1/users", headers={"If-None-Match": etag}
+        )
+
+        assert second.status_code == 304
+        assert second.content == b""
+        assert mock_db.users.find_one.call_count == 1
+
+        invalidate_user(sample_user_document["email"])
+        third = await client_with_mock_db.get(
+            "/api/v1/users", headers={"If-None-Match": etag}
+        )
+
+        assert third.status_code == 200
+        assert third.headers["etag"] != etag
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+import time
+
+from unittest.mock import patch
+
+import pytest
+
+from app.utils import auth_utils
+
+
+class TestBcryptPool:
+
+    @pytest.mark.asyncio
+    async def test_run_bcrypt_runs_off_the_event_loop(self):
+        loop_thread = threading.get_ident()
+        before = auth_utils.BCRYPT_DURATION.get(("hash_password",))["count"]
+
+        hashed = await auth_utils.run_bcrypt(auth_utils.hash_password, "secret")
+        thread_id = await auth_utils.run_bcrypt(threading.get_ident)
+
+        assert thread_id != loop_thread
+        assert auth_utils.verify_password("secret", hashed)
+        assert auth_utils.BCRYPT_DURATION.get(("hash_password",))["count"] == before + 1
+
+    @pytest.mark.asyncio
+    async def test_run_bcrypt_caps_concurrency(self, monkeypatch):
+        auth_utils.shutdown_bcrypt_pool()
+        monkeypatch.setattr(auth_utils.settings, "BCRYPT_POOL_SIZE", 4)
+        monkeypatch.setattr(auth_utils.settings, "BCRYPT_MAX_CONCURRENCY", 2)
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow_hash():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.pop()
+
+        try:
+            await asyncio.gather(*(auth_utils.run_bcrypt(slow_hash) for _ in range(6)))
+        finally:
+            auth_utils.shutdown_bcrypt_pool()
+
+        assert max(peak) == 2
+        assert auth_utils.BCRYPT_QUEUE_WAIT.get(("slow_hash",))["count"] == 6
+
+
+class TestBcryptCost:
+
+    def test_hash_uses_configured_rounds(self):
+        previous = auth_utils.get_bcrypt_rounds()
+        auth_utils.set_bcrypt_rounds(4)
+        try:
+            hashed = auth_utils.hash_password("secret")
+        finally:
+            auth_utils.set_bcrypt_rounds(previous)
+
+        assert auth_utils.get_hash_rounds(hashed) == 4
+        assert auth_utils.needs_rehash(hashed)
+        assert not auth_utils.needs_rehash("not-a-bcrypt-hash")
+
+    def test_rehash_only_upgrades_unless_downgrade_enabled(self, monkeypatch):
+        monkeypatch.setattr(auth_utils, "_bcrypt_rounds", 10)
+        lower, same, higher = "$2b$08$" + "x" * 53, "$2b$10$" + "x" * 53, "$2b$12$" + "x" * 53
+
+        assert [auth_utils.needs_rehash(h) for h in (lower, same, higher)] == [True, False, False]
+
+        monkeypatch.setattr(auth_utils.settings, "BCRYPT_REHASH_DOWNGRADE", True)
+        assert [auth_utils.needs_rehash(h) for h in (lower, same, higher)] == [True, False, True]
+
+    def test_calibrate_stays_within_bounds(self):
+        assert auth_utils.calibrate_bcrypt_rounds(0, 4, 6) == 4
+        assert 4 <= auth_utils.calibrate_bcrypt_rounds(10_000, 4, 6) <= 6
+
+
+class TestTokenCache:
+
+    def test_decode_jwt_caches_verified_payload(self):
+        auth_utils.token_cache.clear()
+        token = auth_utils.signJWT("test@example.com")["access_token"]
+
+        with patch.object(
+            auth_utils, "_decode_and_verify", wraps=auth_utils._decode_and_verify
+        ) as decode:
+            first = auth_utils.decodeJWT(token)
+            second = auth_utils.decodeJWT(token)
+
+        assert first == second
+        assert first["user_id"] == "test@example.com"
+        assert decode.call_count == 1
+        assert auth_utils.token_cache.stats()["hits"] >= 1
+
+    def test_decode_jwt_does_not_cache_invalid_tokens(self):
+        auth_utils.token_cache.clear()
+
+        assert auth_utils.decodeJWT("not-a-token") is None
+        assert len(auth_utils.token_cache) == 0
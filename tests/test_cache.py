@@ -0,0 +1,34 @@
+import time
+
+from app.utils.cache import TTLCache
+
+
+class TestTTLCache:
+
+    def test_lru_eviction_and_counters(self):
+        cache = TTLCache("test", maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["hits"] == 3
+        assert cache.stats()["misses"] == 1
+
+    def test_entry_expiry(self):
+        cache = TTLCache("test", maxsize=10, ttl=60)
+        cache.set("expired", 1, expires_at=time.time() - 1)
+        cache.set("capped", 2, expires_at=time.time() + 3600)
+
+        assert cache.get("expired") is None
+        assert len(cache) == 1
+        assert cache._data["capped"][1] <= time.time() + 60
+
+    def test_zero_size_disables_cache(self):
+        cache = TTLCache("test", maxsize=0)
+        cache.set("a", 1)
+
+        assert cache.get("a") is None
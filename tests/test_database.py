@@ -0,0 +1,281 @@
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import pytest
+from bson import ObjectId
+
+from app.database import database
+from app.database.indexes import INDEXES, QUERY_SHAPES, ensure_indexes, explain_queries
+from app.database.migrations import MIGRATION_ID, _build_update, migrate_timestamps
+from app.database.monitoring import (
+    COMMAND_DURATION,
+    POOL_CHECKED_OUT,
+    POOL_OPEN,
+    POOL_WAITING,
+    CommandMetricsListener,
+    PoolMetricsListener,
+    command_shape,
+)
+from app.utils.time_utils import to_millis
+
+
+class TestIndexes:
+
+    @pytest.mark.asyncio
+    async def test_ensure_indexes_creates_and_logs_missing(self, caplog):
+        collections = {}
+
+        def get_collection(name):
+            collection = collections.setdefault(name, MagicMock())
+            existing = {"_id_": {}} if name == "todos" else {"_id_": {}, "email_unique": {}}
+            collection.index_information = AsyncMock(return_value=existing)
+            collection.create_indexes = AsyncMock()
+            return collection
+
+        db = MagicMock()
+        db.__getitem__.side_effect = get_collection
+
+        with caplog.at_level("WARNING", logger="app.database.indexes"):
+            await ensure_indexes(db)
+
+        for name, models in INDEXES.items():
+            collections[name].create_indexes.assert_awaited_once_with(models)
+        missing = [r.getMessage() for r in caplog.records if "Missing index" in r.getMessage()]
+        assert len(missing) == 1
+        assert "user_active_created_id" in missing[0]
+
+    @pytest.mark.asyncio
+    async def test_explain_queries_covers_every_shape(self):
+        cursors = []
+
+        def find(query):
+            cursor = MagicMock()
+            cursor.sort.return_value = cursor
+            cursor.limit.return_value = cursor
+            cursor.explain = AsyncMock(return_value={"queryPlanner": {"winningPlan": {"stage": "LIMIT"}}})
+            cursors.append((query, cursor))
+            return cursor
+
+        db = MagicMock()
+        db.__getitem__.return_value.find.side_effect = find
+
+        plans = await explain_queries(db)
+
+        assert [plan["name"] for plan in plans] == [shape["name"] for shape in QUERY_SHAPES]
+        for shape, (query, cursor) in zip(QUERY_SHAPES, cursors):
+            assert query == shape["filter"]
+            # Unbounded shapes (the export cursor, the $in lookup) are explained without a limit
+            assert cursor.limit.called == bool(shape["limit"])
+
+
+class TestTimestampMigration:
+
+    def test_to_millis_normalises_legacy_values(self):
+        assert to_millis("1735500000000") == 1735500000000
+        assert to_millis("1735500000") == 1735500000000
+        assert to_millis(1735500000) == 1735500000000
+        assert to_millis("") is None
+        assert to_millis(None) is None
+
+    def test_build_update_for_todo(self):
+        doc = {
+            "_id": ObjectId(),
+            "created_at": "1735500000000",
+            "updated_at": "",
+            "due_date": "1735516800000",
+            "deleted_at": "1735500000",
+        }
+
+        update = _build_update("todos", doc)
+
+        assert update["created_at"] == 1735500000000
+        assert update["updated_at"] is None
+        assert update["deleted_at"] == 1735500000000
+        assert update["due_date"] == 1735516800000
+        assert len(update["due_date_display"]) == 10
+
+    @pytest.mark.asyncio
+    async def test_migrate_timestamps_checkpoints_batches(self):
+        docs = [
+            {"_id": ObjectId(), "created_at": "1735500000000", "updated_at": ""}
+            for _ in range(3)
+        ]
+        cursor = Mock()
+        cursor.sort.return_value = cursor
+        cursor.limit.return_value = cursor
+        cursor.to_list = AsyncMock(side_effect=[docs[:2], docs[2:], []])
+
+        users = MagicMock()
+        users.find = Mock(return_value=cursor)
+        users.bulk_write = AsyncMock(
+            side_effect=lambda reqs, ordered: Mock(modified_count=len(reqs), matched_count=len(reqs))
+        )
+        empty = Mock()
+        empty.sort.return_value = empty
+        empty.limit.return_value = empty
+        empty.to_list = AsyncMock(return_value=[])
+        todos = MagicMock()
+        todos.find = Mock(return_value=empty)
+
+        db = MagicMock()
+        db.__getitem__.side_effect = {"users": users, "todos": todos}.__getitem__
+        db.migrations.find_one = AsyncMock(return_value=None)
+        db.migrations.update_one = AsyncMock()
+
+        summary = await migrate_timestamps(db, batch_size=2)
+
+        assert summary == {"todos": 0, "users": 3}
+        assert users.bulk_write.await_count == 2
+        db.migrations.update_one.assert_awaited_with(
+            {"_id": MIGRATION_ID}, {"$set": {"users": docs[2]["_id"]}}, upsert=True
+        )
+        resumed_query = users.find.call_args_list[1].args[0]
+        assert resumed_query["_id"] == {"$gt": docs[1]["_id"]}
+
+
+class TestCommandMonitoring:
+
+    def test_command_shape_hides_values(self):
+        shape = command_shape(
+            "find",
+            {
+                "find": "todos",
+                "filter": {
+                    "user_id": "secret@example.com",
+                    "$or": [{"created_at": {"$lt": 5}}, {"_id": {"$in": [1, 2]}}],
+                },
+                "sort": {"created_at": -1},
+            },
+        )
+
+        assert shape == {
+            "filter": {"user_id": "?", "$or": [{"created_at": {"$lt": "?"}}, {"_id": {"$in": "?"}}]},
+            "sort": {"created_at": -1},
+        }
+        assert command_shape("update", {"updates": [{"q": {"_id": 1}}, {"q": {"_id": 2}}]}) == {
+            "q": [{"_id": "?"}]
+        }
+
+    def test_listener_records_latency_and_logs_slow_commands(self, caplog, monkeypatch):
+        monkeypatch.setattr("app.database.monitoring.settings.MONGO_SLOW_QUERY_MS", 50)
+        listener = CommandMetricsListener()
+        labels = ("find", "todos")
+        before = COMMAND_DURATION.get(labels)["count"]
+
+        with caplog.at_level("WARNING", logger="app.database.slow_query"):
+            for request_id, micros in ((1, 1_000), (2, 80_000)):
+                listener.started(Mock(
+                    command_name="find",
+                    command={"find": "todos", "filter": {"user_id": "secret@example.com"}},
+                    connection_id=("localhost", 27017),
+                    request_id=request_id,
+                ))
+                listener.succeeded(Mock(
+                    duration_micros=micros, connection_id=("localhost", 27017), request_id=request_id
+                ))
+
+        assert COMMAND_DURATION.get(labels)["count"] == before + 2
+        slow = [r.getMessage() for r in caplog.records]
+        assert len(slow) == 1
+        assert "collection=todos" in slow[0]
+        assert '{"filter":{"user_id":"?"}}' in slow[0]
+        assert "secret@example.com" not in slow[0]
+
+    def test_pool_listener_tracks_open_waiting_and_checked_out(self):
+        listener = PoolMetricsListener()
+        before = (POOL_OPEN.get(), POOL_WAITING.get(), POOL_CHECKED_OUT.get())
+
+        listener.connection_created(Mock())
+        listener.connection_check_out_started(Mock())
+        assert POOL_WAITING.get() == before[1] + 1
+
+        listener.connection_checked_out(Mock(duration=0.01))
+        assert (POOL_OPEN.get(), POOL_WAITING.get(), POOL_CHECKED_OUT.get()) == (
+            before[0] + 1,
+            before[1],
+            before[2] + 1,
+        )
+
+        listener.connection_checked_in(Mock())
+        listener.connection_closed(Mock())
+        assert (POOL_OPEN.get(), POOL_WAITING.get(), POOL_CHECKED_OUT.get()) == before
+
+
+class TestClientLifecycle:
+
+    @pytest.mark.asyncio
+    async def test_client_options_come_from_settings(self, monkeypatch):
+        monkeypatch.setattr(database.settings, "MONGO_MIN_POOL_SIZE", 3)
+        monkeypatch.setattr(database.settings, "MONGO_MAX_POOL_SIZE", 7)
+        monkeypatch.setattr(database.settings, "MONGO_COMPRESSORS", ["zstd", "snappy", "zlib"])
+        monkeypatch.setattr(database, "find_spec", lambda name: name == "zlib" or None)
+
+        client = database.create_client()
+        try:
+            pool = client.options.pool_options
+            assert (pool.min_pool_size, pool.max_pool_size) == (3, 7)
+            assert client.options.pool_options._compression_settings.compressors == ["zlib"]
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_default_compressors_fall_back_to_zlib(self, monkeypatch):
+        monkeypatch.setattr(database, "find_spec", lambda name: name == "zlib" or None)
+
+        client = database.create_client()
+        try:
+            assert client.options.pool_options._compression_settings.compressors == ["zlib"]
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_close_db_closes_the_client_in_use(self, monkeypatch):
+        client = MagicMock()
+        client.close = AsyncMock()
+        monkeypatch.setattr(database, "create_client", Mock(return_value=client))
+        monkeypatch.setattr(database, "mongodb_client", None)
+
+        await database.init_db()
+        await database.init_db()
+        await database.close_db()
+
+        database.create_client.assert_called_once()
+        client.close.assert_awaited_once()
+        assert database.mongodb_client is None
+
+    @pytest.mark.asyncio
+    async def test_warm_pool_pings_min_pool_size_times(self, monkeypatch):
+        client = MagicMock()
+        client.admin.command = AsyncMock(return_value={"ok": 1.0})
+        monkeypatch.setattr(database, "mongodb_client", client)
+        monkeypatch.setattr(database.settings, "MONGO_MIN_POOL_SIZE", 4)
+
+        await database.warm_pool()
+
+        assert client.admin.command.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_connect_with_retry_backs_off_then_gives_up(self, monkeypatch):
+        db = MagicMock()
+        db.command = AsyncMock(side_effect=[ConnectionError("down"), {"ok": 1.0}])
+        monkeypatch.setattr(database, "init_db", AsyncMock(return_value=db))
+        monkeypatch.setattr(database.settings, "MONGO_CONNECT_ATTEMPTS", 2)
+        monkeypatch.setattr(database.settings, "MONGO_CONNECT_BACKOFF_BASE", 0.01)
+        monkeypatch.setattr(database.settings, "MONGO_CONNECT_BACKOFF_MAX", 0.02)
+
+        assert await database.connect_with_retry() is db
+        assert db.command.await_count == 2
+
+        db.command = AsyncMock(side_effect=ConnectionError("down"))
+        with pytest.raises(ConnectionError):
+            await database.connect_with_retry()
+        assert db.command.await_count == 2
+
+    def test_backoff_delay_is_jittered_and_capped(self, monkeypatch):
+        monkeypatch.setattr(database.settings, "MONGO_CONNECT_BACKOFF_BASE", 1.0)
+        monkeypatch.setattr(database.settings, "MONGO_CONNECT_BACKOFF_MAX", 4.0)
+
+        delays = [database.backoff_delay(attempt) for attempt in (1, 3, 10) for _ in range(50)]
+
+        assert all(0 <= delay <= 1.0 for delay in delays[:50])
+        assert all(0 <= delay <= 4.0 for delay in delays[50:])
+        assert len(set(delays)) > 1
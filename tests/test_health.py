@@ -0,0 +1,75 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.utils import health as health_module
+from app.utils.health import HealthMonitor
+
+
+class TestHealthMonitor:
+
+    @pytest.mark.asyncio
+    async def test_readiness_follows_background_results(self, monkeypatch):
+        monkeypatch.setattr(health_module.settings, "HEALTH_CHECK_INTERVAL", 60)
+        monitor = HealthMonitor()
+        ping = AsyncMock(return_value={"ok": 1.0})
+        monitor.add_check("mongo", ping)
+
+        assert monitor.readiness()[0] is False
+
+        await monitor.start()
+        try:
+            ready, checks = monitor.readiness()
+            assert ready is True
+            assert checks["mongo"]["ok"] is True
+
+            # Reading readiness never runs the check again
+            monitor.readiness()
+            assert ping.await_count == 1
+
+            ping.side_effect = ConnectionError("down")
+            await monitor.refresh()
+            ready, checks = monitor.readiness()
+            assert ready is False
+            assert checks["mongo"]["error"] == "down"
+        finally:
+            await monitor.stop()
+
+    @pytest.mark.asyncio
+    async def test_slow_check_times_out_and_stale_results_are_not_ready(self, monkeypatch):
+        monkeypatch.setattr(health_module.settings, "HEALTH_CHECK_TIMEOUT", 0.01)
+        monitor = HealthMonitor()
+        monitor.add_check("mongo", lambda: asyncio.sleep(1))
+
+        await monitor.refresh()
+        assert monitor.results["mongo"]["error"] == "timeout"
+
+        monitor.results["mongo"].update(ok=True, checked_at=0)
+        assert monitor.readiness()[0] is False
+
+    @pytest.mark.asyncio
+    async def test_draining_is_not_ready(self):
+        monitor = HealthMonitor()
+        await monitor.start()
+        assert monitor.readiness()[0] is True
+
+        await monitor.stop()
+        assert monitor.readiness()[0] is False
+
+
+class TestHealthEndpoints:
+
+    @pytest.mark.asyncio
+    async def test_probes(self, async_client, monkeypatch):
+        monitor = HealthMonitor()
+        monitor.add_check("mongo", AsyncMock(side_effect=ConnectionError("down")))
+        await monitor.refresh()
+        monkeypatch.setattr("app.apis.health.views.health", monitor)
+
+        response = await async_client.get("/healthz")
+        assert response.status_code == 200
+
+        response = await async_client.get("/readyz")
+        assert response.status_code == 503
+        assert response.json()["data"][0]["mongo"]["ok"] is False
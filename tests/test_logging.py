@@ -0,0 +1,38 @@
+import logging
+
+import orjson
+
+from app.utils.logging import JSONFormatter, SamplingFilter
+
+
+def _record(name: str, level: int = logging.INFO, created: float = 1000.0) -> logging.LogRecord:
+    record = logging.LogRecord(name, level, __file__, 1, "hello %s", ("world",), None)
+    record.created = created
+    return record
+
+
+class TestSamplingFilter:
+
+    def test_rate_limit_applies_per_logger_and_second(self):
+        sampler = SamplingFilter(rate_limit=2, loggers=["app.apis"])
+
+        kept = [sampler.filter(_record("app.apis.todos.views")) for _ in range(5)]
+
+        assert kept == [True, True, False, False, False]
+        assert sampler.filter(_record("app.apis.users.views"))
+        assert sampler.filter(_record("app.apis.todos.views", created=1001.0))
+
+    def test_warnings_and_other_loggers_always_pass(self):
+        sampler = SamplingFilter(sample_rate=0.0, loggers=["app.apis"])
+
+        assert not sampler.filter(_record("app.apis.todos.views"))
+        assert sampler.filter(_record("app.apis.todos.views", logging.WARNING))
+        assert sampler.filter(_record("app.database.indexes"))
+
+
+class TestJSONFormatter:
+
+    def test_formats_one_object_per_record(self):
+        entry = orjson.loads(JSONFormatter().format(_record("app.main")))
+
+        assert entry == {"ts": 1000.0, "level": "INFO", "logger": "app.main", "message": "hello world"}
@@ -0,0 +1,76 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.utils.metrics import Counter, Histogram, REGISTRY, render_prometheus
+from app.utils.metrics_middleware import REQUEST_DURATION, RESPONSES
+
+
+class TestPrometheusRendering:
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram("test_render_seconds", "Test", labelnames=("route",), buckets=(0.1, 1.0))
+        counter = Counter("test_render_total", "Test", labelnames=("path",))
+        try:
+            histogram.observe(0.05, ("/a",))
+            histogram.observe(0.5, ("/a",))
+            histogram.observe(5.0, ("/a",))
+            counter.inc(labels=('say "hi"',))
+
+            text = render_prometheus()
+        finally:
+            REGISTRY.remove(histogram)
+            REGISTRY.remove(counter)
+
+        assert "# TYPE test_render_seconds histogram" in text
+        assert 'test_render_seconds_bucket{route="/a",le="0.1"} 1' in text
+        assert 'test_render_seconds_bucket{route="/a",le="1"} 2' in text
+        assert 'test_render_seconds_bucket{route="/a",le="+Inf"} 3' in text
+        assert 'test_render_seconds_count{route="/a"} 3' in text
+        assert 'test_render_total{path="say \\"hi\\""} 1' in text
+
+
+class TestMetricsMiddleware:
+
+    @pytest.mark.asyncio
+    async def test_records_route_template_and_server_timing(
+        self, client_with_mock_db, mock_db, sample_user_document
+    ):
+        mock_db.users = AsyncMock()
+        mock_db.users.find_one = AsyncMock(return_value=sample_user_document)
+        labels = ("GET", "/api/v1/users")
+        before = REQUEST_DURATION.get(labels)["count"]
+
+        response = await client_with_mock_db.get("/api/v1/users")
+
+        assert response.status_code == 200
+        assert "auth;dur=" in response.headers["server-timing"]
+        assert "app;dur=" in response.headers["server-timing"]
+        assert REQUEST_DURATION.get(labels)["count"] == before + 1
+        assert RESPONSES.get(("GET", "/api/v1/users", "200")) >= 1
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint(self, client_with_mock_db):
+        await client_with_mock_db.get("/does-not-exist")
+
+        response = await client_with_mock_db.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE http_request_duration_seconds histogram" in response.text
+        assert 'route="<unmatched>"' in response.text
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint_samples_http_client_pool(self, client_with_mock_db, monkeypatch):
+        monkeypatch.setattr(
+            "app.utils.api_handler.get_pool_stats",
+            lambda: {"connections": 3, "active": 2, "idle": 1, "pending_requests": 4, "max_connections": 5},
+        )
+
+        response = await client_with_mock_db.get("/metrics")
+
+        assert "http_client_pool_connections 3" in response.text
+        assert "http_client_pool_active_connections 2" in response.text
+        assert "http_client_pool_idle_connections 1" in response.text
+        assert "http_client_pool_pending_requests 4" in response.text
+        assert "http_client_pool_max_connections 5" in response.text
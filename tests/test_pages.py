@@ -1,7 +1,10 @@
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from app.templates.init_templates import fragment_cache
+from core.config import settings
+
 
 class TestPages:
 
@@ -45,6 +48,16 @@ class TestPages:
         assert response.status_code in [307, 308]
         assert "login" in response.headers.get("location", "").lower()
 
+    @pytest.mark.asyncio
+    async def test_home_page_invalid_session_cookie(self, client_with_mock_db):
+        del client_with_mock_db.headers[settings.JWT_SECRET_KEY]
+        client_with_mock_db.cookies.set("access_token", "not-a-token")
+
+        response = await client_with_mock_db.get("/home", follow_redirects=False)
+
+        assert response.status_code in [307, 308]
+        assert "session_expired" in response.headers.get("location", "")
+
     @pytest.mark.asyncio
     async def test_add_todo_page_get(self, client_with_mock_db):
         response = await client_with_mock_db.get("/add-todo", follow_redirects=False)
@@ -67,6 +80,77 @@ class TestPages:
 
         assert response.status_code in [307, 308]
 
+    @pytest.mark.asyncio
+    async def test_home_page_streams_and_reuses_rows(self, client_with_mock_db, auth_token):
+        client_with_mock_db.cookies.set("access_token", auth_token)
+        todos = [
+            {"id": str(i), "title": f"Task {i}", "description": "", "completed": False,
+             "due_date_display": "2030-01-01", "priority": "1"}
+            for i in range(3)
+        ]
+
+        def dashboard():
+            return {
+                "status": "success",
+                "data": [{"user": {"username": "Test User"}, "todos": todos, "next_cursor": None}],
+            }
+
+        with patch("app.pages.pages.api_handler", AsyncMock(side_effect=lambda *a, **k: dashboard())):
+            first = await client_with_mock_db.get("/home")
+            todos[1] = dict(todos[1], completed=True)
+            misses = fragment_cache.misses
+            second = await client_with_mock_db.get("/home")
+
+        assert first.status_code == 200
+        assert "text/html" in first.headers["content-type"]
+        assert all(f"Task {i}" in first.text for i in range(3))
+        assert "checked disabled" in second.text
+        assert fragment_cache.misses - misses == 1
+
+    @pytest.mark.asyncio
+    async def test_home_page_invalid_cursor_restarts_from_first_page(
+        self, client_with_mock_db, auth_token
+    ):
+        client_with_mock_db.cookies.set("access_token", auth_token)
+        failed = {"status": "failed", "message": "Invalid cursor", "data": []}
+
+        with patch("app.pages.pages.api_handler", AsyncMock(return_value=failed)):
+            response = await client_with_mock_db.get("/home?cursor=garbage", follow_redirects=False)
+
+        assert response.status_code == 303
+        assert response.headers["location"].startswith("/home?error=")
+
+        failed = {"status": "failed", "message": "Token is invalid or expired", "data": []}
+        with patch("app.pages.pages.api_handler", AsyncMock(return_value=failed)):
+            response = await client_with_mock_db.get("/home?cursor=garbage", follow_redirects=False)
+
+        assert response.status_code == 303
+        assert response.headers["location"] == "/login?error=unauthorized"
+
+    @pytest.mark.asyncio
+    async def test_bulk_todo_page_sends_one_batch(self, client_with_mock_db, auth_token):
+        client_with_mock_db.cookies.set("access_token", auth_token)
+        handler = AsyncMock(return_value={"status": "success", "message": "2 of 2"})
+
+        with patch("app.pages.pages.api_handler", handler):
+            response = await client_with_mock_db.post(
+                "/bulk-todos",
+                data={"action": "complete", "todo_ids": ["a", "b"]},
+                follow_redirects=False,
+            )
+
+        assert response.status_code == 303
+        assert "msg=Completed+2+tasks" in response.headers["location"]
+        handler.assert_awaited_once_with(
+            "POST",
+            "/todos/batch",
+            body={"operations": [
+                {"op": "complete", "todo_id": "a"},
+                {"op": "complete", "todo_id": "b"},
+            ]},
+            token=auth_token,
+        )
+
     @pytest.mark.asyncio
     async def test_logout_page(self, client_with_mock_db):
         response = await client_with_mock_db.get("/logout", follow_redirects=False)
@@ -0,0 +1,161 @@
+import asyncio
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+from app.database.repository import TodoWrite
+
+
+def make_todo(user_id="test@example.com", created_at=1, **fields):
+    return {
+        "user_id": user_id,
+        "title": f"Todo {created_at}",
+        "created_at": created_at,
+        "completed": False,
+        "is_deleted": False,
+        **fields,
+    }
+
+
+class TestMemoryStorage:
+
+    @pytest.mark.asyncio
+    async def test_users_are_unique_by_email_and_hide_password(
+        self, memory_storage, sample_user_data
+    ):
+        await memory_storage.users.insert(dict(sample_user_data))
+
+        with pytest.raises(DuplicateKeyError):
+            await memory_storage.users.insert(dict(sample_user_data))
+
+        profile = await memory_storage.users.find_by_email("test@example.com")
+        assert "password" not in profile
+        user = await memory_storage.users.find_by_email("test@example.com", with_password=True)
+        assert user["password"] == sample_user_data["password"]
+
+        assert not await memory_storage.users.replace_password(user["_id"], "stale", "new", 2)
+        assert await memory_storage.users.replace_password(user["_id"], user["password"], "new", 2)
+        user = await memory_storage.users.find_by_email("test@example.com", with_password=True)
+        assert user["password"] == "new"
+
+    @pytest.mark.asyncio
+    async def test_list_active_pages_newest_first(self, memory_storage):
+        todos = memory_storage.todos
+        ids = [await todos.insert(make_todo(created_at=ms)) for ms in (1, 2, 2, 3)]
+        await todos.insert(make_todo(user_id="other@example.com", created_at=5))
+        await todos.mark_deleted("test@example.com", ids[3], 10)
+
+        page = await todos.list_active("test@example.com", 2)
+        # Ties on created_at fall back to _id, and ObjectIds increase with insertion
+        assert [todo["id"] for todo in page] == [str(ids[2]), str(ids[1])]
+        assert "is_deleted" not in page[0]
+
+        last = page[-1]
+        rest = await todos.list_active(
+            "test@example.com", 2, (last["created_at"], ObjectId(last["id"]))
+        )
+        assert [todo["id"] for todo in rest] == [str(ids[0])]
+
+    @pytest.mark.asyncio
+    async def test_list_active_pages_across_unmigrated_timestamps(self, memory_storage):
+        todos = memory_storage.todos
+        legacy = [await todos.insert(make_todo(created_at=ms)) for ms in ("1700000000", "1700000001")]
+        current = [await todos.insert(make_todo(created_at=ms)) for ms in (1_800_000_000_000, 1_800_000_000_001)]
+
+        seen, after = [], None
+        while True:
+            page = await todos.list_active("test@example.com", 1, after)
+            if not page:
+                break
+            seen.append(page[0]["id"])
+            after = (page[0]["created_at"], ObjectId(page[0]["id"]))
+
+        # Strings sort above numbers, as in Mongo, and a string cursor still reaches the ints
+        assert seen == [str(todo_id) for todo_id in legacy[::-1] + current[::-1]]
+
+    @pytest.mark.asyncio
+    async def test_returned_documents_are_copies(self, memory_storage):
+        todo_id = await memory_storage.todos.insert(make_todo())
+
+        (todo,) = await memory_storage.todos.list_active("test@example.com", 10)
+        todo["title"] = "changed"
+
+        (todo,) = await memory_storage.todos.list_active("test@example.com", 10)
+        assert todo["id"] == str(todo_id)
+        assert todo["title"] == "Todo 1"
+
+    @pytest.mark.asyncio
+    async def test_bulk_write_only_touches_own_active_todos(self, memory_storage):
+        todos = memory_storage.todos
+        mine = await todos.insert(make_todo())
+        theirs = await todos.insert(make_todo(user_id="other@example.com"))
+        duplicate = ObjectId()
+
+        errors = await todos.bulk_write(
+            "test@example.com",
+            [
+                TodoWrite(make_todo(created_at=2, _id=duplicate)),
+                TodoWrite({"completed": True}, todo_id=mine),
+                TodoWrite({"completed": True}, todo_id=theirs),
+                TodoWrite(make_todo(created_at=3, _id=duplicate)),
+            ],
+        )
+
+        assert list(errors) == [3]
+        assert await todos.find_active_ids("test@example.com", [mine, theirs, duplicate]) == {
+            mine,
+            duplicate,
+        }
+        assert await todos.mark_completed("test@example.com", mine, 5)
+        assert not await todos.mark_completed("test@example.com", theirs, 5)
+        assert await todos.mark_completed("other@example.com", theirs, 5)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_inserts_are_all_indexed(self, memory_storage):
+        await asyncio.gather(
+            *(memory_storage.todos.insert(make_todo(created_at=ms)) for ms in range(200))
+        )
+
+        page = await memory_storage.todos.list_active("test@example.com", 500)
+        assert [todo["created_at"] for todo in page] == list(range(199, -1, -1))
+
+
+class TestMemoryStorageAPI:
+
+    @pytest.mark.asyncio
+    async def test_todo_lifecycle(self, client_with_memory_storage):
+        client = client_with_memory_storage
+        payload = {
+            "title": "Test Todo",
+            "description": "Test description",
+            "priority": "High",
+            "due_date": "2025-12-30",
+        }
+
+        response = await client.post("/api/v1/todos/create", json=payload)
+        assert response.status_code == 201
+
+        response = await client.get("/api/v1/todos")
+        assert response.status_code == 200
+        (todo,) = response.json()["data"]
+        assert todo["title"] == "Test Todo"
+
+        response = await client.put(f"/api/v1/todos/complete?todo_id={todo['id']}")
+        assert response.status_code == 200
+        response = await client.get("/api/v1/todos")
+        assert response.json()["data"][0]["completed"] is True
+
+        response = await client.delete(f"/api/v1/todos?todo_id={todo['id']}")
+        assert response.status_code == 200
+        response = await client.get("/api/v1/todos")
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_signup_and_duplicate(self, client_with_memory_storage, sample_user_data):
+        response = await client_with_memory_storage.post("/api/v1/users", json=sample_user_data)
+        assert response.status_code == 201
+        assert "password" not in response.json()["data"][0]
+
+        response = await client_with_memory_storage.post("/api/v1/users", json=sample_user_data)
+        assert response.status_code == 409